@@ -0,0 +1 @@
+"""asv benchmarks for runpandas"""
@@ -0,0 +1,297 @@
+"""
+Synthetic activities and training files shared by the benchmarks.
+"""
+import json
+import os
+import struct
+import numpy as np
+import pandas as pd
+from fitparse.records import Crc
+from runpandas.types import Activity, columns
+
+# Number of records of the synthetic activities.
+SIZES = [1_000, 100_000, 1_000_000]
+
+# File formats of the synthetic training files.
+FORMATS = ["tcx", "gpx", "fit", "nikerun"]
+
+EXTENSIONS = {"tcx": ".tcx", "gpx": ".gpx", "fit": ".fit", "nikerun": ".json"}
+
+START = pd.Timestamp("2021-01-01 06:00:00", tz="UTC")
+
+# Records are written to the files in chunks of this size.
+CHUNK_SIZE = 10_000
+
+
+def make_activity(n, start=START, seed=42):
+    """Synthetic 1 Hz activity with ``n`` records around a fixed position."""
+    rng = np.random.default_rng(seed)
+    lat = -8.05 + np.cumsum(rng.normal(0, 1e-5, n))
+    lon = -34.9 + np.cumsum(rng.normal(0, 1e-5, n))
+    speed = np.abs(3 + np.cumsum(rng.normal(0, 0.05, n)) % 2 - 1)
+    data = {
+        "lat": lat,
+        "lon": lon,
+        "alt": 10 + np.cumsum(rng.normal(0, 0.1, n)),
+        "dist": np.cumsum(speed),
+        "speed": speed,
+        "hr": rng.integers(90, 190, n).astype("float64"),
+        "cad": rng.integers(75, 95, n).astype("float64"),
+        "temp": rng.integers(20, 30, n).astype("float64"),
+    }
+    index = pd.TimedeltaIndex(np.arange(n), unit="s", name="time")
+    return Activity(
+        data,
+        index=index,
+        cspecs={
+            "lat": columns.Latitude,
+            "lon": columns.Longitude,
+            "alt": columns.Altitude,
+            "dist": columns.Distance,
+            "speed": columns.Speed,
+            "hr": columns.HeartRate,
+            "cad": columns.Cadence,
+            "temp": columns.Temperature,
+        },
+        start=start,
+    )
+
+
+def make_session(n, activities=10):
+    """Synthetic session with ``n`` records split over daily activities."""
+    frames = [
+        make_activity(n // activities, start=START + pd.Timedelta(days=day), seed=day)
+        for day in range(activities)
+    ]
+    return pd.concat(
+        frames, keys=[frame.start for frame in frames], names=["start", "time"]
+    )
+
+
+def _timestamps(activity):
+    return activity.start + activity.index
+
+
+def _chunks(activity):
+    for offset in range(0, len(activity), CHUNK_SIZE):
+        yield activity.iloc[offset : offset + CHUNK_SIZE]
+
+
+def write_tcx(activity, file_path):
+    """Writes the activity as a Garmin TCX file."""
+    trackpoint = (
+        "<Trackpoint><Time>%s</Time><Position>"
+        "<LatitudeDegrees>%.7f</LatitudeDegrees>"
+        "<LongitudeDegrees>%.7f</LongitudeDegrees></Position>"
+        "<AltitudeMeters>%.2f</AltitudeMeters>"
+        "<DistanceMeters>%.2f</DistanceMeters>"
+        "<HeartRateBpm><Value>%d</Value></HeartRateBpm>"
+        "<Cadence>%d</Cadence>"
+        "<Extensions><ns3:TPX><ns3:Speed>%.3f</ns3:Speed></ns3:TPX></Extensions>"
+        "</Trackpoint>\n"
+    )
+    start = activity.start.strftime("%Y-%m-%dT%H:%M:%SZ")
+    with open(file_path, "w") as f:
+        f.write(
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<TrainingCenterDatabase xmlns="http://www.garmin.com/xmlschemas/'
+            'TrainingCenterDatabase/v2" xmlns:ns3="http://www.garmin.com/'
+            'xmlschemas/ActivityExtension/v2">\n'
+            '<Activities><Activity Sport="Running"><Id>%s</Id>'
+            '<Lap StartTime="%s"><Track>\n' % (start, start)
+        )
+        for chunk in _chunks(activity):
+            times = _timestamps(chunk).strftime("%Y-%m-%dT%H:%M:%SZ")
+            f.writelines(
+                trackpoint % values
+                for values in zip(
+                    times,
+                    chunk["lat"],
+                    chunk["lon"],
+                    chunk["alt"],
+                    chunk["dist"],
+                    chunk["hr"],
+                    chunk["cad"],
+                    chunk["speed"],
+                )
+            )
+        f.write("</Track></Lap></Activity></Activities></TrainingCenterDatabase>\n")
+
+
+def write_gpx(activity, file_path):
+    """Writes the activity as a GPX file with Garmin trackpoint extensions."""
+    trackpoint = (
+        '<trkpt lat="%.7f" lon="%.7f"><ele>%.2f</ele><time>%s</time>'
+        "<extensions><gpxtpx:TrackPointExtension>"
+        "<gpxtpx:atemp>%d</gpxtpx:atemp><gpxtpx:hr>%d</gpxtpx:hr>"
+        "<gpxtpx:cad>%d</gpxtpx:cad>"
+        "</gpxtpx:TrackPointExtension></extensions></trkpt>\n"
+    )
+    with open(file_path, "w") as f:
+        f.write(
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<gpx version="1.1" creator="runpandas" '
+            'xmlns="http://www.topografix.com/GPX/1/1" '
+            'xmlns:gpxtpx="http://www.garmin.com/xmlschemas/TrackPointExtension/v1">\n'
+            "<metadata><time>%s</time></metadata><trk><trkseg>\n"
+            % activity.start.strftime("%Y-%m-%dT%H:%M:%SZ")
+        )
+        for chunk in _chunks(activity):
+            times = _timestamps(chunk).strftime("%Y-%m-%dT%H:%M:%SZ")
+            f.writelines(
+                trackpoint % values
+                for values in zip(
+                    chunk["lat"],
+                    chunk["lon"],
+                    chunk["alt"],
+                    times,
+                    chunk["temp"],
+                    chunk["hr"],
+                    chunk["cad"],
+                )
+            )
+        f.write("</trkseg></trk></gpx>\n")
+
+
+# FIT timestamps are seconds since 1989-12-31 00:00:00 UTC.
+FIT_EPOCH = pd.Timestamp("1989-12-31", tz="UTC")
+
+# (global message number, [(field number, size, base type), ...])
+FIT_MESSAGES = {
+    "file_id": (0, [(0, 1, 0x00), (1, 2, 0x84), (4, 4, 0x86)]),
+    "event": (21, [(253, 4, 0x86), (0, 1, 0x00), (1, 1, 0x00)]),
+    "record": (
+        20,
+        [
+            (253, 4, 0x86),  # timestamp
+            (0, 4, 0x85),  # position_lat
+            (1, 4, 0x85),  # position_long
+            (2, 2, 0x84),  # altitude
+            (3, 1, 0x02),  # heart_rate
+            (4, 1, 0x02),  # cadence
+            (5, 4, 0x86),  # distance
+            (6, 2, 0x84),  # speed
+            (13, 1, 0x01),  # temperature
+        ],
+    ),
+    "lap": (19, [(253, 4, 0x86)]),
+}
+
+FIT_RECORD_DTYPE = np.dtype(
+    [
+        ("header", "u1"),
+        ("timestamp", "<u4"),
+        ("lat", "<i4"),
+        ("lon", "<i4"),
+        ("alt", "<u2"),
+        ("hr", "u1"),
+        ("cad", "u1"),
+        ("dist", "<u4"),
+        ("speed", "<u2"),
+        ("temp", "i1"),
+    ]
+)
+
+
+def _fit_definition(local_type, message):
+    global_number, fields = FIT_MESSAGES[message]
+    definition = struct.pack(
+        "<BBBHB", 0x40 | local_type, 0, 0, global_number, len(fields)
+    )
+    return definition + b"".join(struct.pack("<BBB", *field) for field in fields)
+
+
+def _fit_records(activity, local_type):
+    records = np.zeros(len(activity), dtype=FIT_RECORD_DTYPE)
+    semicircles = 2**31 / 180
+    records["header"] = local_type
+    records["timestamp"] = (_timestamps(activity) - FIT_EPOCH).total_seconds()
+    records["lat"] = np.round(activity["lat"].values * semicircles)
+    records["lon"] = np.round(activity["lon"].values * semicircles)
+    records["alt"] = np.round((activity["alt"].values + 500) * 5)
+    records["hr"] = activity["hr"].values
+    records["cad"] = activity["cad"].values
+    records["dist"] = np.round(activity["dist"].values * 100)
+    records["speed"] = np.round(activity["speed"].values * 1000)
+    records["temp"] = activity["temp"].values
+    return records.tobytes()
+
+
+def write_fit(activity, file_path):
+    """Writes the activity as an activity FIT file."""
+    start = int((activity.start - FIT_EPOCH).total_seconds())
+    end = start + int(activity.index[-1].total_seconds())
+    data = b"".join(
+        [
+            _fit_definition(0, "file_id"),
+            struct.pack("<BBHI", 0, 4, 1, start),
+            _fit_definition(1, "event"),
+            struct.pack("<BIBB", 1, start, 0, 0),
+            _fit_definition(2, "record"),
+            _fit_records(activity, 2),
+            _fit_definition(3, "lap"),
+            struct.pack("<BI", 3, end),
+        ]
+    )
+    header = struct.pack("<BBHI4s", 14, 0x10, 2093, len(data), b".FIT")
+    header += struct.pack("<H", Crc.calculate(header))
+    with open(file_path, "wb") as f:
+        f.write(header)
+        f.write(data)
+        f.write(struct.pack("<H", Crc.calculate(data, Crc.calculate(header))))
+
+
+def write_nikerun(activity, file_path):
+    """Writes the activity as a NikeRun API JSON response."""
+    epochs = (_timestamps(activity) - pd.Timestamp(0, tz="UTC")) // pd.Timedelta(
+        milliseconds=1
+    )
+    epochs = epochs.tolist()
+
+    def metric(metric_type, unit, values, cumulative=False):
+        ends = epochs[1:] + epochs[-1:] if cumulative else epochs
+        return {
+            "type": metric_type,
+            "unit": unit,
+            "values": [
+                {"start_epoch_ms": start, "end_epoch_ms": end, "value": value}
+                for start, end, value in zip(epochs, ends, values)
+            ],
+        }
+
+    distances = activity["dist"].diff().fillna(0) / 1000
+    response = {
+        "id": "runpandas-benchmark",
+        "type": "run",
+        "start_epoch_ms": epochs[0],
+        "end_epoch_ms": epochs[-1],
+        "metric_types": ["latitude", "longitude", "elevation", "heart_rate"],
+        "metrics": [
+            metric("latitude", "DD", activity["lat"].tolist()),
+            metric("longitude", "DD", activity["lon"].tolist()),
+            metric("elevation", "M", activity["alt"].tolist()),
+            metric("heart_rate", "BPM", activity["hr"].tolist()),
+            metric("distance", "KM", distances.tolist(), cumulative=True),
+        ],
+    }
+    with open(file_path, "w") as f:
+        json.dump(response, f)
+
+
+WRITERS = {
+    "tcx": write_tcx,
+    "gpx": write_gpx,
+    "fit": write_fit,
+    "nikerun": write_nikerun,
+}
+
+
+def file_name(file_format, n, directory="."):
+    return os.path.join(directory, "activity_%d%s" % (n, EXTENSIONS[file_format]))
+
+
+def write_file(file_format, n, directory="."):
+    """Writes a synthetic activity with ``n`` records and returns its path."""
+    file_path = file_name(file_format, n, directory)
+    WRITERS[file_format](make_activity(n), file_path)
+    return file_path
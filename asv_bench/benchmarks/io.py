@@ -0,0 +1,71 @@
+"""
+Benchmarks for reading training files.
+"""
+import os
+import pandas as pd
+import runpandas
+from .common import FORMATS, SIZES, START, make_activity, write_file, write_tcx
+
+
+def read(file_format, file_path, **kwargs):
+    if file_format == "nikerun":
+        return runpandas.read_nikerun(file_path, **kwargs)
+    return runpandas.read_file(file_path, **kwargs)
+
+
+class ReadFile:
+
+    params = [FORMATS, ["default", "fast"], SIZES]
+    param_names = ["file_format", "engine", "n"]
+    number = 1
+    repeat = 1
+    timeout = 1200
+
+    def setup_cache(self):
+        paths = {}
+        for file_format in FORMATS:
+            for n in SIZES:
+                paths[file_format, n] = write_file(file_format, n)
+        return paths
+
+    def setup(self, paths, file_format, engine, n):
+        if engine == "fast" and file_format not in ("tcx", "gpx", "fit"):
+            raise NotImplementedError("engine is only available for XML and FIT files")
+        self.kwargs = {"engine": engine} if engine == "fast" else {}
+
+    def time_read_file(self, paths, file_format, engine, n):
+        read(file_format, paths[file_format, n], **self.kwargs)
+
+    def peakmem_read_file(self, paths, file_format, engine, n):
+        read(file_format, paths[file_format, n], **self.kwargs)
+
+
+class ReadDirAggregate:
+
+    params = [SIZES, [None, 4]]
+    param_names = ["n", "workers"]
+    number = 1
+    repeat = 1
+    timeout = 1200
+
+    activities = 10
+
+    def setup_cache(self):
+        dirnames = {}
+        for n in SIZES:
+            dirnames[n] = "session_%d" % n
+            os.makedirs(dirnames[n], exist_ok=True)
+            for day in range(self.activities):
+                activity = make_activity(
+                    n // self.activities,
+                    start=START + pd.Timedelta(days=day),
+                    seed=day,
+                )
+                write_tcx(activity, os.path.join(dirnames[n], "%d.tcx" % day))
+        return dirnames
+
+    def time_read_dir_aggregate(self, dirnames, n, workers):
+        runpandas.read_dir_aggregate(dirnames[n], workers=workers)
+
+    def peakmem_read_dir_aggregate(self, dirnames, n, workers):
+        runpandas.read_dir_aggregate(dirnames[n], workers=workers)
@@ -0,0 +1,64 @@
+"""
+Benchmarks for the ``compute`` metrics accessor.
+"""
+import runpandas  # noqa
+from .common import SIZES, make_activity
+
+
+class Distance:
+
+    params = [1_000, 100_000, 1_000_000, 10_000_000]
+    param_names = ["n"]
+    timeout = 300
+
+    def setup(self, n):
+        self.activity = make_activity(n)
+
+    def time_distance(self, n):
+        self.activity.compute.distance()
+
+    def time_corrected_distance(self, n):
+        self.activity.compute.distance(correct_distance=True)
+
+    def peakmem_corrected_distance(self, n):
+        self.activity.compute.distance(correct_distance=True)
+
+
+class Compute:
+
+    params = SIZES
+    param_names = ["n"]
+    timeout = 300
+
+    zones = {
+        "bins": [0, 92, 110, 129, 147, 166, 184, 999],
+        "labels": ["Rest", "Z1", "Z2", "Z3", "Z4", "Z5", "Max"],
+    }
+
+    def setup(self, n):
+        self.activity = make_activity(n)
+        self.activity["distpos"] = self.activity.compute.distance()
+
+    def time_speed(self, n):
+        self.activity.compute.speed(from_distances=True)
+
+    def time_vertical_speed(self, n):
+        self.activity.compute.vertical_speed()
+
+    def time_gradient(self, n):
+        self.activity.compute.gradient()
+
+    def time_pace(self, n):
+        self.activity.compute.pace()
+
+    def time_heart_zone(self, n):
+        self.activity.compute.heart_zone(**self.zones)
+
+    def time_time_in_zone(self, n):
+        self.activity.compute.time_in_zone(**self.zones)
+
+    def time_only_moving(self, n):
+        self.activity.only_moving()
+
+    def peakmem_time_in_zone(self, n):
+        self.activity.compute.time_in_zone(**self.zones)
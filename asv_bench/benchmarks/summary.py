@@ -0,0 +1,61 @@
+"""
+Benchmarks for the activity and session summaries.
+"""
+import runpandas  # noqa
+from .common import SIZES, make_activity, make_session
+
+
+class ActivitySummary:
+
+    params = SIZES
+    param_names = ["n"]
+    timeout = 300
+
+    def setup(self, n):
+        self.activity = make_activity(n).only_moving()
+
+    def time_summary(self, n):
+        self.activity.summary()
+
+    def peakmem_summary(self, n):
+        self.activity.summary()
+
+
+class SessionSummary:
+
+    params = SIZES
+    param_names = ["n"]
+    timeout = 300
+
+    def setup(self, n):
+        self.session = make_session(n).session.only_moving()
+        # memoize the rows for the cached summaries
+        self.session.session.summarize()
+
+    def time_summarize(self, n):
+        self.session.session.summarize(cache=False)
+
+    def time_summarize_cached(self, n):
+        self.session.session.summarize()
+
+    def peakmem_summarize(self, n):
+        self.session.session.summarize(cache=False)
+
+
+class SessionMetrics:
+
+    params = SIZES
+    param_names = ["n"]
+    timeout = 300
+
+    def setup(self, n):
+        self.session = make_session(n)
+
+    def time_distance(self, n):
+        self.session.session.distance()
+
+    def time_only_moving(self, n):
+        self.session.session.only_moving()
+
+    def peakmem_distance(self, n):
+        self.session.session.distance()
@@ -1,12 +1,19 @@
 from runpandas.reader import _read_file as read_file  # noqa
 from runpandas.reader import _read_dir as read_dir  # noqa
 from runpandas.reader import _read_dir_aggregate as read_dir_aggregate  # noqa
+from runpandas.reader import _scan_file as scan_file  # noqa
+from runpandas.reader import _scan_dir as scan_dir  # noqa
 from runpandas.reader import _read_event_result as read_event  # noqa
 from runpandas.reader import get_events  # noqa
+from runpandas.cache import ActivityCache  # noqa
 from runpandas.io.strava._parser import read_strava  # noqa
+from runpandas.io.strava._parser import read_strava_many  # noqa
 from runpandas.io.strava._client import StravaClient  # noqa
 from runpandas.io.nikerun._parser import read_nikerun  # noqa
 from runpandas.io.nikerun._parser import read_dir_nikerun  # noqa
+from runpandas.io.arrow._parser import read_parquet  # noqa
+from runpandas.io.arrow._parser import read_feather  # noqa
+from runpandas.io.arrow._store import SessionStore  # noqa
 from runpandas.datasets.utils import activity_examples  # noqa
 from runpandas.datasets.schema import FileTypeEnum  # noqa
 from ._version import get_versions
@@ -20,10 +27,17 @@ __all__ = [
     "read_dir",
     "read_event",
     "read_dir_aggregate",
+    "scan_file",
+    "scan_dir",
+    "ActivityCache",
     "read_strava",
+    "read_strava_many",
     "StravaClient",
     "read_nikerun",
     "read_dir_nikerun",
+    "read_parquet",
+    "read_feather",
+    "SessionStore",
     "activity_examples",
     "get_events",
 ]
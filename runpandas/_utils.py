@@ -2,11 +2,31 @@
 """
 import os
 import re
+import bz2
+import gzip
+import mmap
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from itertools import islice
 from xml.etree.cElementTree import iterparse
 from functools import wraps
+import numpy as np
+
+try:
+    from lxml.etree import iterparse as lxml_iterparse
+except ImportError:  # pragma: no cover
+    lxml_iterparse = None
 from runpandas import exceptions
 from pandas import Series, Timedelta
 
+# Mean earth radius in meters (IUGG), the same used by the ``haversine`` package.
+EARTH_RADIUS_METERS = 6371008.8
+
+# The pools of workers available to :func:`pool_map`.
+EXECUTORS = {"process": ProcessPoolExecutor, "thread": ThreadPoolExecutor}
+
 
 def convert_pace_secmeters2minkms(seconds):
     """
@@ -18,6 +38,33 @@ def convert_pace_secmeters2minkms(seconds):
     return Timedelta(seconds=total_seconds)
 
 
+def haversine_distance(lat1, lon1, lat2, lon2):
+    """
+    Computes the great-circle distance in meters between two sets of points
+    using the haversine formula. All the coordinates must be in decimal degrees
+    and it works element-wise for scalars or ``numpy.ndarray`` objects.
+
+    Parameters
+    ----------
+    lat1, lon1 : float or numpy.ndarray
+        Latitudes and longitudes of the first points.
+    lat2, lon2 : float or numpy.ndarray
+        Latitudes and longitudes of the second points.
+
+    Returns
+    -------
+    The distance in meters between each pair of points.
+    """
+    lat1 = np.radians(lat1)
+    lon1 = np.radians(lon1)
+    lat2 = np.radians(lat2)
+    lon2 = np.radians(lon2)
+    lat = lat2 - lat1
+    lon = lon2 - lon1
+    d = np.sin(lat * 0.5) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(lon * 0.5) ** 2
+    return EARTH_RADIUS_METERS * (2 * np.arcsin(np.sqrt(d)))
+
+
 def file_exists(fname):
     """Check if a file exists and is non-empty."""
     try:
@@ -26,29 +73,104 @@ def file_exists(fname):
         return False
 
 
+COMPRESSION_EXTENSIONS = [".gz", ".bz2", ".zip"]
+
+# The formats of the activity files, see :func:`is_valid`.
+FILETYPES = ["tcx", "gpx", "fit"]
+
+
 def splitext_plus(fname):
     """Split on file extensions, allowing for zipped extensions."""
     base, ext = os.path.splitext(fname)
-    if ext in [".gz", ".bz2", ".zip"]:
+    if ext in COMPRESSION_EXTENSIONS:
         base, ext2 = os.path.splitext(base)
         ext = ext2 + ext
     return base, ext.lower()
 
 
+def get_filetype(fname):
+    """Returns the format of a training file by its extension, ignoring the
+    compression extension (e.g. ``tcx`` for ``activity.tcx.gz``)."""
+    _, ext = splitext_plus(os.fspath(fname))
+    return ext.split(".")[1] if ext else ""
+
+
 def is_valid(fname):
     """Check if it is a valid format for activity files.
 
     Parameters
     ----------
     fname : str
-        Path to the file to be read.
+        Path to the file to be read, it may be compressed
+        (``.gz``, ``.bz2`` or ``.zip``).
 
     Returns
     -------
     It returns True if the it is a valid format for activities handling.
     """
-    _, ext = os.path.splitext(fname)
-    return ext.lower() in [".tcx", ".gpx", ".fit"]
+    return get_filetype(fname) in FILETYPES
+
+
+def is_file_like(obj):
+    """Check if the object is a file object (it has a ``read`` method and it
+    is not a path)."""
+    return hasattr(obj, "read") and not isinstance(obj, (str, os.PathLike))
+
+
+@contextmanager
+def open_source(source):
+    """Opens a training file as a binary file object for the parsers.
+
+    The compressed files (``.gz``, ``.bz2`` or a ``.zip`` archive with
+    a single file) are decompressed while they are read, and the plain files
+    are memory-mapped, so they are not copied into memory.
+
+    Parameters
+    ----------
+    source : str or file object
+        Path to the file to be read. File objects are returned as is
+        (and not closed).
+
+    Yields
+    ------
+    A binary file object (a ``mmap.mmap`` for the plain files).
+    """
+    if is_file_like(source):
+        yield source
+        return
+
+    file_path = os.fspath(source)
+    compression = os.path.splitext(file_path)[1]
+    if compression == ".gz":
+        with gzip.open(file_path, "rb") as compressed_file:
+            yield compressed_file
+    elif compression == ".bz2":
+        with bz2.open(file_path, "rb") as compressed_file:
+            yield compressed_file
+    elif compression == ".zip":
+        with zipfile.ZipFile(file_path) as archive:
+            members = [name for name in archive.namelist() if not name.endswith("/")]
+            if len(members) != 1:
+                raise exceptions.InvalidFileError("single file zip")
+            with archive.open(members[0]) as compressed_file:
+                yield compressed_file
+    else:
+        with open(file_path, "rb") as plain_file:
+            try:
+                buffer = mmap.mmap(plain_file.fileno(), 0, access=mmap.ACCESS_READ)
+            except (ValueError, OSError):
+                # e.g. empty files or file systems without mmap support
+                yield plain_file
+                return
+            try:
+                yield buffer
+            finally:
+                try:
+                    buffer.close()
+                except BufferError:
+                    # still exported (e.g. by an array kept in a traceback),
+                    # it is closed when collected.
+                    pass
 
 
 def recursive_text_extract(node):
@@ -100,6 +222,127 @@ def get_nodes(file_path, node_names, *, with_root=False):
             root.clear()
 
 
+def _text_extract(node, names, selected=None):
+    """Same as :func:`recursive_text_extract`, but caching the tag names
+    without namespace in `names` and keeping only the `selected` ones."""
+    ds = {}
+    stack = []
+    # "*" skips comments and processing instructions
+    for child in node.iter("*"):
+        tag = child.tag
+        name = names.get(tag)
+        if name is None:
+            name = names[tag] = sans_ns(tag)
+        text = child.text
+        if text is not None and text.strip():
+            if name == "Value":
+                name = names[stack.pop()]
+            if selected is None or selected(name):
+                ds[name] = text
+        else:
+            stack.append(tag)
+    return ds
+
+
+def get_columns(
+    file_path, node_name, root_name, *, with_attributes=False, selected=None
+):
+    """Stream a XML document and extract the text values of each ``node_name``
+    node straight into column buffers, so no list of records has to be kept
+    and converted by pandas afterwards. It uses ``lxml`` if it is installed, otherwise it falls back to the
+    standard library ``ElementTree``.
+
+    The columns are named the same way as :func:`recursive_text_extract`
+    does and missing values are filled with NaN.
+
+    Parameters
+    ----------
+    filepath : str
+        Path to the file to be read.
+    node_name : str
+        The node to be extracted (e.g. ``Trackpoint``).
+    root_name : str
+        The expected root node of the document.
+    with_attributes: boolean
+        Default to False. If True the node attributes are also extracted.
+    selected: callable, optional
+        Only the children nodes and attributes whose name it returns True
+        for are extracted (see :func:`column_selector`). Defaults to None
+        (all of them).
+
+    Returns
+    -------
+    A dict with the column names as keys and the list of text values
+    as values.
+
+    Raises
+    ------
+    InvalidFileError
+        if the root node of the document is not `root_name`.
+    """
+    if lxml_iterparse is not None:
+        # only the ``node_name`` nodes reach python, the rest is handled by lxml.
+        context = lxml_iterparse(
+            file_path,
+            events=("end",),
+            tag="{*}" + node_name,
+            remove_blank_text=True,
+        )
+        nodes = (element for _, element in context)
+    else:
+        context = iter(iterparse(file_path, events=("start", "end")))
+        _, root = next(context)
+        nodes = (
+            element
+            for event, element in context
+            if event == "end" and sans_ns(element.tag) == node_name
+        )
+
+    names = {}
+    columns = {}
+    size = 0
+    nan = float("nan")
+
+    for element in nodes:
+        if size == 0 and lxml_iterparse is not None:
+            root = element.getroottree().getroot()
+        if size == 0 and sans_ns(root.tag) != root_name:
+            raise exceptions.InvalidFileError(root_name)
+
+        row = _text_extract(element, names, selected)
+        if with_attributes:
+            row.update(
+                (name, value)
+                for name, value in element.items()
+                if selected is None or selected(name)
+            )
+
+        for name, text in row.items():
+            buffer = columns.get(name)
+            if buffer is None:
+                buffer = columns[name] = [nan] * size
+            buffer.append(text)
+        size += 1
+        if len(row) != len(columns):
+            for buffer in columns.values():
+                if len(buffer) < size:
+                    buffer.append(nan)
+
+        if lxml_iterparse is not None:
+            element.clear()
+            while element.getprevious() is not None:
+                del element.getparent()[0]
+        else:
+            root.clear()
+
+    if size == 0:
+        root = context.root if lxml_iterparse is not None else root
+        if sans_ns(root.tag) != root_name:
+            raise exceptions.InvalidFileError(root_name)
+
+    return columns
+
+
 def camelcase_to_snakecase(string):
     """Converts the Camelcase string to snakecase string
     Example: ColumnName --> column_name
@@ -116,6 +359,58 @@ def camelcase_to_snakecase(string):
     return re.sub("([a-z0-9])([A-Z])", r"\1_\2", string).lower()
 
 
+def column_selector(columns, cspecs, keep=()):
+    """Builds the predicate used by the parsers to read only the fields
+    of a training file needed by the requested columns.
+
+    Parameters
+    ----------
+    columns : list or None
+        The requested columns, by their runpandas name (e.g. ``hr``) or by the
+        snake case name of the field in the file (e.g. ``heart_rate_bpm``).
+    cspecs : dict
+        The column specifications of the file format.
+    keep : tuple, optional
+        Snake case names of the fields always read (e.g. the timestamps).
+
+    Returns
+    -------
+    A function that returns True if the field with the given name (as it is
+    named in the file) must be read, or None if `columns` is None.
+    """
+    if columns is None:
+        return None
+    if isinstance(columns, str):
+        columns = [columns]
+    requested = set(columns).union(keep)
+    selected = {}
+
+    def is_selected(name):
+        try:
+            return selected[name]
+        except KeyError:
+            key = camelcase_to_snakecase(name)
+            selected[name] = key in requested or spec_colname(cspecs, key) in requested
+            return selected[name]
+
+    return is_selected
+
+
+def spec_colname(cspecs, key):
+    """Returns the runpandas name of the column built from the field `key`
+    (its snake case name), or `key` itself if it has no special column."""
+    spec = cspecs.get(key)
+    if spec is None:
+        return key
+    # the lat/lon of some formats are built by a classmethod
+    return getattr(spec, "__self__", spec).colname
+
+
+def select_specs(cspecs, data):
+    """Returns the column specifications of the columns present in `data`."""
+    return {key: spec for key, spec in cspecs.items() if key in data.columns}
+
+
 def special_column(required_columns, name=None):
     """
     Decorator for certain methods of acessors that create special columns
@@ -157,3 +452,69 @@ class series_property:
 
     def __get__(self, obj, objtype=None):
         return Series(self.fget(obj), index=obj.index)
+
+
+def pool_map(func, items, workers=None, executor="process", window=None):
+    """
+    Calls `func` with each one of the `items`, one by one or with a pool of
+    workers, and yields the results in the same order of `items`.
+
+    Only `window` calls are submitted to the pool ahead of the results
+    yielded, so the items are consumed and the results kept in memory as
+    they are needed.
+
+    Parameters
+    ----------
+    func : callable
+        The function called with each item, it must be picklable to be used
+        with the "process" executor.
+    items : iterable
+        The arguments of the calls.
+    workers : int, optional
+        The number of workers. If None or 1 the items are processed one by one.
+    executor : {"process", "thread"}, optional
+        The pool of workers used when `workers > 1`. Defaults to "process".
+    window : int, optional
+        The maximum number of calls submitted and not yielded yet.
+        Defaults to twice the number of workers.
+
+    Yields
+    ------
+    A tuple (item, result, error) for each item. `result` is None if the call
+    failed and `error` is the exception raised.
+    """
+    if workers is None or workers <= 1:
+        for item in items:
+            try:
+                result = func(item)
+            except Exception as error:
+                yield item, None, error
+            else:
+                yield item, result, None
+        return
+
+    if executor not in EXECUTORS:
+        raise ValueError(
+            "executor must be one of %s, got %r." % (", ".join(EXECUTORS), executor)
+        )
+
+    items = iter(items)
+    pending = deque()
+    with EXECUTORS[executor](max_workers=workers) as pool:
+        try:
+            for item in islice(items, window or 2 * workers):
+                pending.append((item, pool.submit(func, item)))
+            while pending:
+                item, future = pending.popleft()
+                try:
+                    result, error = future.result(), None
+                except Exception as exc:
+                    result, error = None, exc
+                del future
+                # keep the workers busy while the caller handles the result
+                for next_item in islice(items, 1):
+                    pending.append((next_item, pool.submit(func, next_item)))
+                yield item, result, error
+        finally:
+            for _, future in pending:
+                future.cancel()
@@ -0,0 +1,154 @@
+"""
+On-disk cache for parsed activities, so unchanged training files
+don't need to be parsed again.
+"""
+
+import hashlib
+import json
+import os
+import uuid
+from pathlib import Path
+from runpandas.io.arrow._parser import from_table, to_table
+
+try:
+    import pyarrow
+    from pyarrow import feather
+except ImportError:  # pragma: no cover
+    pyarrow = None
+
+# Key of the cache entry metadata in the Arrow schema metadata.
+METADATA_KEY = b"runpandas_cache"
+
+
+def _file_hash(file_path, chunk_size=2**20):
+    """Returns the blake2b hex digest of the file content."""
+    digest = hashlib.blake2b(digest_size=20)
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ActivityCache:
+    """
+    A size-bounded on-disk cache of parsed activities.
+
+    Each parsed ``Activity`` (or ``pandas.DataFrame``) is stored as a Feather
+    file (see :meth:`runpandas.Activity.to_feather`). An entry is keyed by the path of
+    the source file and the reading options, and it is valid while the size,
+    the modification time and the content hash of the source file match.
+    If only the modification time changed, the content hash is checked
+    before parsing the file again. When the cache is bigger than
+    ``max_size`` the least recently used entries are evicted.
+
+    It requires the ``pyarrow`` package.
+
+    Parameters
+    ----------
+    path : str
+        The directory where the cached activities are stored.
+    max_size : int, optional
+        The maximum size of the cache in bytes. Defaults to 1 GB.
+    """
+
+    EXTENSION = ".feather"
+
+    def __init__(self, path, max_size=2**30):
+        if pyarrow is None:
+            raise ImportError("pyarrow is required to use the activity cache.")
+        self.path = Path(os.path.expandvars(os.path.expanduser(path))).absolute()
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.max_size = max_size
+
+    def _entry(self, file_path, **kwargs):
+        key = json.dumps(
+            [
+                os.path.abspath(file_path),
+                sorted((k, repr(v)) for k, v in kwargs.items()),
+            ]
+        )
+        return self.path / (
+            hashlib.sha1(key.encode("utf-8")).hexdigest() + self.EXTENSION
+        )
+
+    def get(self, file_path, **kwargs):
+        """
+        Returns the cached activity parsed from `file_path` with the
+        reading options `kwargs`, or None if there is no valid entry.
+        """
+        entry = self._entry(file_path, **kwargs)
+        try:
+            table = feather.read_table(entry, memory_map=True)
+            metadata = json.loads(table.schema.metadata[METADATA_KEY])
+        except (OSError, KeyError, TypeError, ValueError, pyarrow.ArrowInvalid):
+            return None
+
+        stat = os.stat(file_path)
+        if metadata["size"] != stat.st_size:
+            return None
+        if metadata["mtime"] != stat.st_mtime_ns:
+            if metadata["hash"] != _file_hash(file_path):
+                return None
+            metadata["mtime"] = stat.st_mtime_ns
+            self._write(entry, table, metadata)
+        else:
+            # mark the entry as recently used
+            os.utime(entry)
+
+        return from_table(table)
+
+    def put(self, file_path, activity, **kwargs):
+        """
+        Stores the `activity` parsed from `file_path` with the reading
+        options `kwargs`, and evicts the least recently used entries
+        if the cache is full.
+        """
+        stat = os.stat(file_path)
+        metadata = {
+            "path": os.path.abspath(file_path),
+            "size": stat.st_size,
+            "mtime": stat.st_mtime_ns,
+            "hash": _file_hash(file_path),
+        }
+        self._write(self._entry(file_path, **kwargs), to_table(activity), metadata)
+        self.evict()
+
+    def _write(self, entry, table, metadata):
+        table = table.replace_schema_metadata(
+            {**table.schema.metadata, METADATA_KEY: json.dumps(metadata)}
+        )
+        # write to a temporary file first, so readers never see partial entries
+        tmp_entry = entry.with_name("%s.%s.tmp" % (entry.name, uuid.uuid4().hex))
+        feather.write_feather(table, tmp_entry)
+        os.replace(tmp_entry, entry)
+
+    def evict(self):
+        """
+        Removes the least recently used entries until the cache
+        size is below `max_size`.
+        """
+        entries = []
+        for entry in self.path.glob("*" + self.EXTENSION):
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, entry))
+
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries, key=lambda item: item[0]):
+            if total_size <= self.max_size:
+                break
+            try:
+                entry.unlink()
+            except FileNotFoundError:
+                pass
+            total_size -= size
+
+    def clear(self):
+        """Removes all the entries from the cache."""
+        for entry in self.path.glob("*" + self.EXTENSION):
+            try:
+                entry.unlink()
+            except FileNotFoundError:
+                pass
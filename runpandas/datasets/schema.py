@@ -6,6 +6,9 @@ from typing import List
 
 from pydantic import BaseModel, validator
 
+# Directory, next to the downloaded race results, of their parsed copies.
+CACHE_DIR = "parsed"
+
 
 class MetricsEnum(Enum):
     latitude = "latitude"
@@ -101,10 +104,29 @@ class EventData(BaseModel):
             self.edition,
         )
 
-    def load(self):
-        from runpandas.io.result._parser import read
-
-        return read(self.path)
+    def load(self, cache=True):
+        """
+        Loads the race result of the edition.
+
+        Parameters
+        ----------
+        cache: bool, optional
+            Keep a typed binary copy of the parsed result next to the
+            downloaded file, so the next loads skip the CSV parsing.
+            It requires ``pyarrow`` and it is ignored without it.
+            Default is True.
+
+        Returns
+        -------
+        The :obj:`runpandas.RaceResult` of the edition.
+        """
+        from runpandas import cache as activity_cache
+        from runpandas.reader import _read_event_result
+
+        cache_dir = None
+        if cache and activity_cache.pyarrow is not None:
+            cache_dir = self.path.parent / CACHE_DIR
+        return _read_event_result(self.path, cache=cache_dir)
 
 
 class RaceData(BaseModel):
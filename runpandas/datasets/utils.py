@@ -1,13 +1,23 @@
 """Utility functions for loading example datasets"""
 
 import os
+import hashlib
+import json
+import time
+import uuid
+import warnings
+from collections import Counter, defaultdict
 from typing import List
+from urllib.error import HTTPError, URLError
 from urllib.request import Request, urlopen, urlretrieve
 from urllib.parse import urljoin
+import numpy as np
 import yaml
 from pydantic import parse_obj_as
+from runpandas import _utils as utils
 from runpandas.datasets.schema import ActivityData, RaceData, EventData
 from thefuzz import fuzz
+from thefuzz import utils as fuzz_utils
 
 ACTIVITIES_INDEX = (
     "https://raw.githubusercontent.com/"
@@ -20,32 +30,273 @@ RACES_INDEX = (
 )
 
 
-def _get_event_index(index=RACES_INDEX):
+# Seconds a downloaded index is used before it is revalidated with the server.
+INDEX_TTL = 24 * 60 * 60
+
+# Environment variable that, when set to 1, disables the downloads of the indexes,
+# so only their local copies are used.
+OFFLINE_ENV = "RUNPANDAS_OFFLINE"
+
+# The parsed indexes of the process, {(url, model): (expiration time, entries)}.
+_INDEX_MEMO = {}
+
+# The search indexes of the event summaries, {url: _EventSearchIndex}.
+_SEARCH_MEMO = {}
+
+# Maximum number of race results downloaded at the same time.
+DOWNLOAD_WORKERS = 4
+
+
+def _is_offline(offline=None):
+    if offline is None:
+        return os.getenv(OFFLINE_ENV, "0").lower() in ("1", "true", "yes")
+    return offline
+
+
+def _write_atomic(file_path, content):
+    # write to a temporary file first, so readers never see partial files
+    tmp_path = "%s.%s.tmp" % (file_path, uuid.uuid4().hex)
+    with open(tmp_path, "wb") as f:
+        f.write(content)
+    os.replace(tmp_path, file_path)
+
+
+def _fetch_index(index, config=None, ttl=None, offline=None):
     """
-    Race results available for data analytics.
-    Requires an internet connection.
+    Returns the content of a remote index file. It is kept in the ``index``
+    directory of the cache path (see :func:`_get_cache_path`) with its
+    ``ETag`` and ``Last-Modified`` headers, and the local copy is used
+    until it is older than `ttl` seconds. Then the server is asked for
+    the index only if it was modified.
+
+    Parameters
+    ----------
+    index : str
+        The url of the index file.
+    config : yaml file, optional
+        The config file with the cache path; see :func:`_get_cache_path`.
+    ttl : int, optional
+        Seconds the local copy is used without revalidation.
+        Defaults to ``INDEX_TTL`` (a day).
+    offline : bool, optional
+        Use the local copy whatever its age, without any request. Defaults to
+        None (True if the ``RUNPANDAS_OFFLINE`` environment variable is 1).
+
+    Returns
+    -------
+    The content of the index file as bytes.
+
+    Raises
+    ------
+    IOError
+        if it is offline and there is no local copy of the index.
     """
+    ttl = INDEX_TTL if ttl is None else ttl
+    directory = os.path.join(_get_cache_path(config), "index")
+    os.makedirs(directory, exist_ok=True)
+    name = hashlib.sha1(index.encode("utf-8")).hexdigest()
+    content_path = os.path.join(directory, name + ".yml")
+    headers_path = os.path.join(directory, name + ".json")
+
+    try:
+        with open(headers_path) as f:
+            cached_headers = json.load(f)
+        with open(content_path, "rb") as f:
+            content = f.read()
+    except (OSError, ValueError):
+        cached_headers, content = {}, None
+
+    if content is not None and (
+        _is_offline(offline) or time.time() - cached_headers["fetched"] < ttl
+    ):
+        return content
+    if _is_offline(offline):
+        raise IOError("The index %s is not available offline." % index)
+
     req = Request(index)
-    with urlopen(req) as resp:  # nosec
-        content = resp.read()
-        raw_index = yaml.safe_load(content)
+    if content is not None:
+        if cached_headers.get("etag"):
+            req.add_header("If-None-Match", cached_headers["etag"])
+        if cached_headers.get("last_modified"):
+            req.add_header("If-Modified-Since", cached_headers["last_modified"])
+    try:
+        with urlopen(req) as resp:  # nosec
+            content = resp.read()
+            cached_headers = {
+                "etag": resp.headers.get("ETag"),
+                "last_modified": resp.headers.get("Last-Modified"),
+            }
+        _write_atomic(content_path, content)
+    except URLError as error:
+        if content is None:
+            raise
+        # 304: the local copy is still valid, otherwise it is used while
+        # the server is failing or not reachable
+        if not isinstance(error, HTTPError) or error.code != 304:
+            warnings.warn(
+                "The index %s could not be downloaded (%s), using its local copy."
+                % (index, error.reason),
+                UserWarning,
+            )
+            return content
+
+    cached_headers["fetched"] = time.time()
+    _write_atomic(headers_path, json.dumps(cached_headers).encode("utf-8"))
+    return content
 
-    loaded_data = parse_obj_as(List[RaceData], raw_index)
-    return loaded_data
 
+def _load_index(index, model, config=None, offline=None):
+    """Returns the entries of an index parsed as `model` instances. They are
+    kept in memory for ``INDEX_TTL`` seconds, so next calls of the process
+    don't read nor parse the index again."""
+    key = (index, model)
+    now = time.time()
+    memo = _INDEX_MEMO.get(key)
+    if memo is not None and memo[0] > now:
+        return list(memo[1])
 
-def _get_activity_index(index=ACTIVITIES_INDEX):
+    raw_index = yaml.safe_load(_fetch_index(index, config, offline=offline))
+    loaded_data = parse_obj_as(List[model], raw_index)
+    _INDEX_MEMO[key] = (now + INDEX_TTL, loaded_data)
+    return list(loaded_data)
+
+
+def _get_event_index(index=RACES_INDEX, config=None, offline=None):
+    """
+    Race results available for data analytics.
+    The index is downloaded once and then revalidated daily (see
+    :func:`_fetch_index`), so it requires an internet connection only
+    the first time.
+    """
+    return _load_index(index, RaceData, config, offline)
+
+
+def _get_activity_index(index=ACTIVITIES_INDEX, config=None, offline=None):
     """Report available example activities.
-    Requires an internet connection.
+    The index is downloaded once and then revalidated daily (see
+    :func:`_fetch_index`), so it requires an internet connection only
+    the first time.
     """
-    req = Request(index)
-    with urlopen(req) as resp:  # nosec
-        content = resp.read()
-        raw_index = yaml.safe_load(content)
+    return _load_index(index, ActivityData, config, offline)
+
 
-    loaded_data = parse_obj_as(List[ActivityData], raw_index)
+class _EventSearchIndex:
+    """
+    Inverted indexes of the tokens and of the character trigrams of the event
+    summaries, used to select the events that may match an identifier before
+    scoring them with ``fuzz.token_set_ratio``.
+
+    The selection never misses a match: ``token_set_ratio`` of two summaries
+    without common tokens is the ratio of their sorted tokens, and a ratio
+    above 90 requires an edit distance below 10% of their lengths, so they
+    must share at least ``max(la, lb) - 2 - 3 * 0.1 * (la + lb)`` trigrams
+    (the q-gram lemma).
+    """
+
+    def __init__(self, events):
+        self.events = events
+        self.summaries = []
+        lengths = []
+        tokens = defaultdict(list)
+        grams = defaultdict(lambda: ([], []))
+        for position, event in enumerate(events):
+            summary = self._process(event.summary)
+            self.summaries.append(summary)
+            for token in set(summary.split()):
+                tokens[token].append(position)
+            text = self._sorted_tokens(summary)
+            lengths.append(len(text))
+            for gram, count in self._grams(text).items():
+                grams[gram][0].append(position)
+                grams[gram][1].append(count)
+        self.lengths = np.array(lengths, dtype="float64")
+        self.tokens = {token: np.array(pos) for token, pos in tokens.items()}
+        self.grams = {
+            gram: (np.array(pos), np.array(counts))
+            for gram, (pos, counts) in grams.items()
+        }
+
+    @staticmethod
+    def _process(text):
+        # the same processing of token_set_ratio
+        return fuzz_utils.full_process((text or "").casefold(), force_ascii=True)
+
+    @staticmethod
+    def _sorted_tokens(text):
+        return " ".join(sorted(set(text.split())))
+
+    @staticmethod
+    def _grams(text):
+        return Counter(text[i : i + 3] for i in range(len(text) - 2))
+
+    def indexes(self, events):
+        """Returns True if it was built from the same `events` entries."""
+        return len(events) == len(self.events) and all(
+            map(lambda a, b: a is b, events, self.events)
+        )
 
-    return loaded_data
+    def candidates(self, search_name):
+        """Returns the sorted positions of the events that may match."""
+        query = self._process(search_name)
+        selected = np.zeros(len(self.events), dtype=bool)
+        for token in set(query.split()):
+            if token in self.tokens:
+                selected[self.tokens[token]] = True
+
+        text = self._sorted_tokens(query)
+        shared = np.zeros(len(self.events))
+        for gram, count in self._grams(text).items():
+            if gram in self.grams:
+                positions, counts = self.grams[gram]
+                shared[positions] += np.minimum(counts, count)
+        length = len(text)
+        bound = np.maximum(length, self.lengths) - 2 - 0.3 * (length + self.lengths)
+        selected |= shared >= bound
+        return np.flatnonzero(selected)
+
+    def search(self, search_name, score=90):
+        """Returns the events whose summary ``token_set_ratio`` with
+        `search_name` is greater than `score`, in the index order."""
+        query = self._process(search_name)
+        return [
+            self.events[position]
+            for position in self.candidates(search_name)
+            if fuzz.token_set_ratio(query, self.summaries[position], full_process=False)
+            > score
+        ]
+
+
+def _event_search_index(events, index=RACES_INDEX):
+    """Returns the search index of the `events`, built once per index."""
+    search_index = _SEARCH_MEMO.get(index)
+    if search_index is None or not search_index.indexes(events):
+        search_index = _SEARCH_MEMO[index] = _EventSearchIndex(events)
+    return search_index
+
+
+def _download(url, file_path):
+    # download next to the destination first, so no partial file is cached
+    tmp_path = "%s.%s.tmp" % (file_path, uuid.uuid4().hex)
+    try:
+        urlretrieve(url, tmp_path)  # nosec
+        os.replace(tmp_path, file_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _download_files(downloads, workers=None):
+    """Downloads the (url, file path) pairs with a pool of `workers` threads
+    (``DOWNLOAD_WORKERS`` by default)."""
+    workers = min(workers or DOWNLOAD_WORKERS, len(downloads))
+    for _, _, error in utils.pool_map(
+        lambda download: _download(*download),
+        downloads,
+        workers=workers,
+        executor="thread",
+    ):
+        if error is not None:
+            raise error
 
 
 def _get_config_data(config_path=None):
@@ -73,7 +324,7 @@ def _get_cache_path(config=None):
     return data_home
 
 
-def activity_examples(path=None, file_type=None, config=None, **kwargs):
+def activity_examples(path=None, file_type=None, config=None, offline=None, **kwargs):
     """Load an example activity from the online repository (requires internet).
 
     This function provides quick access to a small number of example datasets
@@ -91,6 +342,10 @@ def activity_examples(path=None, file_type=None, config=None, **kwargs):
         Iterates over all files with the given file type and return them.
     config : yaml file, optional
         The directory in which to cache data; see :func:`get_cache_path`.
+    offline : bool, optional
+        Only use the local copies of the index and of the activities,
+        without any request. Defaults to None (True if the
+        ``RUNPANDAS_OFFLINE`` environment variable is 1).
     kwargs : keys and values, optional
         Additional keyword arguments are passed to passed through to
         :func:`runpandas.read_file`.
@@ -99,7 +354,7 @@ def activity_examples(path=None, file_type=None, config=None, **kwargs):
     loaded_data : a single or a list of :class:`schema.ActivityData` instances.
 
     """
-    activities = _get_activity_index()
+    activities = _get_activity_index(config=config, offline=offline)
     if path is not None:
         for activity in activities:
             if os.path.basename(activity.path) == path:
@@ -107,20 +362,27 @@ def activity_examples(path=None, file_type=None, config=None, **kwargs):
                     _get_cache_path(config), os.path.basename(path)
                 )
                 if not os.path.exists(cache_path):
+                    if _is_offline(offline):
+                        raise IOError("%s is not available offline." % path)
                     urlretrieve(activity.path, cache_path)  # nosec
-                activity.path = cache_path
-                return activity
+                # the index entries are shared by the calls of the process
+                return activity.copy(update={"path": cache_path})
         raise ValueError(f"'{path}' is not one of the example datasets.")
 
     if file_type is not None:
-        activities = filter(
-            lambda file: file.file_type == file_type, activity_examples()
-        )
+        activities = filter(lambda file: file.file_type == file_type, activities)
 
     return activities
 
 
-def get_events(identifier, year=None, run_type=None, config=None):
+def get_events(
+    identifier,
+    year=None,
+    run_type=None,
+    config=None,
+    offline=None,
+    workers=None,
+):
     """
     Return the event results (i.e. races) from the online repository (requires internet).
 
@@ -144,6 +406,13 @@ def get_events(identifier, year=None, run_type=None, config=None):
         with the given run type and return them.
     config : yaml file, optional
         The directory in which to cache data; see :func:`get_cache_path`.
+    offline : bool, optional
+        Only use the local copies of the index and of the race results,
+        without any request. Defaults to None (True if the
+        ``RUNPANDAS_OFFLINE`` environment variable is 1).
+    workers : int, optional
+        Number of race results downloaded at the same time. Defaults to None
+        (``DOWNLOAD_WORKERS``, 4).
 
     Returns
     -------
@@ -160,54 +429,49 @@ def get_events(identifier, year=None, run_type=None, config=None):
         return match_result
 
     def __identifier_search(events, search_name):
-        match_result = []
         # try using the fuzzy match the identifier against the summary
-        for event in events:
-            ratio = fuzz.token_set_ratio(
-                search_name.casefold(), event.summary.casefold()
-            )
-            if ratio > 90:
-                match_result.append(event)
-        return match_result
+        return _event_search_index(events).search(search_name)
 
-    events = _get_event_index()
+    events = _get_event_index(config=config, offline=offline)
     match_result = __string_search(events, identifier) or __identifier_search(
         events, identifier
     )
+    if run_type is not None:
+        match_result = [
+            match for match in match_result if str(match.run_type) == str(run_type)
+        ]
+
     result_set = []
-    if len(match_result) != 0:
-        for match in match_result:
-            cache_path = os.path.join(
-                _get_cache_path(config), os.path.basename(match.path)
+    downloads = []
+    for match in match_result:
+        cache_path = os.path.join(_get_cache_path(config), os.path.basename(match.path))
+        if not os.path.exists(cache_path):
+            os.makedirs(cache_path)
+        for edition in match.editions:
+            # only the requested editions are downloaded
+            if year is not None and str(edition) != str(year):
+                continue
+            url_path = urljoin(
+                match.path + "/",
+                "{path}_{edition}.csv".format(
+                    path=os.path.basename(match.path), edition=edition
+                ),
             )
-            if not os.path.exists(cache_path):
-                os.makedirs(cache_path)
-            for edition in match.editions:
-                url_path = urljoin(
-                    match.path + "/",
-                    "{path}_{edition}.csv".format(
-                        path=os.path.basename(match.path), edition=edition
-                    ),
-                )
-                event_cache_path = os.path.join(cache_path, os.path.basename(url_path))
-                if not os.path.exists(event_cache_path):
-                    urlretrieve(url_path, event_cache_path)  # nosec
-
-                edition = EventData(
-                    summary=match.summary,
-                    path=event_cache_path,
-                    run_type=match.run_type,
-                    country=match.country,
-                    included_data=match.included_data,
-                    edition=edition,
-                )
-                result_set.append(edition)
-
-    if year is not None:
-        result_set = filter(lambda event: str(event.edition) == str(year), result_set)
-    if run_type is not None:
-        result_set = filter(
-            lambda event: str(event.run_type) == str(run_type), result_set
-        )
+            event_cache_path = os.path.join(cache_path, os.path.basename(url_path))
+            if not os.path.exists(event_cache_path):
+                if _is_offline(offline):
+                    raise IOError("%s is not available offline." % url_path)
+                downloads.append((url_path, event_cache_path))
+
+            edition = EventData(
+                summary=match.summary,
+                path=event_cache_path,
+                run_type=match.run_type,
+                country=match.country,
+                included_data=match.included_data,
+                edition=edition,
+            )
+            result_set.append(edition)
 
+    _download_files(downloads, workers)
     return result_set
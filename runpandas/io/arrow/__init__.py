@@ -0,0 +1,4 @@
+from runpandas.io.arrow._parser import read_parquet  # noqa
+from runpandas.io.arrow._parser import read_feather  # noqa
+from runpandas.io.arrow._parser import to_parquet  # noqa
+from runpandas.io.arrow._parser import to_feather  # noqa
@@ -0,0 +1,241 @@
+"""
+Tools for storing and loading activities (and race results) in the Parquet
+and Feather columnar formats (Apache Arrow).
+"""
+import io
+import json
+from datetime import datetime
+import pandas as pd
+from pandas.io.common import get_handle
+from runpandas.types import Activity
+from runpandas.types.frame import Event, RaceResult
+
+try:
+    import pyarrow
+    from pyarrow import feather, parquet
+except ImportError:  # pragma: no cover
+    pyarrow = None
+
+# Key of the runpandas metadata in the Arrow schema metadata.
+METADATA_KEY = b"runpandas"
+
+
+def _check_pyarrow():
+    if pyarrow is None:
+        raise ImportError("pyarrow is required to read and write Parquet/Feather.")
+
+
+def _event_metadata(event):
+    return {
+        "name": event.event_name,
+        "type": event.event_type,
+        "country": event.event_country,
+        "date": None if event.event_date is None else event.event_date.isoformat(),
+    }
+
+
+def _event_from_metadata(metadata):
+    return Event(
+        event_name=metadata["name"],
+        event_type=metadata["type"],
+        event_country=metadata["country"],
+        event_date=None
+        if metadata["date"] is None
+        else datetime.fromisoformat(metadata["date"]),
+    )
+
+
+def to_table(activity, index=True):
+    """
+    Converts an activity to a ``pyarrow.Table``. The ``start`` timestamp
+    is kept in the table schema metadata (the special columns are restored
+    by their names). For a :obj:`runpandas.RaceResult` its ``event`` is kept
+    instead.
+
+    Parameters
+    ----------
+        activity : :obj:`runpandas.Activity`, :obj:`runpandas.RaceResult`
+             or :obj:`pandas.DataFrame`
+        index : bool, optional
+            Store the index as columns; see the ``preserve_index`` option of
+            ``pyarrow.Table.from_pandas``. Default is True.
+
+    Returns
+    -------
+    A ``pyarrow.Table``.
+    """
+    _check_pyarrow()
+    metadata = {"activity": isinstance(activity, Activity), "start": None}
+    start = getattr(activity, "start", None)
+    if metadata["activity"] and start is not None:
+        start = pd.Timestamp(start)
+        metadata["start"] = {
+            "value": start.value,
+            "tz": None if start.tz is None else str(start.tz),
+        }
+    event = getattr(activity, "event", None)
+    if isinstance(activity, RaceResult) and event is not None:
+        metadata["event"] = _event_metadata(event)
+
+    table = pyarrow.Table.from_pandas(pd.DataFrame(activity), preserve_index=index)
+    return table.replace_schema_metadata(
+        {**table.schema.metadata, METADATA_KEY: json.dumps(metadata)}
+    )
+
+
+def from_table(table):
+    """
+    Converts a ``pyarrow.Table`` back to an activity.
+    Tables without the runpandas metadata are loaded as activities without
+    ``start``.
+
+    Parameters
+    ----------
+        table : ``pyarrow.Table``
+
+    Returns
+    -------
+    Return a obj:`runpandas.Activity`, a :obj:`runpandas.RaceResult` or
+    a :obj:`pandas.DataFrame` depending on the stored object.
+    """
+    metadata = (table.schema.metadata or {}).get(METADATA_KEY)
+    metadata = json.loads(metadata) if metadata else {"activity": True}
+
+    frame = table.to_pandas()
+    if "event" in metadata:
+        return RaceResult(frame, event=_event_from_metadata(metadata["event"]))
+    if not metadata["activity"]:
+        return frame
+
+    start = metadata.get("start")
+    if start is not None:
+        start = pd.Timestamp(start["value"], tz=start["tz"])
+
+    return Activity(frame, start=start)
+
+
+def to_parquet(
+    activity,
+    path=None,
+    engine="auto",
+    compression="snappy",
+    index=None,
+    partition_cols=None,
+    storage_options=None,
+    **kwargs,
+):
+    """
+    Writes the activity to a Parquet file. The arguments are the same of
+    :meth:`pandas.DataFrame.to_parquet`. When it is written by ``pyarrow``
+    the runpandas metadata is added to the file; other engines write it
+    as a plain DataFrame.
+
+    Parameters
+    ----------
+        activity : :obj:`runpandas.Activity` or :obj:`pandas.DataFrame`
+        path : str, file-like object or None, The path of the Parquet file.
+            If None, the file content is returned as bytes.
+        engine : {'auto', 'pyarrow', 'fastparquet'}, The Parquet library.
+        compression : str or None, The compression of the file.
+        index : bool, optional, Store the index; see
+            :meth:`pandas.DataFrame.to_parquet`.
+        partition_cols : list, optional, Columns to partition the dataset by.
+        storage_options : dict, optional, Options for the fsspec storage.
+        **kwargs : Keyword args to be passed to ``pyarrow.parquet.write_table``
+
+    Returns
+    -------
+    The file content as bytes if `path` is None, otherwise None.
+    """
+    if engine not in ("auto", "pyarrow") or pyarrow is None:
+        return pd.DataFrame(activity).to_parquet(
+            path,
+            engine=engine,
+            compression=compression,
+            index=index,
+            partition_cols=partition_cols,
+            storage_options=storage_options,
+            **kwargs,
+        )
+
+    table = to_table(activity, index=index)
+    if partition_cols is not None:
+        parquet.write_to_dataset(
+            table,
+            path,
+            partition_cols=partition_cols,
+            compression=compression,
+            **kwargs,
+        )
+        return None
+    if path is None:
+        buffer = io.BytesIO()
+        parquet.write_table(table, buffer, compression=compression, **kwargs)
+        return buffer.getvalue()
+    with get_handle(
+        path, "wb", is_text=False, storage_options=storage_options
+    ) as handles:
+        parquet.write_table(table, handles.handle, compression=compression, **kwargs)
+    return None
+
+
+def to_feather(activity, path, storage_options=None, **kwargs):
+    """
+    Writes the activity to a Feather file. The arguments are the same of
+    :meth:`pandas.DataFrame.to_feather`, but any index is stored.
+
+    Parameters
+    ----------
+        activity : :obj:`runpandas.Activity` or :obj:`pandas.DataFrame`
+        path : str or file-like object, The path of the Feather file.
+        storage_options : dict, optional, Options for the fsspec storage.
+        **kwargs : Keyword args to be passed to ``pyarrow.feather.write_feather``
+    """
+    table = to_table(activity)
+    with get_handle(
+        path, "wb", is_text=False, storage_options=storage_options
+    ) as handles:
+        feather.write_feather(table, handles.handle, **kwargs)
+
+
+def read_parquet(path, **kwargs):
+    """
+    This method loads an activity stored with
+    :meth:`runpandas.Activity.to_parquet` into a runpandas Activity,
+    restoring its index, ``start`` timestamp and special columns, so there
+    is no need to parse the source file again.
+
+    Parameters
+    ----------
+        path : str, The path to a Parquet file.
+        **kwargs : Keyword args to be passed to ``pyarrow.parquet.read_table``
+
+    Returns
+    -------
+    Return a obj:`runpandas.Activity`, or a :obj:`pandas.DataFrame` if a
+    dataframe was stored.
+    """
+    _check_pyarrow()
+    kwargs.setdefault("use_pandas_metadata", True)
+    return from_table(parquet.read_table(path, **kwargs))
+
+
+def read_feather(path, **kwargs):
+    """
+    This method loads an activity stored with
+    :meth:`runpandas.Activity.to_feather` into a runpandas Activity,
+    restoring its index, ``start`` timestamp and special columns, so there
+    is no need to parse the source file again.
+
+    Parameters
+    ----------
+        path : str, The path to a Feather file.
+        **kwargs : Keyword args to be passed to ``pyarrow.feather.read_table``
+
+    Returns
+    -------
+    Return a obj:`runpandas.Activity`, or a :obj:`pandas.DataFrame` if a
+    dataframe was stored.
+    """
+    _check_pyarrow()
+    return from_table(feather.read_table(path, **kwargs))
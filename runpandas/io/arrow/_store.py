@@ -0,0 +1,303 @@
+"""
+Partitioned on-disk store for sessions of activities.
+"""
+import os
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from runpandas import reader
+from runpandas.types import summary
+from runpandas.io.arrow._parser import _check_pyarrow, from_table, to_parquet
+
+try:
+    from pyarrow import parquet
+except ImportError:  # pragma: no cover
+    parquet = None
+
+# Partition file names are the UTC start of the activity (naive starts
+# don't have the trailing Z).
+PARTITION_FMT = "%Y%m%dT%H%M%S.%f"
+
+# The maximum number of activities summarized together by SessionStore.summarize.
+SUMMARY_BATCH_SIZE = 256
+
+
+def _batch_statistics(activities):
+    """Summarizes activities with the same columns at once, with the grouped
+    reductions of the session summary."""
+    times = np.concatenate([activity.index.asi8 for activity in activities])
+    bounds = np.cumsum([0] + [len(activity) for activity in activities[:-1]])
+    session = pd.concat(
+        activities,
+        keys=[activity.start for activity in activities],
+        names=["start", "time"],
+        axis=0,
+    )
+    return summary._statistics_frame(session, times, bounds)
+
+
+class SessionStore:
+    """
+    A partitioned on-disk store of activities, with one Parquet partition per
+    activity ``start``. It is an alternative to the in-memory session built by
+    :func:`runpandas.read_dir_aggregate` for long training histories:
+    activities can be appended incrementally, and only the partitions
+    and the columns needed by a query are loaded.
+
+    It requires the ``pyarrow`` package.
+
+    Parameters
+    ----------
+    path : str
+        The directory where the partitions are stored.
+    """
+
+    EXTENSION = ".parquet"
+
+    def __init__(self, path):
+        _check_pyarrow()
+        self.path = Path(os.path.expandvars(os.path.expanduser(path))).absolute()
+        self.path.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def _partition_name(start):
+        start = pd.Timestamp(start)
+        if start.tz is None:
+            return start.strftime(PARTITION_FMT)
+        return start.tz_convert("UTC").strftime(PARTITION_FMT) + "Z"
+
+    @staticmethod
+    def _partition_start(name):
+        if name.endswith("Z"):
+            return pd.to_datetime(name, format=PARTITION_FMT + "Z", utc=True)
+        return pd.to_datetime(name, format=PARTITION_FMT)
+
+    def _partitions(self, start=None, end=None):
+        """Returns the sorted (start, path) partitions within [start, end].
+        The starts are compared in UTC, naive starts are assumed in UTC."""
+        start = None if start is None else reader._to_utc(start)
+        end = None if end is None else reader._to_utc(end)
+        partitions = []
+        for path in self.path.glob("*" + self.EXTENSION):
+            activity_start = self._partition_start(path.stem)
+            utc_start = reader._to_utc(activity_start)
+            if start is not None and utc_start < start:
+                continue
+            if end is not None and utc_start > end:
+                continue
+            partitions.append((utc_start, activity_start, path))
+        return [
+            partition[1:]
+            for partition in sorted(partitions, key=lambda partition: partition[0])
+        ]
+
+    @property
+    def starts(self):
+        """
+        Returns:
+            The list of the activity starts in the store, sorted.
+        """
+        return [start for start, _ in self._partitions()]
+
+    def __len__(self):
+        return len(self._partitions())
+
+    def __contains__(self, start):
+        return (self.path / (self._partition_name(start) + self.EXTENSION)).exists()
+
+    def append(self, activity, overwrite=False):
+        """
+        Append an activity to the store as a new partition.
+
+        Parameters
+        ----------
+        activity : runpandas.Activity
+            The activity to be stored, it must have the ``start`` timestamp.
+        overwrite: bool, optional
+            Replace the activity with the same start if it is already
+            in the store. Defaults to False.
+
+        Raises
+        ------
+        ValueError
+            if the activity has no start or if it is already in the store
+            and `overwrite` is False.
+        """
+        start = getattr(activity, "start", None)
+        if start is None:
+            raise ValueError("Only activities with start can be stored.")
+        if not overwrite and start in self:
+            raise ValueError("Activity %s already in the store." % start)
+
+        path = self.path / (self._partition_name(start) + self.EXTENSION)
+        tmp_path = path.with_name(path.name + ".tmp")
+        to_parquet(activity, tmp_path)
+        os.replace(tmp_path, path)
+
+    def append_session(self, session, overwrite=False):
+        """
+        Append all the activities of a session (a ``runpandas.Activity``
+        with a ``(start, time)`` MultiIndex) to the store.
+
+        Parameters
+        ----------
+        session : runpandas.Activity
+            The session, e.g. returned by :func:`runpandas.read_dir_aggregate`.
+        overwrite: bool, optional
+            Replace the activities already in the store. Defaults to False.
+        """
+        for start in session.index.unique(level="start"):
+            activity = session.xs(start, level=0)
+            activity.start = start
+            self.append(activity, overwrite=overwrite)
+
+    def append_dir(self, dirname, errors="raise", start=None, end=None, **kwargs):
+        """
+        Read all supported container files from a supplied directory and
+        append the activities that are not in the store yet. The starts of
+        the files are scanned first (see :func:`runpandas.scan_file`), so only
+        the new activities are parsed.
+
+        Parameters
+        ----------
+        dirname : str
+            The path to a directory with training files.
+        errors : {"raise", "skip"}, optional
+            If "raise", the first file that can't be read stops the reading.
+            If "skip", these files are skipped and reported all together
+            in a warning at the end. Defaults to "raise".
+        start, end : str, datetime, optional
+            Only the activities started between `start` and `end`
+            (inclusive) are appended. Defaults to None (all the files).
+        **kwargs : Keyword args to be passed to the :func:`runpandas.read_dir`
+            method
+
+        Returns
+        -------
+        int: the number of activities appended.
+        """
+        assert errors in ("raise", "skip"), "errors parameter must be raise or skip."
+
+        failures = []
+        files = reader._files_between(
+            reader._list_files(dirname),
+            start,
+            end,
+            errors,
+            failures,
+            exclude=self.__contains__,
+        )
+        appended = 0
+        for path_file, activity, error in reader._read_files(
+            files, to_df=False, **kwargs
+        ):
+            if error is not None:
+                if errors == "raise":
+                    raise error
+                failures.append(reader._failure(path_file, error))
+            elif activity.start not in self:
+                self.append(activity)
+                appended += 1
+        reader._warn_failures(failures)
+        return appended
+
+    def _read_partition(self, path, columns=None):
+        parquet_file = parquet.ParquetFile(path)
+        if columns is not None:
+            names = parquet_file.schema_arrow.names
+            columns = [column for column in columns if column in names]
+        return from_table(parquet_file.read(columns=columns, use_pandas_metadata=True))
+
+    def iter_activities(self, start=None, end=None, columns=None):
+        """
+        Iterate lazily over the activities in the store, loading one
+        partition at a time.
+
+        Parameters
+        ----------
+        start, end : str, datetime, optional
+            Only the activities started between `start` and `end` (inclusive).
+            Naive datetimes are assumed in UTC.
+        columns : list, optional
+            Only these columns are loaded (missing columns are ignored).
+
+        Yields
+        ------
+            `runpandas.Activity`: the activities sorted by start.
+        """
+        for activity_start, path in self._partitions(start, end):
+            activity = self._read_partition(path, columns)
+            activity.start = activity_start
+            yield activity
+
+    def load(self, start=None, end=None, columns=None):
+        """
+        Load the activities in the store as a session, a ``runpandas.Activity``
+        with the ``(start, time)`` MultiIndex, like
+        :func:`runpandas.read_dir_aggregate`.
+
+        Parameters
+        ----------
+        start, end : str, datetime, optional
+            Only the activities started between `start` and `end` (inclusive).
+            Naive datetimes are assumed in UTC.
+        columns : list, optional
+            Only these columns are loaded (missing columns are ignored).
+
+        Returns
+        -------
+        `runpandas.Activity`: The session or None if there are no activities.
+        """
+        activities = []
+        activity_keys = []
+        for activity in self.iter_activities(start, end, columns):
+            activities.append(activity)
+            activity_keys.append(activity.start)
+        if len(activities) > 0:
+            return pd.concat(
+                activities, keys=activity_keys, names=["start", "time"], axis=0
+            )
+
+        return None
+
+    def summarize(self, start=None, end=None):
+        """
+        Summarize the activities in the store, the same way as
+        :meth:`runpandas.types.acessors.session._SessionAcessor.summarize`,
+        loading only the columns needed by the summary and summarizing
+        batches of up to ``SUMMARY_BATCH_SIZE`` partitions at once.
+
+        Parameters
+        ----------
+        start, end : str, datetime, optional
+            Only the activities started between `start` and `end` (inclusive).
+            Naive datetimes are assumed in UTC.
+
+        Returns
+        -------
+        pandas.Dataframe: A Dataframe with the summarized statistics for the
+        activities, empty if there are no activities.
+        """
+        frames = []
+        batch = []
+        for activity in self.iter_activities(
+            start, end, columns=summary.SUMMARY_COLUMNS
+        ):
+            # the missing columns change the statistics, so the batches
+            # are split when the columns change
+            if batch and (
+                len(batch) == SUMMARY_BATCH_SIZE
+                or list(activity.columns) != list(batch[0].columns)
+            ):
+                frames.append(_batch_statistics(batch))
+                batch = []
+            batch.append(activity)
+        if batch:
+            frames.append(_batch_statistics(batch))
+        if not frames:
+            return pd.DataFrame(
+                columns=summary.STATISTICS, index=pd.DatetimeIndex([], name="start")
+            )
+        session_summary = pd.concat(frames, axis=0)
+        session_summary.sort_index(inplace=True)
+        return session_summary
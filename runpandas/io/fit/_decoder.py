@@ -0,0 +1,398 @@
+"""
+Fast decoder of the FIT ``record`` messages straight into NumPy arrays.
+
+It mirrors the values returned by ``fitparse`` (field names, scales, offsets,
+components and enum names from the fitparse profile), but instead of building
+a dict per message, it scans the messages once and decodes each field of
+all the records with a single vectorized gather.
+"""
+
+import mmap
+import struct
+import numpy as np
+from fitparse.profile import MESSAGE_TYPES
+from fitparse.records import BASE_TYPES, parse_string
+
+# Global message numbers
+LAP = 19
+RECORD = 20
+EVENT = 21
+FIELD_DESCRIPTION = 206
+DEVELOPER_DATA_ID = 207
+
+# event_type value of the events that (re)start the timer
+EVENT_TYPE_START = 0
+
+# FIT timestamps are seconds since 1989-12-31 00:00:00 UTC.
+UTC_REFERENCE = 631065600
+# date_time values below it are seconds since the device power on.
+DATE_TIME_MIN = 0x10000000
+
+# Invalid values of the integer base types.
+INVALID_VALUES = {
+    0x00: 0xFF,
+    0x01: 0x7F,
+    0x02: 0xFF,
+    0x83: 0x7FFF,
+    0x84: 0xFFFF,
+    0x85: 0x7FFFFFFF,
+    0x86: 0xFFFFFFFF,
+    0x0A: 0x00,
+    0x8B: 0x0000,
+    0x8C: 0x00000000,
+    0x8E: 0x7FFFFFFFFFFFFFFF,
+    0x8F: 0xFFFFFFFFFFFFFFFF,
+    0x90: 0x0000000000000000,
+}
+
+FLOAT_TYPES = (0x88, 0x89)
+
+
+class UnsupportedFitError(Exception):
+    """
+    Raised when the file uses a FIT feature that is not handled by
+    the fast decoder (e.g. compressed timestamp headers or accumulated
+    components), so it must be decoded by fitparse.
+    """
+
+
+class _Definition:
+    """A definition message and the offsets of its data messages."""
+
+    __slots__ = ("global_num", "endian", "size", "fields", "offsets", "indexes")
+
+    def __init__(self, global_num, endian, fields):
+        self.global_num = global_num
+        self.endian = endian
+        # (field, name, offset, size, base type id)
+        self.fields = fields
+        self.size = sum(size for _, _, _, size, _ in fields)
+        self.offsets = []
+        self.indexes = []
+
+    def field_offset(self, num):
+        for field, _, offset, _, _ in self.fields:
+            if field is not None and field.def_num == num:
+                return offset
+        return None
+
+    def values(self, data, pos):
+        """Returns the raw values of a single data message by field name."""
+        values = {}
+        for field, _, offset, size, base_type_id in self.fields:
+            if field is None:
+                continue
+            base_type = BASE_TYPES.get(base_type_id)
+            raw = data[pos + 1 + offset : pos + 1 + offset + size]
+            if base_type is None or base_type.name == "byte":
+                continue
+            if base_type.name == "string":
+                values[field.name] = parse_string(raw)
+            elif size == base_type.size:
+                value = struct.unpack(self.endian + base_type.fmt, raw)[0]
+                values[field.name] = base_type.parse(value)
+        return values
+
+
+def _parse_definition(data, pos, developer_fields):
+    """Parses the definition message at `pos` and returns it and its length."""
+    header = data[pos]
+    endian = ">" if data[pos + 2] else "<"
+    global_num, num_fields = struct.unpack_from(endian + "HB", data, pos + 3)
+    mesg_type = MESSAGE_TYPES.get(global_num)
+    length = 6 + 3 * num_fields
+
+    fields = []
+    offset = 0
+    for i in range(num_fields):
+        num, size, base_type_id = data[pos + 6 + 3 * i : pos + 9 + 3 * i]
+        field = mesg_type.fields.get(num) if mesg_type else None
+        name = field.name if field else "unknown_%d" % num
+        fields.append((field, name, offset, size, base_type_id))
+        offset += size
+
+    if header & 0x20:
+        num_dev_fields = data[pos + length]
+        for i in range(num_dev_fields):
+            start = pos + length + 1 + 3 * i
+            num, size, dev_data_index = data[start : start + 3]
+            try:
+                name, base_type_id = developer_fields[dev_data_index, num]
+            except KeyError:
+                raise UnsupportedFitError("undescribed developer field")
+            fields.append((None, name, offset, size, base_type_id))
+            offset += size
+        length += 1 + 3 * num_dev_fields
+
+    return _Definition(global_num, endian, fields), length
+
+
+def _scan(data):
+    """
+    Scans all the messages of the (possibly chained) FIT file.
+
+    Returns
+    -------
+        The record definitions, the total number of records, and the number
+        of records before each lap message and before each start event.
+    """
+    records = []
+    laps = []
+    starts = []
+    developer_fields = {}
+    developer_indexes = set()
+    count = 0
+    pos = 0
+    while pos < len(data):
+        if len(data) - pos < 12 or data[pos + 8 : pos + 12] != b".FIT":
+            raise UnsupportedFitError("invalid header")
+        header_size = data[pos]
+        data_size = struct.unpack_from("<I", data, pos + 4)[0]
+        pos += header_size
+        end = pos + data_size
+        if end + 2 > len(data):
+            raise UnsupportedFitError("truncated file")
+
+        definitions = {}
+        while pos < end:
+            header = data[pos]
+            if header & 0x80:
+                raise UnsupportedFitError("compressed timestamp header")
+            if header & 0x40:
+                definition, length = _parse_definition(data, pos, developer_fields)
+                if definition.global_num == RECORD:
+                    records.append(definition)
+                definitions[header & 0x0F] = definition
+                pos += length
+                continue
+
+            try:
+                definition = definitions[header & 0x0F]
+            except KeyError:
+                raise UnsupportedFitError("undefined local message")
+            global_num = definition.global_num
+            if global_num == RECORD:
+                definition.offsets.append(pos)
+                definition.indexes.append(count)
+                count += 1
+            elif global_num == LAP:
+                laps.append(count)
+            elif global_num == EVENT:
+                offset = definition.field_offset(1)  # event_type
+                if offset is not None and data[pos + 1 + offset] == EVENT_TYPE_START:
+                    starts.append(count)
+            elif global_num == DEVELOPER_DATA_ID:
+                values = definition.values(data, pos)
+                developer_indexes.add(values.get("developer_data_index"))
+            elif global_num == FIELD_DESCRIPTION:
+                values = definition.values(data, pos)
+                if values.get("developer_data_index") not in developer_indexes:
+                    raise UnsupportedFitError("undeclared developer data")
+                num = values.get("field_definition_number")
+                name = values.get("field_name") or "unnamed_dev_field_%s" % num
+                developer_fields[values["developer_data_index"], num] = (
+                    name,
+                    values.get("fit_base_type_id"),
+                )
+            pos += 1 + definition.size
+        # skip the file CRC
+        pos = end + 2
+
+    return records, count, laps, starts
+
+
+def _raw_values(buf, offsets, offset, size, base_type_id, endian):
+    """Gathers a field of all the data messages at `offsets`."""
+    base_type = BASE_TYPES.get(base_type_id)
+    if base_type is None or base_type.name in ("byte", "string"):
+        raise UnsupportedFitError("%s fields" % getattr(base_type, "name", "byte"))
+    if size != base_type.size:
+        raise UnsupportedFitError("array fields")
+
+    positions = offsets[:, np.newaxis] + (1 + offset + np.arange(size))
+    raw = buf[positions].view(endian + base_type.fmt).reshape(-1)
+
+    if base_type_id in FLOAT_TYPES:
+        return raw.astype("float64"), ~np.isnan(raw)
+    return raw, raw != INVALID_VALUES[base_type_id]
+
+
+def _render(field_type, values, valid, scale=None, offset=None):
+    """Applies the enum names, the scale and offset, and the type processors."""
+    if field_type.values:
+        if scale or offset:
+            raise UnsupportedFitError("scaled enum fields")
+        uniques, inverse = np.unique(values, return_inverse=True)
+        names = np.array(
+            [field_type.values.get(value, value) for value in uniques.tolist()],
+            dtype=object,
+        )
+        values = names[inverse]
+    else:
+        if scale:
+            values = values / scale
+        if offset:
+            values = values - offset
+
+    if field_type.name == "date_time":
+        if (values[valid] < DATE_TIME_MIN).any():
+            raise UnsupportedFitError("relative date_time values")
+        values = (values.astype("int64") + UTC_REFERENCE).astype("datetime64[s]")
+    elif field_type.name == "local_date_time":
+        values = (values.astype("int64") + UTC_REFERENCE).astype("datetime64[s]")
+    elif field_type.name == "bool":
+        values = values.astype(bool)
+    elif field_type.name == "localtime_into_day":
+        raise UnsupportedFitError("localtime_into_day fields")
+
+    return values, valid
+
+
+def _is_needed(field, name, mesg_type, selected):
+    """Tells if the field or any of its components is `selected`."""
+    if selected is None or selected(name):
+        return True
+    return field is not None and any(
+        selected(mesg_type.fields[component.def_num].name)
+        for component in field.components or ()
+    )
+
+
+def _decode_definition(buf, definition, mesg_type, selected=None):
+    """
+    Decodes the fields of all the records of a definition, in the same order
+    as fitparse (the components of a field come before the field itself,
+    and the last value of a repeated name wins). Only the `selected` fields
+    (and components) are decoded.
+    """
+    offsets = np.asarray(definition.offsets, dtype=np.int64)
+    columns = {}
+    for field, name, offset, size, base_type_id in definition.fields:
+        if not _is_needed(field, name, mesg_type, selected):
+            continue
+        values, valid = _raw_values(
+            buf, offsets, offset, size, base_type_id, definition.endian
+        )
+        if field is None:
+            columns[name] = (values, valid)
+            continue
+
+        if field.subfields:
+            raise UnsupportedFitError("dynamic fields")
+        for component in field.components or ():
+            if (
+                component.accumulate
+                or component.bit_offset
+                or component.bits != 8 * size
+            ):
+                raise UnsupportedFitError("packed components")
+            component_field = mesg_type.fields[component.def_num]
+            if selected is not None and not selected(component_field.name):
+                continue
+            if component_field.subfields:
+                raise UnsupportedFitError("dynamic fields")
+            # the component scale and offset are applied before the enum names
+            component_values = values
+            if component.scale:
+                component_values = component_values / component.scale
+            if component.offset:
+                component_values = component_values - component.offset
+            columns[component_field.name] = _render(
+                component_field.type, component_values, valid
+            )
+        if selected is None or selected(name):
+            columns[name] = _render(
+                field.type, values, valid, field.scale, field.offset
+            )
+
+    return columns
+
+
+def _merge(pieces, count):
+    """Merges the values of a column decoded from different definitions."""
+    covered = sum(len(indexes) for indexes, _, _ in pieces) == count
+    all_valid = covered and all(valid.all() for _, _, valid in pieces)
+    dtypes = [values.dtype for _, values, _ in pieces]
+
+    if any(dtype == object for dtype in dtypes):
+        merged = np.full(count, None, dtype=object)
+    elif any(dtype.kind == "M" for dtype in dtypes):
+        merged = np.full(count, np.datetime64("NaT"), dtype="datetime64[ns]")
+    elif all_valid and all(dtype.kind in "iub" for dtype in dtypes):
+        kinds = {dtype.kind for dtype in dtypes}
+        merged = np.empty(count, dtype=bool if kinds == {"b"} else "int64")
+    elif any(dtype.kind == "b" for dtype in dtypes):
+        merged = np.full(count, None, dtype=object)
+    else:
+        merged = np.full(count, np.nan, dtype="float64")
+
+    for indexes, values, valid in pieces:
+        if merged.dtype == object:
+            values = values.astype(object)
+        merged[indexes[valid]] = values[valid]
+    return merged
+
+
+def _load(file_path):
+    """Returns the content of the file, memory-mapped files are used as is."""
+    if isinstance(file_path, (bytes, bytearray, memoryview, mmap.mmap)):
+        return file_path
+    if hasattr(file_path, "read"):
+        return file_path.read()
+    with open(file_path, "rb") as f:
+        return f.read()
+
+
+def decode_records(file_path, selected=None):
+    """
+    Decodes the ``record`` messages of a FIT file into NumPy arrays.
+
+    Parameters
+    ----------
+    file_path : str, file object or bytes
+        Path to the ANT/Garmin fit file, or its content.
+    selected : callable, optional
+        Only the fields whose name it returns True for are decoded.
+        Defaults to None (all the fields).
+
+    Returns
+    -------
+        A dict with the record fields as keys and their values as arrays,
+        plus the ``lap`` and ``session`` counters of each record, in the same
+        order as the fitparse messages values.
+
+    Raises
+    ------
+    UnsupportedFitError
+        if the file uses a FIT feature not handled by the decoder.
+    """
+    data = _load(file_path)
+    records, count, laps, starts = _scan(data)
+    buf = np.frombuffer(data, dtype=np.uint8)
+    mesg_type = MESSAGE_TYPES[RECORD]
+
+    # the columns in the order they first appear in the records, with the
+    # lap and session counters after the fields of the first record
+    pieces = {}
+    for definition in sorted(
+        (definition for definition in records if definition.indexes),
+        key=lambda definition: definition.indexes[0],
+    ):
+        indexes = np.asarray(definition.indexes, dtype=np.int64)
+        decoded = _decode_definition(buf, definition, mesg_type, selected)
+        for name, (values, valid) in decoded.items():
+            pieces.setdefault(name, []).append((indexes, values, valid))
+        for name in ("lap", "session"):
+            if selected is None or selected(name):
+                pieces.setdefault(name, None)
+
+    record_indexes = np.arange(count)
+    columns = {}
+    for name, column_pieces in pieces.items():
+        if name == "lap":
+            columns[name] = np.searchsorted(laps, record_indexes, side="right")
+        elif name == "session":
+            columns[name] = np.searchsorted(starts, record_indexes, side="right") - 1
+        else:
+            columns[name] = _merge(column_pieces, count)
+    return columns
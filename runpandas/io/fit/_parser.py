@@ -2,10 +2,12 @@
 Tools for parsing FIT files.
 """
 
+import os
 import pandas as pd
 from pandas import TimedeltaIndex
 from fitparse import FitFile
 from runpandas import _utils as utils
+from runpandas.io.fit import _decoder
 from runpandas.types import Activity
 from runpandas.types import columns
 
@@ -26,18 +28,29 @@ def message_filter(message, keep=("record", "lap", "event")):
     return message.mesg_type is not None and message.mesg_type.name in keep
 
 
-def gen_records(file_path):
+def _fit_file(file_path):
+    """Opens the file with fitparse, which closes the file objects it is
+    given, so they are read into memory first."""
+    if utils.is_file_like(file_path):
+        return FitFile(file_path.read())
+    return FitFile(os.fspath(file_path))
+
+
+def gen_records(file_path, selected=None):
     """Generator function for iterating over *.fit file messages.
     Parameters
     ----------
     file_path : str
         Path to the ANT/Garmin fit file.
+    selected : callable, optional
+        Only the record fields whose name it returns True for are kept.
+        Defaults to None (all the fields).
 
     Yields
     ------
         Parsed messages from `file_path`.
     """
-    fit_file = FitFile(file_path)
+    fit_file = _fit_file(file_path)
 
     messages = filter(message_filter, fit_file.get_messages())
     lap = 0
@@ -45,9 +58,22 @@ def gen_records(file_path):
 
     for record in messages:
         if record.mesg_type.name == "record":
-            message = record.get_values()
-            message["lap"] = lap
-            message["session"] = session
+            if selected is None:
+                message = record.get_values()
+                message["lap"] = lap
+                message["session"] = session
+            else:
+                # only the values of the selected fields are read
+                message = {
+                    field.name: record.get_value(field.name)
+                    for field in record.fields
+                    if field.name and selected(field.name)
+                }
+                message.update(
+                    (name, value)
+                    for name, value in (("lap", lap), ("session", session))
+                    if selected(name)
+                )
             yield message
         elif record.mesg_type.name == "lap":
             lap += 1
@@ -63,7 +89,84 @@ def gen_records(file_path):
             )
 
 
-def read(file_path, to_df=False, **kwargs):
+def gen_columns(file_path, selected=None):
+    """Decodes the *.fit file records straight into column arrays.
+
+    Parameters
+    ----------
+    file_path : str
+        Path to the ANT/Garmin fit file.
+    selected : callable, optional
+        Only the record fields whose name it returns True for are decoded.
+        Defaults to None (all the fields).
+
+    Returns
+    -------
+        A dict with the record fields (and the ``lap`` and ``session``
+        counters) as keys and their values as arrays. If the file uses a FIT
+        feature not handled by the fast decoder (e.g. compressed timestamp
+        headers), the records are parsed with fitparse instead.
+    """
+    try:
+        return _decoder.decode_records(file_path, selected)
+    except _decoder.UnsupportedFitError:
+        if utils.is_file_like(file_path):
+            file_path.seek(0)
+        return pd.DataFrame.from_records(gen_records(file_path, selected))
+
+
+def scan(file_path, records=100):
+    """
+    Reads the metadata of a FIT file without decoding all of it: the device
+    from the ``file_id`` message and the start and the channels from the
+    first ``record`` messages.
+
+    Parameters
+    ----------
+    file_path : str
+        Path to the ANT/Garmin fit file.
+    records : int, optional
+        The number of records inspected for channels. Defaults to 100.
+
+    Returns
+    -------
+        A dict with the ``start`` timestamp (the time of the first record),
+        the ``device`` (the manufacturer and product) and the ``channels``
+        (the runpandas column names).
+    """
+    fit_file = _fit_file(file_path)
+    start = None
+    device = None
+    channels = {}
+    messages = fit_file.get_messages(["file_id", "record"])
+    for message in messages:
+        values = message.get_values()
+        if message.name == "file_id":
+            if device is None:
+                product = values.get("garmin_product", values.get("product"))
+                device = " ".join(
+                    str(value)
+                    for value in (values.get("manufacturer"), product)
+                    if value is not None
+                )
+            continue
+        if start is None and values.get("timestamp") is not None:
+            start = pd.Timestamp(values["timestamp"], tz="UTC")
+        channels.update(
+            (name, None) for name, value in values.items() if value is not None
+        )
+        records -= 1
+        if records <= 0:
+            break
+    channels.pop("timestamp", None)
+    return {
+        "start": start,
+        "device": device or None,
+        "channels": [utils.spec_colname(COLUMNS_SCHEMA, name) for name in channels],
+    }
+
+
+def read(file_path, to_df=False, engine="default", columns=None, **kwargs):
     """
     This method loads a FIT file into a Pandas DataFrame or runpandas Activity.
     Column names are translated to runpandas terminology
@@ -77,6 +180,15 @@ def read(file_path, to_df=False, **kwargs):
         to_df : bool, optional
              Return a obj:`runpandas.Activity` if `to_df=True`, otherwise
              a :obj:`pandas.DataFrame` will be returned. Defaults to False.
+        engine : {"default", "fast"}, optional
+             The parser engine. The "fast" engine decodes the record messages
+             straight into NumPy arrays, without the fitparse message objects
+             (the file CRC is not checked). Defaults to "default".
+        columns : list, optional
+             Only these record fields are decoded (the timestamp is always
+             read), by their runpandas name (e.g. ``hr``) or by the name of
+             the field (e.g. ``heart_rate`` or ``lap``).
+             Defaults to None (all the fields).
         **kwargs :
         Keyword args to be passed to the `read` method accordingly to the
         file format.
@@ -88,7 +200,13 @@ def read(file_path, to_df=False, **kwargs):
     start = None
     timeoffsets = None
 
-    data = pd.DataFrame.from_records(gen_records(file_path))
+    selected = utils.column_selector(columns, COLUMNS_SCHEMA, keep=("timestamp",))
+    if engine == "fast":
+        data = pd.DataFrame(gen_columns(file_path, selected))
+    elif engine == "default":
+        data = pd.DataFrame.from_records(gen_records(file_path, selected))
+    else:
+        raise ValueError("engine must be 'default' or 'fast', got %r." % engine)
 
     data.columns = map(utils.camelcase_to_snakecase, data.columns)
 
@@ -106,4 +224,7 @@ def read(file_path, to_df=False, **kwargs):
     if to_df:
         return data
 
-    return Activity(data, cspecs=COLUMNS_SCHEMA, start=start)
+    cspecs = (
+        COLUMNS_SCHEMA if columns is None else utils.select_specs(COLUMNS_SCHEMA, data)
+    )
+    return Activity(data, cspecs=cspecs, start=start)
@@ -1,2 +1,3 @@
 from runpandas.io.gpx._parser import read  # noqa
 from runpandas.io.gpx._parser import gen_records  # noqa
+from runpandas.io.gpx._parser import scan  # noqa
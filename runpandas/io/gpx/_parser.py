@@ -1,6 +1,7 @@
 """
 Tools for parsing Garmin GPX files.
 """
+from itertools import islice
 import pandas as pd
 from pandas import TimedeltaIndex
 from runpandas import _utils as utils
@@ -25,20 +26,91 @@ COLUMNS_SCHEMA = {
 }
 
 
-def gen_records(file_path):
+def gen_records(file_path, selected=None):
     nodes = utils.get_nodes(file_path, ("trkpt",), with_root=True)
     root = next(nodes)
     if utils.sans_ns(root.tag) != "gpx":
         raise exceptions.InvalidFileError("gpx")
 
     trackpoints = nodes
+    names = {}
     for trkpt in trackpoints:
-        trkpt_dict = utils.recursive_text_extract(trkpt)
-        trkpt_dict.update(dict(trkpt.items()))  # lat, lon
+        if selected is None:
+            trkpt_dict = utils.recursive_text_extract(trkpt)
+            trkpt_dict.update(dict(trkpt.items()))  # lat, lon
+        else:
+            # the text of the unselected fields is never extracted
+            trkpt_dict = utils._text_extract(trkpt, names, selected)
+            trkpt_dict.update(
+                (name, value) for name, value in trkpt.items() if selected(name)
+            )
         yield trkpt_dict
 
 
-def read(file_path, to_df=False, **kwargs):
+def gen_columns(file_path, selected=None):
+    """Streams the GPX trackpoints straight into column buffers.
+
+    Parameters
+    ----------
+    file_path : str
+        Path to the GPX file.
+    selected : callable, optional
+        Only the trackpoint fields whose name it returns True for are
+        extracted. Defaults to None (all the fields).
+
+    Returns
+    -------
+        A dict with the trackpoint fields as keys and their values as lists.
+    """
+    return utils.get_columns(
+        file_path, "trkpt", "gpx", with_attributes=True, selected=selected
+    )
+
+
+def scan(file_path, records=100):
+    """
+    Reads the metadata of a GPX file without parsing all of it: the device
+    from the ``creator`` of the document and the start and the channels from
+    the first trackpoints.
+
+    Parameters
+    ----------
+    file_path : str
+        Path to the GPX file.
+    records : int, optional
+        The number of trackpoints inspected for channels. Defaults to 100.
+
+    Returns
+    -------
+        A dict with the ``start`` timestamp (the time of the first trackpoint),
+        the ``device`` name and the ``channels`` (the runpandas column names).
+    """
+    nodes = utils.get_nodes(file_path, ("trkpt",), with_root=True)
+    root = next(nodes)
+    if utils.sans_ns(root.tag) != "gpx":
+        raise exceptions.InvalidFileError("gpx")
+    device = root.get("creator")  # the root is cleared while parsing
+
+    start = None
+    channels = {}
+    for trkpt in islice(nodes, records):
+        trkpt_dict = utils.recursive_text_extract(trkpt)
+        trkpt_dict.update(trkpt.items())  # lat, lon
+        if start is None and "time" in trkpt_dict:
+            start = pd.to_datetime(trkpt_dict["time"], utc=True)
+        channels.update(dict.fromkeys(trkpt_dict))
+    channels.pop("time", None)
+    return {
+        "start": start,
+        "device": device,
+        "channels": [
+            utils.spec_colname(COLUMNS_SCHEMA, utils.camelcase_to_snakecase(name))
+            for name in channels
+        ],
+    }
+
+
+def read(file_path, to_df=False, engine="default", columns=None, **kwargs):
     """
     This method loads a GPX file into a Pandas DataFrame
     or runpandas Activity.
@@ -54,6 +126,15 @@ def read(file_path, to_df=False, **kwargs):
              Return a obj:`runpandas.Activity` if `to_df=True`,
               otherwise a :obj:`pandas.DataFrame` will be returned.
               Defaults to False.
+        engine : {"default", "fast"}, optional
+             The parser engine. The "fast" engine streams the trackpoints
+             straight into column buffers (using ``lxml`` if installed).
+             Defaults to "default".
+        columns : list, optional
+             Only these columns are extracted from the trackpoints (the time
+             is always read), by their runpandas name (e.g. ``hr``) or by the
+             snake case name of the field (e.g. ``atemp``).
+             Defaults to None (all the columns).
         **kwargs :
         Keyword args to be passed to the `read` method
               accordingly to the file format.
@@ -62,7 +143,13 @@ def read(file_path, to_df=False, **kwargs):
     Return a obj:`runpandas.Activity` if `to_df=True`, otherwise
              a :obj:`pandas.DataFrame` will be returned.
     """
-    data = pd.DataFrame.from_records(gen_records(file_path))
+    selected = utils.column_selector(columns, COLUMNS_SCHEMA, keep=("time",))
+    if engine == "fast":
+        data = pd.DataFrame(gen_columns(file_path, selected))
+    elif engine == "default":
+        data = pd.DataFrame.from_records(gen_records(file_path, selected))
+    else:
+        raise ValueError("engine must be 'default' or 'fast', got %r." % engine)
     times = data.pop("time")  # should always be there
     data = data.astype("float64", copy=False)  # try and make numeric
     data.columns = map(utils.camelcase_to_snakecase, data.columns)
@@ -87,4 +174,7 @@ def read(file_path, to_df=False, **kwargs):
     if to_df:
         return data
 
-    return Activity(data, cspecs=COLUMNS_SCHEMA, start=timestamps[0])
+    cspecs = (
+        COLUMNS_SCHEMA if columns is None else utils.select_specs(COLUMNS_SCHEMA, data)
+    )
+    return Activity(data, cspecs=cspecs, start=timestamps[0])
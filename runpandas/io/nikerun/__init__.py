@@ -0,0 +1 @@
+from runpandas.io.nikerun._parser import scan  # noqa
@@ -1,17 +1,29 @@
 """
 Tools for parsing Nike Run JSON files.
 """
-import os
-import datetime
 import json
+from functools import partial
+from operator import itemgetter
 from pathlib import Path
 import numpy as np
 import pandas as pd
 from pandas import TimedeltaIndex
 from runpandas import _utils as utils
-from runpandas import exceptions
+from runpandas import exceptions, reader
 from runpandas.types import Activity, columns
 
+try:
+    import orjson
+
+    json_loads = orjson.loads
+except ImportError:  # pragma: no cover
+    try:
+        import ujson
+
+        json_loads = ujson.loads
+    except ImportError:
+        json_loads = json.loads
+
 # According to Garmin, all times are stored in UTC.
 DATETIME_FMT = "%Y-%m-%dT%H:%M:%SZ"
 
@@ -22,69 +34,108 @@ COLUMNS_SCHEMA = {
     "latitude": columns.Latitude,
 }
 
+# The metrics aligned to the positions by the parser.
+STREAMS = (
+    "latitude",
+    "longitude",
+    "elevation",
+    "heart_rate",
+    "calories",
+    "steps",
+    "nikefuel",
+)
 
-def __is_nikerun_valid(file_path):
-    """Check if it is a valid format for activity files.
+
+def __load_activity(file_path):
+    """Loads and validates a NikeRun API response in JSON file. The document
+    is decoded once, with ``orjson`` or ``ujson`` if one of them is installed.
 
     Parameters
     ----------
-    file_path : str
-        Path to the file to be read.
+    file_path : str or file object
+        Path to the file to be read, it may be compressed
+        (``.gz``, ``.bz2`` or ``.zip``).
 
     Returns
     -------
-    It returns True if the it is a valid format for activities handling.
+    The decoded JSON document.
+
+    Raises
+    ------
+    InvalidFileError
+        if it is not a JSON file with the latitude and longitude metrics.
     """
-    _, ext = os.path.splitext(file_path)
-    if ext not in [".json"]:
-        return False
+    if utils.is_file_like(file_path) or utils.get_filetype(file_path) == "json":
+        with utils.open_source(file_path) as json_file:
+            activity = json_loads(json_file.read())
+        if isinstance(activity, dict) and __has_positions(activity):
+            return activity
+
+    raise exceptions.InvalidFileError(
+        "File {file_path} with invalid filetype.".format(**locals())
+    )
+
 
-    with open(file_path) as json_file:
-        activity = json.load(json_file)
-        if not activity.get("metrics"):
-            return False
+def __has_positions(activity):
+    """Check if the loaded activity has the latitude and longitude metrics."""
+    if not activity.get("metrics"):
+        return False
 
-        metrics = [
-            metric["type"]
-            for metric in activity["metrics"]
-            if metric["type"] in ["latitude", "longitude"]
-        ]
-        if len(metrics) != 2:
-            return False
+    metrics = [
+        metric["type"]
+        for metric in activity["metrics"]
+        if metric["type"] in ["latitude", "longitude"]
+    ]
+    if len(metrics) != 2:
+        return False
 
     return True
 
 
-def __update_single_metrics(epochs, data):
-    counter = 0
-    data_values = [np.nan] * len(epochs)
-    for idx, epoch in enumerate(epochs):
-        while epoch >= data[counter]["end_epoch_ms"]:
-            if counter == len(data) - 1:
-                break
-            data_values[idx] = data[counter]["value"]
-            counter += 1
+def __metric_values(data, key="value", dtype="float64"):
+    return np.fromiter(map(itemgetter(key), data), dtype=dtype, count=len(data))
 
+
+def __consumed_windows(epochs, data):
+    """
+    Returns the number of metric windows consumed up to each epoch: the
+    windows are consumed in order while they end before (or at) the epoch,
+    and the last window is never consumed.
+    """
+    ends = __metric_values(data[:-1], "end_epoch_ms")
+    # a window is only reached once all the previous ones ended
+    consumed = np.searchsorted(np.maximum.accumulate(ends), epochs, side="right")
+    return np.maximum.accumulate(consumed)
+
+
+def __update_single_metrics(epochs, data):
+    """Aligns the metric to the epochs, with the value of the last
+    window consumed at each epoch (NaN if none)."""
+    consumed = __consumed_windows(epochs, data)
+    previous = np.concatenate(([0], consumed[:-1]))
+    updated = consumed > previous
+
+    data_values = np.full(len(epochs), np.nan)
+    data_values[updated] = __metric_values(data)[consumed[updated] - 1]
     return data_values
 
 
 def __update_acummulative_metrics(epochs, data):
-    counter = 0
-    data_values = [np.nan] * len(epochs)
-    for idx, epoch in enumerate(epochs):
-        data_cumm = []
-        while epoch >= data[counter]["end_epoch_ms"]:
-            if counter == len(data) - 1:
-                break
-            data_cumm.append(data[counter]["value"])
-            counter += 1
-        if len(data_cumm) > 0:
-            data_values[idx] = sum(data_cumm)
-
+    """Aligns the metric to the epochs, with the sum of the values of the
+    windows consumed at each epoch (NaN if none)."""
+    consumed = __consumed_windows(epochs, data)
+    previous = np.concatenate(([0], consumed[:-1]))
+    updated = consumed > previous
+
+    data_values = np.full(len(epochs), np.nan)
+    starts = previous[updated]
+    if len(starts) > 0:
+        values = __metric_values(data)[: consumed[-1]]
+        data_values[updated] = np.add.reduceat(values, starts)
     return data_values
 
 
-def __nikerun_streams(metrics):
+def __nikerun_streams(metrics, selected=None):
     streams = dict()
     stream_types = dict()
     final_streams = dict()
@@ -95,37 +146,44 @@ def __nikerun_streams(metrics):
         stream_types[type_metric] = unit
 
     # get latitude and longitude, build them and corresponding timestamp values
-    latitude_data, longitude_data = streams["latitude"], streams["longitude"]
-    latitude_values, longitude_values, epoch_ms, epoch_datetime = [], [], [], []
-    for lat, lon in zip(latitude_data, longitude_data):
-        if lat["start_epoch_ms"] != lon["start_epoch_ms"]:
-            raise ValueError("\tThe latitude and longitude data is out of order")
-        latitude_values.append(lat["value"])
-        longitude_values.append(lon["value"])
-        epoch_ms.append(lat["start_epoch_ms"])
-        epoch_datetime.append(
-            datetime.datetime.utcfromtimestamp(lat["start_epoch_ms"] / 1000)
-        )
-
-    final_streams["latitude"] = latitude_values
-    final_streams["longitude"] = longitude_values
+    size = min(len(streams["latitude"]), len(streams["longitude"]))
+    latitude_data = streams["latitude"][:size]
+    longitude_data = streams["longitude"][:size]
+    epoch_ms = __metric_values(latitude_data, "start_epoch_ms", "int64")
+    longitude_epoch_ms = __metric_values(longitude_data, "start_epoch_ms", "int64")
+    if not np.array_equal(epoch_ms, longitude_epoch_ms):
+        raise ValueError("\tThe latitude and longitude data is out of order")
+    latitude_values = __metric_values(latitude_data)
+    longitude_values = __metric_values(longitude_data)
+    epoch_datetime = pd.to_datetime(epoch_ms, unit="ms")
+
+    def is_selected(name):
+        return selected is None or selected(name)
+
+    if is_selected("latitude"):
+        final_streams["latitude"] = latitude_values
+    if is_selected("longitude"):
+        final_streams["longitude"] = longitude_values
     final_streams["time"] = epoch_datetime
 
-    final_streams["elevation"] = __update_single_metrics(epoch_ms, streams["elevation"])
-    if "heart_rate" in streams:
+    if is_selected("elevation"):
+        final_streams["elevation"] = __update_single_metrics(
+            epoch_ms, streams["elevation"]
+        )
+    if "heart_rate" in streams and is_selected("heart_rate"):
         final_streams["heart_rate"] = __update_single_metrics(
             epoch_ms, streams["heart_rate"]
         )
 
-    if "calories" in streams:
+    if "calories" in streams and is_selected("calories"):
         final_streams["calories"] = __update_acummulative_metrics(
             epoch_ms, streams["calories"]
         )
-    if "steps" in streams:
+    if "steps" in streams and is_selected("steps"):
         final_streams["steps"] = __update_acummulative_metrics(
             epoch_ms, streams["steps"]
         )
-    if "nikefuel" in streams:
+    if "nikefuel" in streams and is_selected("nikefuel"):
         final_streams["nikefuel"] = __update_acummulative_metrics(
             epoch_ms, streams["nikefuel"]
         )
@@ -133,14 +191,45 @@ def __nikerun_streams(metrics):
     return final_streams
 
 
-def gen_records(file_path):
-    with open(file_path) as json_file:
-        activity = json.load(json_file)
-        streams = __nikerun_streams(activity.get("metrics"))
-        return streams
+def gen_records(file_path, selected=None):
+    activity = __load_activity(file_path)
+    return __nikerun_streams(activity["metrics"], selected)
+
 
+def scan(file_path, **kwargs):
+    """
+    Reads the metadata of a NikeRun API response in JSON file, without
+    aligning its metrics.
+
+    Parameters
+    ----------
+    file_path : str
+        Path to the JSON file.
 
-def read_nikerun(file_path, to_df=False, **kwargs):
+    Returns
+    -------
+        A dict with the ``start`` timestamp (the time of the first position),
+        the ``device`` (the app that recorded the activity) and the
+        ``channels`` (the runpandas column names).
+    """
+    activity = __load_activity(file_path)
+    metrics = {metric["type"]: metric["values"] for metric in activity["metrics"]}
+    latitude = metrics["latitude"]
+    start = None
+    if latitude:
+        start = pd.Timestamp(latitude[0]["start_epoch_ms"], unit="ms", tz="UTC")
+    return {
+        "start": start,
+        "device": activity.get("app_id"),
+        "channels": [
+            utils.spec_colname(COLUMNS_SCHEMA, name)
+            for name in STREAMS
+            if name in metrics
+        ],
+    }
+
+
+def read_nikerun(file_path, to_df=False, columns=None, **kwargs):
     """
     This method loads a NikeRun API response in JSON file into a Pandas DataFrame
     or runpandas Activity.
@@ -156,6 +245,10 @@ def read_nikerun(file_path, to_df=False, **kwargs):
              Return a obj:`runpandas.Activity` if `to_df=True`,
               otherwise a :obj:`pandas.DataFrame` will be returned.
               Defaults to False.
+        columns : list, optional
+             Only these metrics are aligned to the positions (the time is
+             always read), by their runpandas name (e.g. ``hr``) or by the
+             metric name (e.g. ``heart_rate``). Defaults to None (all of them).
         **kwargs :
         Keyword args to be passed to the `read` method
               accordingly to the file format.
@@ -166,12 +259,8 @@ def read_nikerun(file_path, to_df=False, **kwargs):
     """
     if not utils.file_exists(file_path):
         raise IOError("%s does not exist" % file_path)
-    if not __is_nikerun_valid(file_path):
-        raise exceptions.InvalidFileError(
-            "File {file_path} with invalid filetype.".format(**locals())
-        )
-
-    data = pd.DataFrame.from_records(gen_records(file_path))
+    selected = utils.column_selector(columns, COLUMNS_SCHEMA, keep=("time",))
+    data = pd.DataFrame.from_records(gen_records(file_path, selected))
     times = data.pop("time")  # should always be there
     data = data.astype("float64", copy=False)  # try and make numeric
     data.columns = map(utils.camelcase_to_snakecase, data.columns)
@@ -185,10 +274,15 @@ def read_nikerun(file_path, to_df=False, **kwargs):
     if to_df:
         return data
 
-    return Activity(data, cspecs=COLUMNS_SCHEMA, start=timestamps[0])
+    cspecs = (
+        COLUMNS_SCHEMA if columns is None else utils.select_specs(COLUMNS_SCHEMA, data)
+    )
+    return Activity(data, cspecs=cspecs, start=timestamps[0])
 
 
-def read_dir_nikerun(dirname, **kwargs):
+def read_dir_nikerun(
+    dirname, workers=None, executor="process", errors="raise", **kwargs
+):
     """
     Read all NikeRun JSON container files from a supplied directory
     as `runpandas.Activity` dataframes, and aggregate them
@@ -197,9 +291,17 @@ def read_dir_nikerun(dirname, **kwargs):
     Parameters
     ----------
         dirname : str, The path to a directory with training files.
-             Return a obj:`runpandas.Activity` if `to_df=True`, otherwise
-             a :obj:`pandas.DataFrame` will be returned. Defaults to False.
-        **kwargs : Keyword args to be passed to the `read_dir` method
+        workers : int, optional
+             The number of files read in parallel. If None or 1 the files
+             are read one by one. Defaults to None.
+        executor : {"process", "thread"}, optional
+             Read the files with a pool of processes or of threads when
+             `workers > 1`. Defaults to "process".
+        errors : {"raise", "skip"}, optional
+             If "raise", the first file that can't be read stops the reading.
+             If "skip", these files are skipped and reported all together
+             in a warning at the end. Defaults to "raise".
+        **kwargs : Keyword args to be passed to the `read_nikerun` method
 
     Returns
     -------
@@ -207,23 +309,36 @@ def read_dir_nikerun(dirname, **kwargs):
     on the `pandas.MultiIndex` with the date/time of the activity
     as first level and the second the timestamps for each record.
     """
-    activities = []
-    activity_keys = []
+    assert errors in ("raise", "skip"), "errors parameter must be raise or skip."
 
     path_dir = Path(dirname)
 
     assert path_dir.is_dir()
 
-    for path_file in path_dir.iterdir():
-        if path_file.is_dir():
-            continue
+    files = [path_file for path_file in path_dir.iterdir() if not path_file.is_dir()]
+
+    activities = []
+    failures = []
+    for path_file, activity, error in utils.pool_map(
+        partial(read_nikerun, to_df=False, **kwargs),
+        files,
+        workers=workers,
+        executor=executor,
+    ):
+        if error is None:
+            activities.append(activity)
+        elif errors == "raise":
+            raise error
+        else:
+            failures.append(reader._failure(path_file, error))
+    reader._warn_failures(failures)
 
-        activity = read_nikerun(path_file, to_df=False, **kwargs)
-        activities.append(activity)
-        activity_keys.append(activity.start)
     if len(activities) > 0:
         multi_frame = pd.concat(
-            activities, keys=activity_keys, names=["start", "time"], axis=0
+            activities,
+            keys=[activity.start for activity in activities],
+            names=["start", "time"],
+            axis=0,
         )
         return multi_frame
 
@@ -7,44 +7,98 @@ from runpandas import _utils as utils
 from runpandas import exceptions
 from runpandas.types.frame import RaceResult, Event
 
+
+def _to_text(values):
+    return values
+
+
+def _to_category(values):
+    return values.astype("category")
+
+
+def _to_age(values):
+    ages = pd.to_numeric(values, errors="coerce")
+    # the ages that aren't whole numbers are invalid, like the non numeric ones
+    return ages.where(ages % 1 == 0).astype("Int64")
+
+
+def _to_timedelta(values):
+    # the times repeat a lot (they are in seconds), so only the distinct
+    # ones are parsed, as ``pd.to_datetime(cache=True)`` does.
+    codes, uniques = pd.factorize(values)
+    times = pd.to_timedelta(uniques, errors="coerce")
+    return pd.Series(
+        times.take(codes, allow_fill=True, fill_value=pd.NaT),
+        index=values.index,
+        name=values.name,
+    )
+
+
+# The runpandas columns, their aliases in the result files, the dtype they are
+# read with by ``read_csv`` (None to infer it) and their column-wise converter.
 COL_TYPES = {
-    "position": {"alias": ["position", "coloc"], "apply": lambda x, errors: str(x)},
-    "bib": {"alias": ["bib", "num"], "apply": lambda x, errors: str(x)},
-    "name": {"alias": ["name", "nome"], "apply": lambda x, errors: str(x)},
-    "age": {"alias": ["age", "idade"], "apply": lambda x, errors: int(x)},
-    "sex": {"alias": ["sexo", "sex", "m/f"], "apply": lambda x, errors: str(x)},
+    "position": {"alias": ["position", "coloc"], "dtype": str, "convert": _to_text},
+    "bib": {"alias": ["bib", "num"], "dtype": str, "convert": _to_text},
+    "name": {"alias": ["name", "nome"], "dtype": str, "convert": _to_text},
+    "age": {"alias": ["age", "idade"], "dtype": None, "convert": _to_age},
+    "sex": {"alias": ["sexo", "sex", "m/f"], "dtype": str, "convert": _to_category},
     "nettime": {
         "alias": ["official_time", "chiptime", "liquido"],
-        "apply": pd.to_timedelta,
+        "dtype": str,
+        "convert": _to_timedelta,
+    },
+    "grosstime": {
+        "alias": ["tempo", "guntime"],
+        "dtype": str,
+        "convert": _to_timedelta,
     },
-    "grosstime": {"alias": ["tempo", "guntime"], "apply": pd.to_timedelta},
-    "half": {"alias": ["halftime", "half"], "apply": pd.to_timedelta},
-    "5k": {"alias": ["5_k"], "apply": pd.to_timedelta},
-    "10k": {"alias": ["10_k"], "apply": pd.to_timedelta},
-    "15k": {"alias": ["15_k"], "apply": pd.to_timedelta},
-    "20k": {"alias": ["20_k"], "apply": pd.to_timedelta},
-    "25k": {"alias": ["25_k"], "apply": pd.to_timedelta},
-    "30k": {"alias": ["30_k"], "apply": pd.to_timedelta},
-    "35k": {"alias": ["35_k"], "apply": pd.to_timedelta},
-    "40k": {"alias": ["40_k"], "apply": pd.to_timedelta},
-    "pace": {"alias": ["pace"], "apply": pd.to_timedelta},
+    "half": {"alias": ["halftime", "half"], "dtype": str, "convert": _to_timedelta},
+    "5k": {"alias": ["5_k"], "dtype": str, "convert": _to_timedelta},
+    "10k": {"alias": ["10_k"], "dtype": str, "convert": _to_timedelta},
+    "15k": {"alias": ["15_k"], "dtype": str, "convert": _to_timedelta},
+    "20k": {"alias": ["20_k"], "dtype": str, "convert": _to_timedelta},
+    "25k": {"alias": ["25_k"], "dtype": str, "convert": _to_timedelta},
+    "30k": {"alias": ["30_k"], "dtype": str, "convert": _to_timedelta},
+    "35k": {"alias": ["35_k"], "dtype": str, "convert": _to_timedelta},
+    "40k": {"alias": ["40_k"], "dtype": str, "convert": _to_timedelta},
+    "pace": {"alias": ["pace"], "dtype": str, "convert": _to_timedelta},
 }
 
+ALIASES = {alias: col for col, spec in COL_TYPES.items() for alias in spec["alias"]}
+
+# The ``read_csv`` keyword args that don't apply to the header rows.
+DATA_KWARGS = ("dtype", "usecols", "nrows", "skipfooter", "chunksize", "iterator")
 
-def __extract_metadata(file_path):
+
+def _header_kwargs(kwargs):
+    """Returns the ``read_csv`` keyword args to parse the header rows the same
+    way as the data (e.g. ``sep`` or ``encoding``)."""
+    return {key: value for key, value in kwargs.items() if key not in DATA_KWARGS}
+
+
+def _column_name(name):
+    """Translates a column of the result file to runpandas terminology
+    (e.g. "Official Time" > "official_time")."""
+    return utils.camelcase_to_snakecase(name).replace(" ", "")
+
+
+def __extract_metadata(file_path, **kwargs):
     """
     Extract the metadata from the result file and returns the race metadata.
 
     Parameters
     ----------
         file_path : str, The path to a race result file.
+        **kwargs : Keyword args to be passed to ``pandas.read_csv``
 
     Returns
     -------
     Return a obj:`runpandas.RaceResult` if `to_df=False`, otherwise
              a :obj:`pandas.DataFrame` will be returned.
     """
-    data = pd.read_csv(file_path, index_col=0, nrows=0).columns.tolist()
+    data = pd.read_csv(
+        file_path, index_col=0, nrows=0, **_header_kwargs(kwargs)
+    ).columns.tolist()
     parsed_metadata = {}
 
     try:
@@ -60,18 +114,26 @@ def __extract_metadata(file_path):
     return parsed_metadata
 
 
-def read(file_path, to_df=False, **kwargs):
+def read(file_path, to_df=False, columns=None, **kwargs):
     """
     This method loads a race result file into a Pandas DataFrame or runpandas Race Result.
     Column names are translated to runpandas terminology
     (e.g. "bib number" > "bib_number").
 
+    The known columns are read with the right dtype by ``read_csv`` and
+    converted column-wise: the times to ``timedelta64``, ``sex`` to
+    a categorical and ``age`` to a nullable integer.
+
     Parameters
     ----------
         filename : str, The path to a race result file.
         to_df : bool, optional
              Return a obj:`runpandas.RaceResult` if `to_df=False`, otherwise
              a :obj:`pandas.DataFrame` will be returned. Defaults to False.
+        columns : list, optional
+             Only these columns are parsed, by their runpandas name
+             (e.g. ``nettime``) or by their translated name in the file
+             (e.g. ``official_time``). Defaults to None (all of them).
         **kwargs :
         Keyword args to be passed to the `read` method accordingly to the
         file format.
@@ -81,22 +143,41 @@ def read(file_path, to_df=False, **kwargs):
              a :obj:`pandas.DataFrame` will be returned.
     """
 
-    metadata = __extract_metadata(file_path)
-
-    data = pd.read_csv(file_path, skiprows=1, **kwargs)
-
-    data.columns = map(utils.camelcase_to_snakecase, data.columns)
-    data.columns = data.columns.str.replace(" ", "")
-
-    to_rename = {}
-    # transform data to specific dtypes
-    for col, _type in COL_TYPES.items():
-        for alias in COL_TYPES[col]["alias"]:
-            if alias in data.columns:
-                to_rename[alias] = col
-                data[alias] = data[alias].apply(
-                    COL_TYPES[col]["apply"], errors="coerce"
-                )
+    metadata = __extract_metadata(file_path, **kwargs)
+
+    header = pd.read_csv(file_path, skiprows=1, nrows=0, **_header_kwargs(kwargs))
+    names = {name: _column_name(name) for name in header.columns}
+    dtype = {
+        name: COL_TYPES[ALIASES[column]]["dtype"]
+        for name, column in names.items()
+        if column in ALIASES and COL_TYPES[ALIASES[column]]["dtype"] is not None
+    }
+    usecols = None
+    if columns is not None:
+        if isinstance(columns, str):
+            columns = [columns]
+        requested = set(columns)
+        usecols = [
+            name
+            for name, column in names.items()
+            if column in requested or ALIASES.get(column) in requested
+        ]
+
+    data = pd.read_csv(
+        file_path, skiprows=1, **{"dtype": dtype, "usecols": usecols, **kwargs}
+    )
+    data.columns = [names.get(name, _column_name(name)) for name in data.columns]
+
+    to_rename = {alias: ALIASES[alias] for alias in data.columns if alias in ALIASES}
+    # transform data to specific dtypes, the frame is built once at the end
+    data = pd.DataFrame(
+        {
+            alias: COL_TYPES[to_rename[alias]]["convert"](values)
+            if alias in to_rename
+            else values
+            for alias, values in data.items()
+        }
+    )
 
     if to_rename:
         data.rename(columns=to_rename, inplace=True)
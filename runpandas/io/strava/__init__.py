@@ -0,0 +1 @@
+from runpandas.io.strava._client import RateLimiter  # noqa
@@ -2,19 +2,103 @@
 Tool to get/refresh Strava Token.
 """
 from stravalib.client import Client
+from stravalib.protocol import ApiV3
 import os
 import json
 import time
+import threading
 import webbrowser
 from json.decoder import JSONDecodeError
 from http.server import BaseHTTPRequestHandler, HTTPServer
 from urllib.parse import urlsplit, parse_qs
 
 
+# The Strava read rate limits: (requests, seconds) of each window.
+STRAVA_RATE_LIMITS = [(100, 15 * 60), (1000, 24 * 60 * 60)]
+
+
 def coalesce(iterable):
     return next((el for el in iterable if el is not None), None)
 
 
+class RateLimiter:
+    """A token bucket scheduler for the Strava API requests, shared by the
+    threads of a bulk download.
+
+    Each limit is a bucket holding up to ``requests`` tokens that is refilled
+    at ``requests / seconds`` tokens per second. A request takes a token of
+    every bucket, waiting for them to be refilled if any of them is empty.
+
+    Parameters
+    ----------
+        limits: list, The (requests, seconds) limits, optional.
+            Defaults to the Strava read rate limits (100 requests every
+            15 minutes and 1000 daily).
+        clock: callable, The monotonic clock in seconds, optional
+        sleep: callable, The function used to wait, optional
+
+    """
+
+    def __init__(self, limits=None, clock=time.monotonic, sleep=time.sleep):
+        self.limits = list(STRAVA_RATE_LIMITS if limits is None else limits)
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = [float(requests) for requests, _ in self.limits]
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = self._clock()
+        elapsed = now - self._updated
+        self._updated = now
+        self._tokens = [
+            min(requests, tokens + elapsed * requests / seconds)
+            for tokens, (requests, seconds) in zip(self._tokens, self.limits)
+        ]
+
+    def acquire(self, tokens=1):
+        """
+        Takes the tokens of a request, waiting until they are available.
+
+        Parameters
+        ----------
+        tokens: int, the number of requests, optional. Defaults to 1.
+
+        Raises
+        ------
+        ValueError
+            if `tokens` is larger than the requests of any limit.
+        """
+        capacity = min(requests for requests, _ in self.limits)
+        if tokens > capacity:
+            raise ValueError(
+                "Can't acquire %d tokens, the limits allow %d requests."
+                % (tokens, capacity)
+            )
+        while True:
+            with self._lock:
+                self._refill()
+                wait = max(
+                    (tokens - available) * seconds / requests
+                    for available, (requests, seconds) in zip(self._tokens, self.limits)
+                )
+                if wait <= 0:
+                    self._tokens = [available - tokens for available in self._tokens]
+                    return
+            self._sleep(wait)
+
+
+class _ApiV3(ApiV3):
+    """The Strava API protocol with a configurable base url."""
+
+    api_url = None
+
+    def _resolve_url(self, url):
+        if self.api_url is not None and not url.startswith("http"):
+            return self.api_url.rstrip("/") + "/" + url.strip("/")
+        return super()._resolve_url(url)
+
+
 class HTTPResponder(HTTPServer):
     allow_reuse_address = True
     timeout = 60
@@ -59,6 +143,8 @@ class StravaClient(Client):
         refresh_token: str, The Strava refresh token, optional
         client_secret: str, The strava client secret used for token refresh, optional
         client_id: int, The Strava client id used for token refresh, optional
+        api_url: str, The base url of the Strava API (e.g. a local server
+            for testing), optional. Defaults to https://www.strava.com/api/v3.
 
     """
 
@@ -69,9 +155,16 @@ class StravaClient(Client):
         refresh_token=None,
         client_secret=None,
         client_id=None,
+        api_url=None,
         **kwargs
     ):
         super(self.__class__, self).__init__(*args, **kwargs)
+        self.protocol = _ApiV3(
+            access_token=self.protocol.access_token,
+            requests_session=self.protocol.rsession,
+            rate_limiter=self.protocol.rate_limiter,
+        )
+        self.protocol.api_url = coalesce((api_url, os.getenv("STRAVA_API_URL", None)))
         self.token_file = coalesce((token_file, os.getenv("STRAVA_TOKEN_FILE", None)))
         self.client_secret = coalesce(
             (client_secret, os.getenv("STRAVA_CLIENT_SECRET", None))
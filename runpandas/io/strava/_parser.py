@@ -1,13 +1,19 @@
 """
 Tools for pulling and parsing stream data from Strava.
 """
-from datetime import timedelta
+import os
+import json
+import threading
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import numpy as np
 import pandas as pd
 from pandas import TimedeltaIndex
 from runpandas import _utils as utils
 from runpandas.types import Activity
 from runpandas.types import columns
-from runpandas.io.strava._client import StravaClient
+from runpandas.io.strava._client import RateLimiter, StravaClient
 
 
 COLUMNS_SCHEMA = {
@@ -39,18 +45,88 @@ def gen_records(streams):
     raw_data = dict()
     for key, value in streams.items():
         if key == "latlng":
-            latitude, longitude = list(zip(*value.data))
-            raw_data["latitude"] = latitude
-            raw_data["longitude"] = longitude
+            # a (n, 2) array, the columns are views of it
+            positions = np.asarray(value, dtype="float64").reshape(-1, 2)
+            raw_data["latitude"] = positions[:, 0]
+            raw_data["longitude"] = positions[:, 1]
         else:
-            raw_data[key] = value.data
+            raw_data[key] = value
     return raw_data
 
 
+def _fetch_streams(client, activity_id, rate_limiter=None):
+    """Downloads the local start time and the raw stream arrays of an
+    activity, with two API requests."""
+    if rate_limiter is not None:
+        rate_limiter.acquire()
+    activity = client.get_activity(activity_id)
+    if rate_limiter is not None:
+        rate_limiter.acquire()
+    streams = client.get_activity_streams(
+        activity_id=activity_id, types=STREAM_TYPES, series_type="time"
+    )
+    return activity.start_date_local, {
+        key: stream.data for key, stream in streams.items()
+    }
+
+
+def _cache_path(cache_dir, activity_id):
+    return os.path.join(cache_dir, "%s.json" % activity_id)
+
+
+def _load_cached(cache_dir, activity_id):
+    """Returns the start time and the raw streams of an activity saved by
+    :func:`_save_cached`, or None if it is not cached."""
+    try:
+        with open(_cache_path(cache_dir, activity_id)) as cache_file:
+            cached = json.load(cache_file)
+    except (OSError, ValueError):
+        return None
+    return datetime.fromisoformat(cached["start_date_local"]), cached["streams"]
+
+
+def _save_cached(cache_dir, activity_id, start_datetime, streams):
+    """Saves the start time and the raw streams of an activity as a JSON
+    file named by its id. The file is written aside and then renamed, so an
+    interrupted download never leaves a partial entry."""
+    file_path = _cache_path(cache_dir, activity_id)
+    temp_path = "%s.%d.tmp" % (file_path, os.getpid())
+    with open(temp_path, "w") as cache_file:
+        json.dump(
+            {
+                "id": activity_id,
+                "start_date_local": start_datetime.isoformat(),
+                "streams": streams,
+            },
+            cache_file,
+        )
+    os.replace(temp_path, file_path)
+
+
+def _build_activity(start_datetime, streams, to_df=False):
+    records = gen_records(streams)
+    # the seconds since the start of the activity
+    times = np.asarray(records.pop("time"))
+    data = pd.DataFrame(records)
+    data.columns = map(utils.camelcase_to_snakecase, data.columns)
+
+    timestamp_index = TimedeltaIndex(times - times[0], unit="s", name="time")
+    data.index = timestamp_index
+    data.dropna(axis=1, how="all", inplace=True)
+
+    if to_df:
+        return data
+
+    start = pd.Timestamp(start_datetime) + pd.Timedelta(seconds=times[0].item())
+    return Activity(data, cspecs=COLUMNS_SCHEMA, start=start)
+
+
 def read_strava(
     activity_id,
     client=None,
     to_df=False,
+    cache_dir=None,
+    refresh=False,
     **kwargs,
 ):
     """
@@ -74,6 +150,14 @@ def read_strava(
         to_df : bool, optional
              Return a obj:`runpandas.Activity` if `to_df=True`, otherwise
              a :obj:`pandas.DataFrame` will be returned. Defaults to False.
+        cache_dir : str, optional
+             A directory where the raw streams and the local start time of
+             the activity are saved, keyed by its id. The next reads of the
+             activity are served from the disk, without any request (nor
+             token refresh). Defaults to None (no cache).
+        refresh : bool, optional
+             Download the activity again, replacing the cached one.
+             Defaults to False.
         **kwargs :
         Keyword args to be passed to the `read_strava`
     Returns
@@ -81,32 +165,141 @@ def read_strava(
     Return a obj:`runpandas.Activity` if `to_df=True`, otherwise
              a :obj:`pandas.DataFrame` will be returned.
     """
+    if cache_dir is not None and not refresh:
+        cached = _load_cached(cache_dir, activity_id)
+        if cached is not None:
+            return _build_activity(*cached, to_df=to_df)
+
     if client is None:
         client = StravaClient()
     client.refresh()
 
-    activity = client.get_activity(activity_id)
+    start_datetime, streams = _fetch_streams(client, activity_id)
+    if cache_dir is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+        _save_cached(cache_dir, activity_id, start_datetime, streams)
+    return _build_activity(start_datetime, streams, to_df=to_df)
 
-    start_datetime = activity.start_date_local
-    streams = client.get_activity_streams(
-        activity_id=activity_id, types=STREAM_TYPES, series_type="time"
-    )
 
-    data = pd.DataFrame(gen_records(streams))
+def read_strava_many(
+    activity_ids,
+    client=None,
+    concurrency=4,
+    cache_dir=None,
+    rate_limiter=None,
+    errors="raise",
+    refresh=False,
+):
+    """
+    This method downloads several activities from Strava with a pool of
+    threads, and aggregates them to the same session as a `pandas.MultiIndex`
+    activity dataframe.
 
-    times = data.pop("time")
-    data.columns = map(utils.camelcase_to_snakecase, data.columns)
+    The requests (two per activity, see :func:`read_strava`) are scheduled
+    by a token bucket shared by the threads, so the Strava 15-minute and
+    daily rate limits are respected: when the limits are reached the
+    downloads wait for the buckets to be refilled.
 
-    def time_to_datetime(time):
-        return start_datetime + timedelta(seconds=time)
+    Parameters
+    ----------
+        activity_ids : list, The ids of the activities
+        client: StravaClient, The Strava client, optional. The same client
+             is shared by the threads. It is only built (if None) and its token
+             refreshed when an activity is not in `cache_dir`.
+        concurrency : int, optional
+             The number of activities downloaded at the same time.
+             Defaults to 4.
+        cache_dir : str, optional
+             A directory where the raw streams of each downloaded activity
+             are saved as soon as it is downloaded. The activities already
+             there are loaded from the disk without any request, so an
+             interrupted download is resumed by calling it again.
+             Defaults to None (no cache).
+        rate_limiter : RateLimiter, optional
+             The requests scheduler. Defaults to a
+             :class:`runpandas.io.strava.RateLimiter` with the Strava read
+             rate limits. Share the same scheduler between calls to keep
+             track of the requests already made.
+        errors : {"raise", "skip"}, optional
+             If "raise", the first activity that can't be downloaded stops the
+             download. If "skip", these activities are skipped and reported all
+             together in a warning at the end. Defaults to "raise".
+        refresh : bool, optional
+             Download all the activities again, replacing the cached ones.
+             Defaults to False.
 
-    timestamps = times.apply(time_to_datetime)
-    timeoffsets = timestamps - timestamps[0]
-    timestamp_index = TimedeltaIndex(timeoffsets, unit="s", name="time")
-    data.index = timestamp_index
-    data.dropna(axis=1, how="all", inplace=True)
+    Returns
+    -------
+    Return a  :obj:`runpandas.Activity` split into sessions based
+    on the `pandas.MultiIndex` with the date/time of the activity
+    as first level and the second the timestamps for each record,
+    in the order of `activity_ids`. None if no activity was downloaded.
+    """
+    assert errors in ("raise", "skip"), "errors parameter must be raise or skip."
 
-    if to_df:
-        return data
+    if rate_limiter is None:
+        rate_limiter = RateLimiter()
+    if cache_dir is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+
+    clients = [client]
+    client_lock = threading.Lock()
+
+    def connected_client():
+        # the client is built and its token refreshed once for all the
+        # threads, when the first activity that is not cached is downloaded
+        with client_lock:
+            if len(clients) == 1:
+                connected = StravaClient() if clients[0] is None else clients[0]
+                connected.refresh()
+                clients.append(connected)
+            return clients[-1]
+
+    def download(activity_id):
+        if cache_dir is not None and not refresh:
+            cached = _load_cached(cache_dir, activity_id)
+            if cached is not None:
+                return cached
+        start_datetime, streams = _fetch_streams(
+            connected_client(), activity_id, rate_limiter
+        )
+        if cache_dir is not None:
+            _save_cached(cache_dir, activity_id, start_datetime, streams)
+        return start_datetime, streams
+
+    activities = []
+    failures = []
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = [pool.submit(download, activity_id) for activity_id in activity_ids]
+        try:
+            for activity_id, future in zip(activity_ids, futures):
+                try:
+                    start_datetime, streams = future.result()
+                except Exception as error:
+                    if errors == "raise":
+                        raise
+                    failures.append(
+                        "%s (%s: %s)" % (activity_id, type(error).__name__, error)
+                    )
+                else:
+                    activities.append(_build_activity(start_datetime, streams))
+        finally:
+            for future in futures:
+                future.cancel()
+
+    if failures:
+        warnings.warn(
+            "%d activities could not be downloaded and were skipped: %s"
+            % (len(failures), "; ".join(failures)),
+            UserWarning,
+        )
+
+    if len(activities) > 0:
+        return pd.concat(
+            activities,
+            keys=[activity.start for activity in activities],
+            names=["start", "time"],
+            axis=0,
+        )
 
-    return Activity(data, cspecs=COLUMNS_SCHEMA, start=timestamps[0])
+    return None
@@ -1,3 +1,4 @@
 from runpandas.io.tcx._parser import read  # noqa
 from runpandas.io.tcx._parser import gen_records  # noqa
 from runpandas.io.strava._parser import read_strava  # noqa
+from runpandas.io.tcx._parser import scan  # noqa
@@ -1,6 +1,9 @@
 """
 Tools for parsing Garmin TCX files.
 """
+import os
+import re
+from itertools import islice
 import pandas as pd
 from pandas import TimedeltaIndex
 from runpandas import _utils as utils
@@ -25,19 +28,93 @@ DATETIME_FMT = "%Y-%m-%dT%H:%M:%SZ"
 # in the wild with fractional seconds...
 DATETIME_FMT_WITH_FRAC = "%Y-%m-%dT%H:%M:%S.%fZ"
 
+# The device is the Creator of the activity, written after its laps.
+CREATOR_RE = re.compile(rb"<(?:\w+:)?Creator\b.*?<(?:\w+:)?Name>([^<]*)<", re.S)
+TAIL_SIZE = 64 * 1024
 
-def gen_records(file_path):
+
+def gen_records(file_path, selected=None):
     nodes = utils.get_nodes(file_path, ("Trackpoint",), with_root=True)
     root = next(nodes)
     if utils.sans_ns(root.tag) != "TrainingCenterDatabase":
         raise exceptions.InvalidFileError("tcx")
 
     trackpoints = nodes
+    names = {}
     for trkpt in trackpoints:
-        yield utils.recursive_text_extract(trkpt)
+        if selected is None:
+            trkpt_dict = utils.recursive_text_extract(trkpt)
+        else:
+            # the text of the unselected fields is never extracted
+            trkpt_dict = utils._text_extract(trkpt, names, selected)
+        yield trkpt_dict
+
+
+def gen_columns(file_path, selected=None):
+    """Streams the TCX trackpoints straight into column buffers.
+
+    Parameters
+    ----------
+    file_path : str
+        Path to the TCX file.
+    selected : callable, optional
+        Only the trackpoint fields whose name it returns True for are
+        extracted. Defaults to None (all the fields).
+
+    Returns
+    -------
+        A dict with the trackpoint fields as keys and their values as lists.
+    """
+    return utils.get_columns(
+        file_path, "Trackpoint", "TrainingCenterDatabase", selected=selected
+    )
+
+
+def _creator(file_path):
+    """Searches the name of the device in the tail of the file."""
+    with utils.open_source(file_path) as tcx_file:
+        tcx_file.seek(0, os.SEEK_END)
+        tcx_file.seek(max(0, tcx_file.tell() - TAIL_SIZE))
+        match = CREATOR_RE.search(tcx_file.read())
+    return match.group(1).decode("utf-8").strip() if match else None
+
+
+def scan(file_path, records=100):
+    """
+    Reads the metadata of a TCX file without parsing all of it: the start
+    and the channels from the first trackpoints, and the device from the
+    Creator at the end of the file.
+
+    Parameters
+    ----------
+    file_path : str
+        Path to the TCX file.
+    records : int, optional
+        The number of trackpoints inspected for channels. Defaults to 100.
+
+    Returns
+    -------
+        A dict with the ``start`` timestamp (the time of the first trackpoint),
+        the ``device`` name and the ``channels`` (the runpandas column names).
+    """
+    start = None
+    channels = {}
+    for trkpt in islice(gen_records(file_path), records):
+        if start is None and "Time" in trkpt:
+            start = pd.to_datetime(trkpt["Time"], utc=True)
+        channels.update(dict.fromkeys(trkpt))
+    channels.pop("Time", None)
+    return {
+        "start": start,
+        "device": _creator(file_path),
+        "channels": [
+            utils.spec_colname(COLUMNS_SCHEMA, utils.camelcase_to_snakecase(name))
+            for name in channels
+        ],
+    }
 
 
-def read(file_path, to_df=False, **kwargs):
+def read(file_path, to_df=False, engine="default", columns=None, **kwargs):
     """
     This method loads a TCX file into a Pandas DataFrame or runpandas Activity.
     Column names are translated to runpandas terminology
@@ -51,6 +128,15 @@ def read(file_path, to_df=False, **kwargs):
         to_df : bool, optional
              Return a obj:`runpandas.Activity` if `to_df=True`, otherwise
              a :obj:`pandas.DataFrame` will be returned. Defaults to False.
+        engine : {"default", "fast"}, optional
+             The parser engine. The "fast" engine streams the trackpoints
+             straight into column buffers (using ``lxml`` if installed).
+             Defaults to "default".
+        columns : list, optional
+             Only these columns are extracted from the trackpoints (the time
+             is always read), by their runpandas name (e.g. ``hr``) or by the
+             snake case name of the field (e.g. ``heart_rate_bpm``).
+             Defaults to None (all the columns).
         **kwargs :
         Keyword args to be passed to the `read` method accordingly to the
         file format.
@@ -59,7 +145,13 @@ def read(file_path, to_df=False, **kwargs):
     Return a obj:`runpandas.Activity` if `to_df=True`, otherwise
              a :obj:`pandas.DataFrame` will be returned.
     """
-    data = pd.DataFrame.from_records(gen_records(file_path))
+    selected = utils.column_selector(columns, COLUMNS_SCHEMA, keep=("time",))
+    if engine == "fast":
+        data = pd.DataFrame(gen_columns(file_path, selected))
+    elif engine == "default":
+        data = pd.DataFrame.from_records(gen_records(file_path, selected))
+    else:
+        raise ValueError("engine must be 'default' or 'fast', got %r." % engine)
     times = data.pop("Time")  # should always be there
     data = data.apply(pd.to_numeric, errors="ignore")  # try and make numeric
 
@@ -79,4 +171,7 @@ def read(file_path, to_df=False, **kwargs):
     if to_df:
         return data
 
-    return Activity(data, cspecs=COLUMNS_SCHEMA, start=timestamps[0])
+    cspecs = (
+        COLUMNS_SCHEMA if columns is None else utils.select_specs(COLUMNS_SCHEMA, data)
+    )
+    return Activity(data, cspecs=cspecs, start=timestamps[0])
@@ -2,26 +2,47 @@
 Module contains reading logic for several formats of training sources
 """
 
+import warnings
+from functools import partial
 from pathlib import Path
 import pandas as pd
 from runpandas import datasets
 from runpandas import _utils as utils
 from runpandas import exceptions
+from runpandas.cache import ActivityCache
 
 MODULE_CACHE = {}
 
+EXECUTORS = utils.EXECUTORS
 
-def _read_file(filename, to_df=False, **kwargs):
+# The formats of the training files that can be scanned by their extension.
+SCAN_FORMATS = {"tcx": "tcx", "gpx": "gpx", "fit": "fit", "json": "nikerun"}
+
+SCAN_COLUMNS = ["path", "format", "start", "device", "channels"]
+
+
+def _read_file(filename, to_df=False, cache=None, filetype=None, **kwargs):
     """
     Parameters
     ----------
-        filename : str, The path to a training file.
+        filename : str or file object, The path to a training file, it may be
+             compressed (``.gz``, ``.bz2`` or a ``.zip`` with a single file).
+             Compressed files are decompressed while parsed and plain files
+             are memory-mapped. A binary file object can be given as well.
         to_df : bool, optional
              Return a obj:`runpandas.Activity` if `to_df=True`, otherwise
              a :obj:`pandas.DataFrame` will be returned. Defaults to False.
+        cache : str or :obj:`runpandas.ActivityCache`, optional
+             A cache directory (or instance) where the parsed activity is
+             stored, so next reads of the unchanged file skip the parsing.
+             Requires ``pyarrow``. Defaults to None (no cache).
+        filetype : {"tcx", "gpx", "fit"}, optional
+             The format of the file. Defaults to None (inferred from the
+             extension of the path or of the ``name`` of the file object).
         **kwargs :
         Keyword args to be passed to the `read` method accordingly to the
-        file format.
+        file format (e.g. ``engine="fast"`` for TCX, GPX and FIT files, or
+        ``columns=["hr", "lat", "lon"]`` to parse only these columns).
 
     Returns
     -------
@@ -30,15 +51,33 @@ def _read_file(filename, to_df=False, **kwargs):
 
     """
 
-    if not utils.file_exists(filename):
-        raise IOError("%s does not exist" % filename)
-    if not utils.is_valid(filename):
+    if utils.is_file_like(filename):
+        if cache is not None:
+            raise ValueError("The cache is only supported for file paths.")
+        name = getattr(filename, "name", "")
+        filetype = filetype or utils.get_filetype(name if isinstance(name, str) else "")
+    else:
+        if not utils.file_exists(filename):
+            raise IOError("%s does not exist" % filename)
+        filetype = filetype or utils.get_filetype(filename)
+    if filetype not in utils.FILETYPES:
         raise exceptions.InvalidFileError(
             "File {filename} with invalid filetype.".format(**locals())
         )
-    _, ext = utils.splitext_plus(filename)
-    module = _import_module(ext[1:])
-    return module.read(filename, to_df, **kwargs)
+    if cache is not None:
+        if not isinstance(cache, ActivityCache):
+            cache = ActivityCache(cache)
+        activity = cache.get(filename, to_df=to_df, **kwargs)
+        if activity is not None:
+            return activity
+
+    module = _import_module(filetype)
+    with utils.open_source(filename) as source:
+        activity = module.read(source, to_df, **kwargs)
+
+    if cache is not None:
+        cache.put(filename, activity, to_df=to_df, **kwargs)
+    return activity
 
 
 def _import_module(mod_name):
@@ -56,35 +95,240 @@ def _import_module(mod_name):
     return mod
 
 
-def _read_dir(dirname, to_df=False, **kwargs):
+def _read_files(files, to_df=False, workers=None, executor="process", **kwargs):
     """
+    Read the given files sequentially or with a pool of workers.
 
     Parameters
     ----------
-        dirname : str, The path to a directory with training files.
+        files : list, The paths to the training files.
         to_df : bool, optional
              Return a obj:`runpandas.Activity` if `to_df=True`, otherwise
              a :obj:`pandas.DataFrame` will be returned. Defaults to False.
-        **kwargs : Keyword args to be passed to the `read_dir` method
+        workers : int, optional
+             The number of workers. If None or 1 the files are read one by one,
+             otherwise up to twice `workers` files are read ahead of the
+             activities yielded (see :func:`runpandas._utils.pool_map`).
+        executor : {"process", "thread"}, optional
+             The pool of workers used when `workers > 1`. Defaults to "process".
+        **kwargs : Keyword args to be passed to the `read_file` method
+
+    Yields
+    ------
+        A tuple (path, activity, error) for each file in the same order of `files`.
+        `activity` is None if the file could not be read and `error` is the
+        exception raised.
+    """
+    return utils.pool_map(
+        partial(_read_file, to_df=to_df, **kwargs),
+        files,
+        workers=workers,
+        executor=executor,
+    )
+
+
+def _scan_file(filename, records=100):
+    """
+    Read the metadata of a training file, parsing only as much of it as
+    needed (e.g. the first trackpoints of a TCX or GPX file, or the first
+    messages of a FIT file), so an archive of activities can be listed
+    and filtered without reading them.
+
+    Parameters
+    ----------
+        filename : str, The path to a TCX, GPX, FIT or NikeRun JSON file,
+             it may be compressed (see :func:`read_file`).
+        records : int, optional
+             The number of records inspected to find the channels.
+             Defaults to 100.
 
     Returns
     -------
-    Return a list of obj:`runpandas.Activity` if `to_df=True`, otherwise
-             a :obj:`pandas.DataFrame` will be returned.
+    A dict with the ``path`` and the ``format`` of the file, the ``start``
+    (UTC) of the activity, the ``device`` that recorded it (None if unknown)
+    and the ``channels`` recorded (the column names, e.g. ``hr``).
 
     """
-    path_dir = Path(dirname)
+    if not utils.file_exists(filename):
+        raise IOError("%s does not exist" % filename)
+    file_format = SCAN_FORMATS.get(utils.get_filetype(filename))
+    if file_format is None:
+        raise exceptions.InvalidFileError(
+            "File {filename} with invalid filetype.".format(**locals())
+        )
+    module = _import_module(file_format)
+    with utils.open_source(filename) as source:
+        metadata = module.scan(source, records=records)
+    return dict(path=str(filename), format=file_format, **metadata)
+
 
+def _list_files(dirname):
+    path_dir = Path(dirname)
     assert path_dir.is_dir()
+    return sorted(path_file for path_file in path_dir.iterdir() if path_file.is_file())
+
+
+def _failure(path_file, error):
+    return "%s (%s: %s)" % (path_file, type(error).__name__, error)
+
+
+def _warn_failures(failures):
+    if failures:
+        warnings.warn(
+            "%d file(s) could not be read and were skipped: %s"
+            % (len(failures), "; ".join(failures)),
+            UserWarning,
+        )
+
+
+def _scan_dir(dirname, records=100, errors="raise"):
+    """
+    Read the metadata of all the training files of a directory, without
+    parsing them (see :func:`scan_file`), into an index of the activities.
+
+    Parameters
+    ----------
+        dirname : str, The path to a directory with training files.
+        records : int, optional
+             The number of records of each file inspected to find the
+             channels. Defaults to 100.
+        errors : {"raise", "skip"}, optional
+             If "raise", the first file that can't be scanned stops the
+             scanning. If "skip", these files are skipped and reported all
+             together in a warning at the end. Defaults to "raise".
+
+    Returns
+    -------
+    A :obj:`pandas.DataFrame` with one row per file, and the columns ``path``,
+    ``format``, ``start``, ``device`` and ``channels``, sorted by start.
+
+    """
+    assert errors in ("raise", "skip"), "errors parameter must be raise or skip."
+
+    rows = []
+    failures = []
+    for path_file in _list_files(dirname):
+        try:
+            rows.append(_scan_file(path_file, records=records))
+        except Exception as error:
+            if errors == "raise":
+                raise
+            failures.append(_failure(path_file, error))
+    _warn_failures(failures)
+
+    index = pd.DataFrame(rows, columns=SCAN_COLUMNS)
+    index["start"] = pd.to_datetime(index["start"], utc=True)
+    return index.sort_values("start", kind="stable", ignore_index=True)
+
 
-    for path_file in path_dir.iterdir():
-        if path_file.is_dir():
+def _to_utc(timestamp):
+    """Converts the timestamp to UTC, naive timestamps are assumed in UTC."""
+    timestamp = pd.Timestamp(timestamp)
+    if timestamp.tz is None:
+        return timestamp.tz_localize("UTC")
+    return timestamp.tz_convert("UTC")
+
+
+def _files_between(files, start, end, errors, failures, exclude=None):
+    """Returns the files of the activities started between `start` and `end`
+    (inclusive), scanning only their metadata. The files of the starts for
+    which `exclude` returns True are skipped too."""
+    selected = []
+    for path_file in files:
+        try:
+            activity_start = _scan_file(path_file, records=1)["start"]
+        except Exception as error:
+            if errors == "raise":
+                raise
+            failures.append(_failure(path_file, error))
+            continue
+        if activity_start is None:
+            if start is None and end is None:
+                selected.append(path_file)
+            continue
+        if exclude is not None and exclude(activity_start):
             continue
+        activity_start = _to_utc(activity_start)
+        if start is not None and activity_start < _to_utc(start):
+            continue
+        if end is not None and activity_start > _to_utc(end):
+            continue
+        selected.append(path_file)
+    return selected
 
-        yield _read_file(filename=path_file, to_df=to_df, kwargs=kwargs)
 
+def _read_dir(
+    dirname,
+    to_df=False,
+    workers=None,
+    executor="process",
+    errors="raise",
+    start=None,
+    end=None,
+    **kwargs,
+):
+    """
+
+    Parameters
+    ----------
+        dirname : str, The path to a directory with training files.
+        to_df : bool, optional
+             Return a obj:`runpandas.Activity` if `to_df=True`, otherwise
+             a :obj:`pandas.DataFrame` will be returned. Defaults to False.
+        workers : int, optional
+             The number of files read in parallel. If None or 1 the files
+             are read one by one. Defaults to None.
+        executor : {"process", "thread"}, optional
+             Read the files with a pool of processes or of threads when
+             `workers > 1`. Defaults to "process".
+        errors : {"raise", "skip"}, optional
+             If "raise", the first file that can't be read stops the reading.
+             If "skip", these files are skipped and reported all together
+             in a warning at the end. Defaults to "raise".
+        start, end : str, datetime, optional
+             Only the activities started between `start` and `end`
+             (inclusive) are read. The files are selected by their metadata
+             (see :func:`scan_file`), without parsing the other ones. Naive
+             datetimes are assumed in UTC. Defaults to None (all the files).
+        **kwargs : Keyword args to be passed to the `read_file` method
+
+    Returns
+    -------
+    Return a list of obj:`runpandas.Activity` if `to_df=True`, otherwise
+             a :obj:`pandas.DataFrame` will be returned. The activities are
+             ordered by the file names.
 
-def _read_dir_aggregate(dirname, **kwargs):
+    """
+    assert errors in ("raise", "skip"), "errors parameter must be raise or skip."
+
+    files = _list_files(dirname)
+
+    failures = []
+    if start is not None or end is not None:
+        files = _files_between(files, start, end, errors, failures)
+
+    for path_file, activity, error in _read_files(
+        files, to_df=to_df, workers=workers, executor=executor, **kwargs
+    ):
+        if error is None:
+            yield activity
+        elif errors == "raise":
+            raise error
+        else:
+            failures.append(_failure(path_file, error))
+
+    _warn_failures(failures)
+
+
+def _read_dir_aggregate(
+    dirname,
+    workers=None,
+    executor="process",
+    errors="raise",
+    start=None,
+    end=None,
+    **kwargs,
+):
     """
     Read all supported container files from a supplied directory
     as `runpandas.Activity` dataframes, and aggregate them
@@ -95,6 +339,15 @@ def _read_dir_aggregate(dirname, **kwargs):
         dirname : str, The path to a directory with training files.
              Return a obj:`runpandas.Activity` if `to_df=True`, otherwise
              a :obj:`pandas.DataFrame` will be returned. Defaults to False.
+        workers : int, optional
+             The number of files read in parallel. See :func:`read_dir`.
+        executor : {"process", "thread"}, optional
+             The pool of workers used when `workers > 1`. See :func:`read_dir`.
+        errors : {"raise", "skip"}, optional
+             How to handle files that can't be read. See :func:`read_dir`.
+        start, end : str, datetime, optional
+             Only the activities started between `start` and `end`
+             (inclusive) are read and aggregated. See :func:`read_dir`.
         **kwargs : Keyword args to be passed to the `read_dir` method
 
     Returns
@@ -105,7 +358,16 @@ def _read_dir_aggregate(dirname, **kwargs):
     """
     activities = []
     activity_keys = []
-    for activity in _read_dir(dirname=dirname, to_df=False, **kwargs):
+    for activity in _read_dir(
+        dirname=dirname,
+        to_df=False,
+        workers=workers,
+        executor=executor,
+        errors=errors,
+        start=start,
+        end=end,
+        **kwargs,
+    ):
         activities.append(activity)
         activity_keys.append(activity.start)
     if len(activities) > 0:
@@ -117,7 +379,7 @@ def _read_dir_aggregate(dirname, **kwargs):
     return None
 
 
-def _read_event_result(filename, to_df=False, **kwargs):
+def _read_event_result(filename, to_df=False, cache=None, **kwargs):
     """
     Parameters
     ----------
@@ -125,6 +387,11 @@ def _read_event_result(filename, to_df=False, **kwargs):
         to_df : bool, optional
              Return a obj:`runpandas.RaceResult` if `to_df=False`, otherwise
              a :obj:`pandas.DataFrame` will be returned. Defaults to False.
+        cache : str or :obj:`runpandas.ActivityCache`, optional
+             A cache directory (or instance) where the parsed result is
+             stored with its event metadata, so next reads of the unchanged
+             file skip the CSV parsing. Requires ``pyarrow``.
+             Defaults to None (no cache).
         **kwargs : Keyword args to be passed to the `read` method accordingly \
             to the file format.
 
@@ -142,11 +409,29 @@ def _read_event_result(filename, to_df=False, **kwargs):
         raise exceptions.InvalidFileError(
             "File {filename} with invalid filetype.".format(**locals())
         )
+    if cache is not None:
+        if not isinstance(cache, ActivityCache):
+            cache = ActivityCache(cache)
+        race = cache.get(filename, to_df=to_df, **kwargs)
+        if race is not None:
+            return race
+
     module = _import_module("result")
-    return module.read(filename, to_df, **kwargs)
+    race = module.read(filename, to_df, **kwargs)
+
+    if cache is not None:
+        cache.put(filename, race, to_df=to_df, **kwargs)
+    return race
 
 
-def get_events(identifier, year=None, run_type=None, config=None):
+def get_events(
+    identifier,
+    year=None,
+    run_type=None,
+    config=None,
+    offline=None,
+    workers=None,
+):
     """
     Returns event results based on year or event name identifier.
     The result will be a list of :obj:`runpandas.RaceResult` instances that macthes
@@ -164,11 +449,20 @@ def get_events(identifier, year=None, run_type=None, config=None):
         with the given run type and return them.
     config : yaml file, optional
         The directory in which to cache data; see :func:`get_cache_path`.
+    offline : bool, optional
+        Only use the local copies of the index and of the race results,
+        without any request. Defaults to None (True if the
+        ``RUNPANDAS_OFFLINE`` environment variable is 1).
+    workers : int, optional
+        Number of race results downloaded at the same time. Defaults to None
+        (4 downloads).
 
     Returns
     -------
     Return a list of :obj:`runpandas.RaceResult` based on the identifier,
     run typer or year criteria.
     """
-    events = datasets.utils.get_events(identifier, year, run_type, config)
+    events = datasets.utils.get_events(
+        identifier, year, run_type, config, offline, workers
+    )
     return events
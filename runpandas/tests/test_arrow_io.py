@@ -0,0 +1,128 @@
+"""
+Test module for the Parquet/Feather activity round-trip
+"""
+
+import io
+import os
+import pytest
+import pandas as pd
+from pandas.testing import assert_frame_equal
+import runpandas
+from runpandas import reader
+from runpandas import types
+
+pytestmark = pytest.mark.stable
+
+pytest.importorskip("pyarrow")
+
+
+@pytest.fixture
+def dirpath(datapath):
+    return datapath("io", "data")
+
+
+@pytest.fixture
+def tcx_activity(dirpath):
+    return reader._read_file(os.path.join(dirpath, "tcx", "stopped_example.tcx"))
+
+
+@pytest.fixture
+def fit_activity(dirpath):
+    return reader._read_file(os.path.join(dirpath, "fit", "garmin-fenix-5-basic.fit"))
+
+
+formats = [
+    ("parquet", runpandas.read_parquet),
+    ("feather", runpandas.read_feather),
+]
+
+
+@pytest.mark.parametrize("file_format,read", formats)
+@pytest.mark.parametrize(
+    "activity",
+    [pytest.lazy_fixture("tcx_activity"), pytest.lazy_fixture("fit_activity")],
+)
+def test_activity_roundtrip(activity, file_format, read, tmp_path):
+    path = tmp_path / ("activity." + file_format)
+    getattr(activity, "to_" + file_format)(path)
+
+    loaded = read(path)
+    assert isinstance(loaded, types.Activity)
+    assert isinstance(loaded.index, pd.TimedeltaIndex)
+    assert loaded.start == activity.start
+    assert_frame_equal(loaded, activity)
+    for column in ("alt", "hr", "lat", "lon"):
+        assert isinstance(loaded[column], type(activity[column]))
+
+
+@pytest.mark.parametrize("file_format,read", formats)
+def test_activity_roundtrip_ready(tcx_activity, file_format, read, tmp_path):
+    path = tmp_path / ("activity." + file_format)
+    getattr(tcx_activity, "to_" + file_format)(path)
+
+    loaded = read(path)
+    loaded["distpos"] = loaded.compute.distance()
+    loaded["speed"] = loaded.compute.speed(from_distances=True)
+    loaded = loaded.only_moving()
+    tcx_activity["distpos"] = tcx_activity.compute.distance()
+    tcx_activity["speed"] = tcx_activity.compute.speed(from_distances=True)
+    tcx_activity = tcx_activity.only_moving()
+    pd.testing.assert_series_equal(loaded.summary(), tcx_activity.summary())
+
+
+@pytest.mark.parametrize("file_format,read", formats)
+def test_session_roundtrip(dirpath, file_format, read, tmp_path):
+    session = reader._read_dir_aggregate(os.path.join(dirpath, "samples"))
+    path = tmp_path / ("session." + file_format)
+    getattr(session, "to_" + file_format)(path)
+
+    loaded = read(path)
+    assert_frame_equal(loaded, session)
+    assert loaded.session.count() == 8
+
+
+def test_to_parquet_pandas_arguments(tcx_activity, tmp_path):
+    path = tmp_path / "activity.parquet"
+    tcx_activity.to_parquet(path, engine="pyarrow", index=True, compression=None)
+    loaded = runpandas.read_parquet(path)
+    assert loaded.start == tcx_activity.start
+    assert_frame_equal(loaded, tcx_activity)
+
+    # without path, the file content is returned
+    content = tcx_activity.to_parquet()
+    assert isinstance(content, bytes)
+    loaded = runpandas.read_parquet(io.BytesIO(content))
+    assert loaded.start == tcx_activity.start
+    assert_frame_equal(loaded, tcx_activity)
+
+    with open(tmp_path / "activity.feather", "wb") as feather_file:
+        tcx_activity.to_feather(feather_file)
+    assert_frame_equal(
+        runpandas.read_feather(tmp_path / "activity.feather"), tcx_activity
+    )
+
+
+def test_read_parquet_without_metadata(tcx_activity, tmp_path):
+    path = tmp_path / "activity.parquet"
+    tcx_activity.to_pandas().to_parquet(path)
+
+    loaded = runpandas.read_parquet(path)
+    assert isinstance(loaded, types.Activity)
+    assert getattr(loaded, "start", None) is None
+    assert isinstance(loaded["hr"], types.columns.HeartRate)
+    assert_frame_equal(loaded, tcx_activity)
+
+
+@pytest.mark.parametrize("file_format,read", formats)
+def test_race_result_roundtrip(dirpath, file_format, read, tmp_path):
+    race = reader._read_event_result(
+        os.path.join(dirpath, "results", "valid_result_br.csv")
+    )
+    path = tmp_path / ("race." + file_format)
+    runpandas.io.arrow._parser.__dict__["to_" + file_format](race, path)
+
+    loaded = read(path)
+    assert isinstance(loaded, types.frame.RaceResult)
+    assert_frame_equal(loaded, race)
+    for attribute in ("event_name", "event_type", "event_country", "event_date"):
+        assert getattr(loaded.event, attribute) == getattr(race.event, attribute)
@@ -0,0 +1,102 @@
+"""
+Test module for the activity cache
+"""
+
+import os
+import shutil
+import pytest
+from pandas import DataFrame
+from pandas.testing import assert_frame_equal
+from runpandas import reader
+from runpandas import types
+from runpandas.cache import ActivityCache
+
+pytestmark = pytest.mark.stable
+
+pytest.importorskip("pyarrow")
+
+
+@pytest.fixture
+def dirpath(datapath):
+    return datapath("io", "data")
+
+
+@pytest.fixture
+def tcx_file(dirpath, tmp_path):
+    return shutil.copy(os.path.join(dirpath, "tcx", "basic.tcx"), tmp_path)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ActivityCache(tmp_path / "cache")
+
+
+def test_cache_warm_read(tcx_file, cache, mocker):
+    expected = reader._read_file(tcx_file, cache=cache)
+    read = mocker.patch("runpandas.io.tcx.read")
+
+    activity = reader._read_file(tcx_file, cache=cache)
+    read.assert_not_called()
+    assert isinstance(activity, types.Activity)
+    assert isinstance(activity["hr"], types.columns.HeartRate)
+    assert activity.start == expected.start
+    assert_frame_equal(activity, expected)
+
+
+def test_cache_dataframe(tcx_file, cache):
+    expected = reader._read_file(tcx_file, to_df=True, cache=cache)
+    frame = reader._read_file(tcx_file, to_df=True, cache=cache)
+    assert not isinstance(frame, types.Activity)
+    assert isinstance(frame, DataFrame)
+    assert_frame_equal(frame, expected)
+    # activities and dataframes are different entries
+    assert isinstance(reader._read_file(tcx_file, cache=cache), types.Activity)
+
+
+def test_cache_path(tcx_file, tmp_path):
+    expected = reader._read_file(tcx_file, cache=str(tmp_path / "cache"))
+    assert len(list((tmp_path / "cache").glob("*.feather"))) == 1
+    activity = reader._read_file(tcx_file, cache=str(tmp_path / "cache"))
+    assert_frame_equal(activity, expected)
+
+
+def test_cache_touched_file(tcx_file, cache, mocker):
+    reader._read_file(tcx_file, cache=cache)
+    stat = os.stat(tcx_file)
+    os.utime(tcx_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    read = mocker.spy(reader._import_module("tcx"), "read")
+    reader._read_file(tcx_file, cache=cache)
+    read.assert_not_called()
+
+
+def test_cache_modified_file(tcx_file, cache, mocker):
+    reader._read_file(tcx_file, cache=cache)
+    with open(tcx_file, "a") as f:
+        f.write("\n")
+
+    read = mocker.spy(reader._import_module("tcx"), "read")
+    reader._read_file(tcx_file, cache=cache)
+    read.assert_called_once()
+
+
+def test_cache_eviction(dirpath, tmp_path):
+    cache = ActivityCache(tmp_path / "cache", max_size=1)
+    for filename in ("basic.tcx", "run.tcx"):
+        reader._read_file(os.path.join(dirpath, "tcx", filename), cache=cache)
+    assert len(list(cache.path.glob("*.feather"))) == 0
+
+    cache.max_size = 2**20
+    for filename in ("basic.tcx", "run.tcx"):
+        reader._read_file(os.path.join(dirpath, "tcx", filename), cache=cache)
+    entries = list(cache.path.glob("*.feather"))
+    assert len(entries) == 2
+
+    # basic.tcx is the least recently used entry
+    cache.max_size = max(entry.stat().st_size for entry in entries)
+    cache.evict()
+    assert cache.get(os.path.join(dirpath, "tcx", "basic.tcx"), to_df=False) is None
+    assert cache.get(os.path.join(dirpath, "tcx", "run.tcx"), to_df=False) is not None
+
+    cache.clear()
+    assert len(list(cache.path.glob("*.feather"))) == 0
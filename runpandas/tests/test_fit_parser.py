@@ -3,11 +3,15 @@ Test module for FIT reader base module
 """
 
 import os
+import struct
 import pytest
 from pandas import DataFrame, TimedeltaIndex, Timedelta, Timestamp
+from pandas.testing import assert_frame_equal
 from runpandas import reader
 from runpandas import types
 import runpandas.io.fit._parser as fit_parser
+from runpandas.io.fit import _decoder
+from fitparse.records import Crc, DataMessage
 from fitparse.utils import FitParseError
 
 pytestmark = pytest.mark.stable
@@ -122,3 +126,155 @@ def test_read_file_fit_basic_activity(dirpath):
 
     assert "session" in activity.columns
     assert activity["session"].max() == 0  # no sessions
+
+
+def _fit_definition(local_type, global_num, fields, dev_fields=(), endian="<"):
+    header = 0x40 | local_type | (0x20 if dev_fields else 0)
+    message = struct.pack(
+        endian + "BBBHB", header, 0, endian == ">", global_num, len(fields)
+    )
+    message += b"".join(struct.pack("BBB", *field) for field in fields)
+    if dev_fields:
+        message += struct.pack("B", len(dev_fields))
+        message += b"".join(struct.pack("BBB", *field) for field in dev_fields)
+    return message
+
+
+def _fit_file(file_path, messages):
+    data = b"".join(messages)
+    header = struct.pack("<BBHI4s", 14, 0x10, 2093, len(data), b".FIT")
+    header += struct.pack("<H", Crc.calculate(header))
+    crc = Crc.calculate(data, Crc.calculate(header))
+    with open(file_path, "wb") as f:
+        f.write(header + data + struct.pack("<H", crc))
+    return str(file_path)
+
+
+# 2021-01-01 00:00:00 UTC in FIT timestamps
+FIT_START = 978307200 - 631065600
+
+
+@pytest.fixture
+def fit_file(tmp_path):
+    messages = [
+        _fit_definition(0, 0, [(0, 1, 0x00)]),  # file_id
+        struct.pack("<BB", 0, 4),
+        _fit_definition(1, 207, [(3, 1, 0x02)]),  # developer_data_id
+        struct.pack("<BB", 1, 0),
+        _fit_definition(
+            2, 206, [(0, 1, 0x02), (1, 1, 0x02), (2, 1, 0x02), (3, 8, 0x07)]
+        ),
+        struct.pack("<BBBB8s", 2, 0, 0, 0x84, b"RunPower"),
+        _fit_definition(3, 21, [(253, 4, 0x86), (0, 1, 0x00), (1, 1, 0x00)]),  # event
+        struct.pack("<BIBB", 3, FIT_START, 0, 0),  # timer start
+        # big endian records with enum, component and developer fields
+        _fit_definition(
+            4,
+            20,
+            [(253, 4, 0x86), (3, 1, 0x02), (42, 1, 0x00), (2, 2, 0x84)],
+            dev_fields=[(0, 2, 0)],
+            endian=">",
+        ),
+    ]
+    for i in range(5):
+        heart_rate = 0xFF if i == 2 else 150 + i  # invalid value
+        messages.append(
+            struct.pack(">BIBBHH", 4, FIT_START + i, heart_rate, 1, 2600 + i, 200 + i)
+        )
+    messages += [
+        _fit_definition(5, 19, [(253, 4, 0x86)]),  # lap
+        struct.pack("<BI", 5, FIT_START + 5),
+        struct.pack("<BIBB", 3, FIT_START + 5, 0, 4),  # timer stop
+        struct.pack("<BIBB", 3, FIT_START + 6, 0, 0),  # timer start
+        _fit_definition(6, 20, [(253, 4, 0x86), (3, 1, 0x02), (7, 2, 0x84)]),
+    ]
+    for i in range(6, 9):
+        messages.append(struct.pack("<BIBH", 6, FIT_START + i, 160, 300 + i))
+    return _fit_file(tmp_path / "activity.fit", messages)
+
+
+@pytest.mark.parametrize(
+    "file_path",
+    [
+        os.path.join("fit", "garmin-fenix-5-basic.fit"),
+        os.path.join("fit", "run.fit"),
+    ],
+)
+def test_read_file_fit_fast_engine(dirpath, file_path):
+    fit_file = os.path.join(dirpath, file_path)
+    assert_frame_equal(
+        fit_parser.read(fit_file, to_df=True, engine="fast"),
+        fit_parser.read(fit_file, to_df=True),
+    )
+    activity = reader._read_file(fit_file, engine="fast")
+    assert isinstance(activity["lat"], types.columns.Latitude)
+    assert_frame_equal(activity, reader._read_file(fit_file))
+
+
+def test_read_file_fit_fast_engine_messages(fit_file):
+    frame = fit_parser.read(fit_file, to_df=True, engine="fast")
+    assert_frame_equal(frame, fit_parser.read(fit_file, to_df=True))
+    assert frame["activity_type"].iloc[0] == "running"
+    assert frame["enhanced_altitude"].iloc[0] == pytest.approx(20)
+    assert frame["run_power"].tolist()[:5] == [200, 201, 202, 203, 204]
+    assert frame["power"].tolist()[5:] == [306, 307, 308]
+    assert frame["lap"].tolist() == [0] * 5 + [1] * 3
+    assert frame["session"].tolist() == [0] * 5 + [1] * 3
+
+
+def test_read_file_fit_fast_engine_fallback(tmp_path):
+    messages = [
+        _fit_definition(0, 20, [(253, 4, 0x86), (3, 1, 0x02)]),
+        struct.pack("<BIB", 0, FIT_START, 150),
+        _fit_definition(1, 20, [(3, 1, 0x02)]),
+        struct.pack("<BB", 0x80 | 1 << 5 | 3, 151),  # compressed timestamp header
+    ]
+    fit_file = _fit_file(tmp_path / "compressed.fit", messages)
+    with pytest.raises(_decoder.UnsupportedFitError):
+        _decoder.decode_records(fit_file)
+    frame = fit_parser.read(fit_file, to_df=True, engine="fast")
+    assert_frame_equal(frame, fit_parser.read(fit_file, to_df=True))
+    assert frame.index[-1] == Timedelta(seconds=3)
+
+
+def test_read_file_fit_fast_engine_invalid(dirpath):
+    gpx_file = os.path.join(dirpath, "gpx", "garmin_connect.gpx")
+    with pytest.raises(FitParseError):
+        fit_parser.read(gpx_file, engine="fast")
+
+    fit_file = os.path.join(dirpath, "fit", "run.fit")
+    with pytest.raises(ValueError):
+        fit_parser.read(fit_file, engine="unknown")
+
+
+@pytest.mark.parametrize("engine", ["default", "fast"])
+def test_read_file_fit_columns(dirpath, fit_file, engine):
+    run_file = os.path.join(dirpath, "fit", "garmin-fenix-5-basic.fit")
+    activity = reader._read_file(run_file, engine=engine, columns=["hr", "lat", "lon"])
+    expected = reader._read_file(run_file)
+    assert sorted(activity.columns) == ["hr", "lat", "lon"]
+    assert isinstance(activity["lat"], types.columns.Latitude)
+    assert_frame_equal(activity, expected[activity.columns])
+    assert activity.start == expected.start
+
+    # a component is decoded without its field
+    frame = fit_parser.read(
+        fit_file, to_df=True, engine=engine, columns=["enhanced_altitude", "lap"]
+    )
+    assert list(frame.columns) == ["enhanced_altitude", "lap"]
+    assert frame["enhanced_altitude"].iloc[0] == pytest.approx(20)
+
+
+def test_read_file_fit_columns_default_engine(dirpath, mocker):
+    run_file = os.path.join(dirpath, "fit", "garmin-fenix-5-basic.fit")
+    get_values = mocker.spy(DataMessage, "get_values")
+    get_value = mocker.spy(DataMessage, "get_value")
+    frame = fit_parser.read(run_file, to_df=True, columns=["hr"])
+    assert list(frame.columns) == ["heart_rate"]
+    # the unselected fields of the records are never read
+    assert get_values.call_count == 0
+    assert {call.args[1] for call in get_value.call_args_list} == {
+        "heart_rate",
+        "timestamp",
+        "event_type",
+    }
@@ -5,7 +5,10 @@ Test module for TCX reader base module
 import os
 import pytest
 from pandas import DataFrame, Timedelta, TimedeltaIndex, Timestamp
+from pandas.testing import assert_frame_equal
 from runpandas import reader
+from runpandas import _utils as utils
+from runpandas.io.gpx import _parser as gpx_parser
 from runpandas import types
 
 pytestmark = pytest.mark.stable
@@ -170,3 +173,36 @@ def test_read_file_nikerun_gpx_export(dirpath):
     assert activity.start.floor(freq="S") == Timestamp("2021-07-04 11:23:19").floor(
         freq="S"
     )
+
+
+@pytest.mark.parametrize(
+    "filename", ["garmin_connect.gpx", "strava_export.gpx", "nike_run.gpx"]
+)
+def test_read_file_gpx_fast_engine(dirpath, filename):
+    gpx_file = os.path.join(dirpath, "gpx", filename)
+    expected = reader._read_file(gpx_file, to_df=False)
+    activity = reader._read_file(gpx_file, to_df=False, engine="fast")
+    assert_frame_equal(activity, expected)
+    assert activity.start == expected.start
+
+
+def test_gen_records_gpx_columns(dirpath, mocker):
+    gpx_file = os.path.join(dirpath, "gpx", "garmin_connect.gpx")
+    extract = mocker.spy(utils, "recursive_text_extract")
+    selected = utils.column_selector(
+        ["lat", "alt"], gpx_parser.COLUMNS_SCHEMA, keep=("time",)
+    )
+    records = list(gpx_parser.gen_records(gpx_file, selected))
+    # the unselected fields are skipped while extracting the trackpoints
+    assert extract.call_count == 0
+    assert {name for record in records for name in record} == {"time", "lat", "ele"}
+
+
+@pytest.mark.parametrize("engine", ["default", "fast"])
+def test_read_file_gpx_columns(dirpath, engine):
+    gpx_file = os.path.join(dirpath, "gpx", "garmin_connect.gpx")
+    expected = reader._read_file(gpx_file)
+    activity = reader._read_file(gpx_file, engine=engine, columns=["lat", "lon"])
+    assert sorted(activity.columns) == ["lat", "lon"]
+    assert_frame_equal(activity, expected[activity.columns])
+    assert activity.start == expected.start
@@ -89,6 +89,14 @@ def test_metrics_distance(activity, column, index, expected):
     assert activity[column].iloc[index] == expected
 
 
+def test_metrics_distance_keeps_activity(runpandas_gpx_activity):
+    expected_columns = runpandas_gpx_activity.columns.tolist()
+    distpos = runpandas_gpx_activity.compute.distance(correct_distance=True)
+    assert runpandas_gpx_activity.columns.tolist() == expected_columns
+    assert pd.isna(distpos.iloc[0])
+    assert len(distpos) == len(runpandas_gpx_activity)
+
+
 test_correct_distance_pos_data = [
     (pytest.lazy_fixture("runpandas_gpx_activity"), "distpos", -1, 5.093437453100809),
     (pytest.lazy_fixture("runpandas_gpx_activity"), "distpos", 2, 5.11816186976935),
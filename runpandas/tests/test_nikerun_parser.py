@@ -2,12 +2,16 @@
 Test module for NikeRun reader base module
 """
 
+import json
 import os
+import shutil
+import numpy as np
 import pytest
 from pandas import DataFrame, Timedelta, TimedeltaIndex, Timestamp
 from runpandas import read_nikerun, read_dir_nikerun
 from runpandas import types
 from runpandas import exceptions
+from runpandas.io.nikerun import _parser as nikerun_parser
 
 pytestmark = pytest.mark.stable
 
@@ -169,6 +173,42 @@ def test_read_dir_full_nikerun(dirpath):
     )
 
 
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_read_dir_nikerun_workers(dirpath, executor):
+    activities_directory = os.path.join(dirpath, "nikerun", "samples")
+    expected = read_dir_nikerun(activities_directory)
+    session = read_dir_nikerun(activities_directory, workers=2, executor=executor)
+    assert session.session.count() == 5
+    assert session.equals(expected)
+
+    with pytest.raises(ValueError):
+        read_dir_nikerun(activities_directory, workers=2, executor="unknown")
+
+
+@pytest.mark.parametrize("workers", [None, 2])
+def test_read_dir_nikerun_errors(dirpath, tmp_path, workers):
+    samples = os.path.join(dirpath, "nikerun", "samples")
+    for name in sorted(os.listdir(samples))[:2]:
+        shutil.copy(os.path.join(samples, name), tmp_path)
+    shutil.copy(os.path.join(dirpath, "nikerun", "malformed_lat.json"), tmp_path)
+
+    with pytest.raises(exceptions.InvalidFileError):
+        read_dir_nikerun(tmp_path, workers=workers, executor="thread")
+
+    with pytest.warns(UserWarning, match="malformed_lat.json"):
+        session = read_dir_nikerun(
+            tmp_path, workers=workers, executor="thread", errors="skip"
+        )
+    assert session.session.count() == 2
+
+
+def test_read_file_nikerun_single_load(dirpath, mocker):
+    json_file = os.path.join(dirpath, "nikerun", "sample_nikerun.json")
+    json_loads = mocker.spy(nikerun_parser, "json_loads")
+    read_nikerun(json_file)
+    assert json_loads.call_count == 1
+
+
 def test_read_file_missing_data_nikerun_basic_activity(dirpath):
     json_file = os.path.join(dirpath, "nikerun", "missing_columns_nikerun.json")
     activity = read_nikerun(json_file, to_df=False)
@@ -177,3 +217,48 @@ def test_read_file_missing_data_nikerun_basic_activity(dirpath):
     assert activity.size == 1212
     included_data = set(["lat", "lon", "alt"])
     assert included_data <= set(activity.columns.to_list())
+
+
+def test_read_file_nikerun_columns(dirpath):
+    json_file = os.path.join(dirpath, "nikerun", "sample_nikerun.json")
+    expected = read_nikerun(json_file)
+    activity = read_nikerun(json_file, columns=["hr", "steps"])
+    assert sorted(activity.columns) == ["hr", "steps"]
+    assert activity.index.equals(expected.index)
+    assert activity["hr"].equals(expected["hr"])
+
+
+def _metric(metric_type, windows):
+    return {
+        "type": metric_type,
+        "unit": "",
+        "values": [
+            {"start_epoch_ms": start, "end_epoch_ms": end, "value": value}
+            for start, end, value in windows
+        ],
+    }
+
+
+def test_read_file_nikerun_metric_alignment(tmp_path):
+    positions = [(epoch, epoch, -8.0) for epoch in (0, 1000, 2000, 3000)]
+    activity = {
+        "metrics": [
+            _metric("latitude", positions),
+            _metric("longitude", positions),
+            _metric("elevation", [(0, 0, 1.0), (0, 2000, 2.0), (2000, 3000, 3.0)]),
+            _metric("heart_rate", [(0, 500, 100), (500, 1500, 110), (1500, 2500, 120)]),
+            _metric(
+                "steps",
+                [(0, 200, 1), (200, 400, 2), (400, 1500, 3), (1500, 3500, 4)],
+            ),
+        ]
+    }
+    json_file = tmp_path / "activity.json"
+    json_file.write_text(json.dumps(activity))
+
+    data = read_nikerun(str(json_file), to_df=True)
+    # the value of the last window ended since the previous position
+    np.testing.assert_array_equal(data["elevation"], [1.0, np.nan, 2.0, np.nan])
+    np.testing.assert_array_equal(data["heart_rate"], [np.nan, 100, 110, np.nan])
+    # the sum of the windows that ended since the previous position
+    np.testing.assert_array_equal(data["steps"], [np.nan, 3, 3, np.nan])
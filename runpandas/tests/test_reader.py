@@ -2,11 +2,18 @@
 Test module for reader base module
 """
 
+import bz2
+import gzip
+import io
 import os
+import shutil
+import zipfile
 import pytest
 import runpandas
 from pandas import DataFrame
+from pandas.testing import assert_frame_equal
 from runpandas import reader
+from runpandas import _utils as utils
 from runpandas import exceptions
 from runpandas import types
 
@@ -129,11 +136,64 @@ def test_invalid_dir(dirpath):
         next(reader._read_dir(tcx_file))
 
 
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_read_dir_workers(dirpath, executor):
+    activities_directory = os.path.join(dirpath, "samples")
+    expected = list(reader._read_dir(activities_directory))
+    activities = list(
+        reader._read_dir(activities_directory, workers=2, executor=executor)
+    )
+    assert len(activities) == len(expected) == 8
+    for activity, expected_activity in zip(activities, expected):
+        assert isinstance(activity, types.Activity)
+        assert activity.start == expected_activity.start
+        assert_frame_equal(activity, expected_activity)
+
+
+def test_read_dir_invalid_executor(dirpath):
+    activities_directory = os.path.join(dirpath, "samples")
+    with pytest.raises(ValueError):
+        next(reader._read_dir(activities_directory, workers=2, executor="gpu"))
+
+
+@pytest.mark.parametrize("workers", [None, 2])
+def test_read_dir_errors(dirpath, tmp_path, workers):
+    shutil.copy(os.path.join(dirpath, "tcx", "basic.tcx"), tmp_path)
+    shutil.copy(os.path.join(dirpath, "tcx", "malformed.tcx"), tmp_path)
+    shutil.copy(os.path.join(dirpath, "gpx", "run.gpx"), tmp_path)
+
+    with pytest.raises(exceptions.InvalidFileError):
+        list(reader._read_dir(tmp_path, workers=workers, executor="thread"))
+
+    with pytest.warns(UserWarning, match="malformed.tcx"):
+        activities = list(
+            reader._read_dir(
+                tmp_path, workers=workers, executor="thread", errors="skip"
+            )
+        )
+    assert len(activities) == 2
+
+    with pytest.warns(UserWarning):
+        session = reader._read_dir_aggregate(
+            tmp_path, workers=workers, executor="thread", errors="skip"
+        )
+    assert session.session.count() == 2
+
+
 def test_read_dir_empty_aggregate(temp_dir):
     session_frame = reader._read_dir_aggregate(temp_dir)
     assert session_frame is None
 
 
+def test_read_dir_aggregate_workers(dirpath):
+    activities_directory = os.path.join(dirpath, "samples")
+    expected = reader._read_dir_aggregate(activities_directory)
+    session = reader._read_dir_aggregate(
+        activities_directory, workers=2, executor="process"
+    )
+    assert_frame_equal(session, expected)
+
+
 def test_read_dir_aggregate(dirpath):
     activities_directory = os.path.join(dirpath, "samples")
     session = reader._read_dir_aggregate(activities_directory)
@@ -148,6 +208,161 @@ def test_read_dir_aggregate(dirpath):
     )
 
 
+def _compress(file_path, compression, directory):
+    name = os.path.basename(file_path)
+    compressed_path = os.path.join(directory, name + compression)
+    if compression == ".zip":
+        with zipfile.ZipFile(compressed_path, "w") as archive:
+            archive.write(file_path, name)
+        return compressed_path
+    opener = gzip.open if compression == ".gz" else bz2.open
+    with open(file_path, "rb") as plain_file, opener(compressed_path, "wb") as f:
+        shutil.copyfileobj(plain_file, f)
+    return compressed_path
+
+
+@pytest.mark.parametrize("compression", [".gz", ".bz2", ".zip"])
+@pytest.mark.parametrize(
+    "file_path,engine",
+    [
+        (os.path.join("tcx", "run_garmin.tcx"), "default"),
+        (os.path.join("gpx", "garmin_connect.gpx"), "fast"),
+        (os.path.join("fit", "garmin-fenix-5-basic.fit"), "default"),
+        (os.path.join("fit", "run.fit"), "fast"),
+    ],
+)
+def test_read_file_compressed(dirpath, tmp_path, file_path, engine, compression):
+    file_path = os.path.join(dirpath, file_path)
+    compressed_path = _compress(file_path, compression, tmp_path)
+    assert utils.is_valid(compressed_path)
+    expected = reader._read_file(file_path, engine=engine)
+    activity = reader._read_file(compressed_path, engine=engine)
+    assert_frame_equal(activity, expected)
+    assert activity.start == expected.start
+    assert runpandas.scan_file(compressed_path)["start"] == expected.start
+
+
+def test_read_file_compressed_dir(dirpath, tmp_path):
+    for name in ["basic.tcx", "run_garmin.tcx"]:
+        _compress(os.path.join(dirpath, "tcx", name), ".gz", tmp_path)
+    session = reader._read_dir_aggregate(tmp_path, start="2018-01-01")
+    assert session.session.count() == 1
+
+    with zipfile.ZipFile(tmp_path / "activities.tcx.zip", "w") as archive:
+        for name in ["basic.tcx", "run_garmin.tcx"]:
+            archive.write(os.path.join(dirpath, "tcx", name), name)
+    with pytest.raises(exceptions.InvalidFileError):
+        reader._read_file(tmp_path / "activities.tcx.zip")
+
+
+@pytest.mark.parametrize(
+    "file_path,engine",
+    [
+        (os.path.join("tcx", "run_garmin.tcx"), "fast"),
+        (os.path.join("gpx", "garmin_connect.gpx"), "default"),
+        (os.path.join("fit", "garmin-fenix-5-basic.fit"), "fast"),
+        (os.path.join("fit", "run.fit"), "default"),
+    ],
+)
+def test_read_file_object(dirpath, tmp_path, file_path, engine):
+    file_path = os.path.join(dirpath, file_path)
+    expected = reader._read_file(file_path, engine=engine)
+    with open(file_path, "rb") as file_object:
+        assert_frame_equal(reader._read_file(file_object, engine=engine), expected)
+        assert not file_object.closed
+
+    compressed_path = _compress(file_path, ".gz", tmp_path)
+    with open(compressed_path, "rb") as f, gzip.GzipFile(fileobj=f) as file_object:
+        assert_frame_equal(reader._read_file(file_object, engine=engine), expected)
+
+    # without name, the format must be given
+    with open(file_path, "rb") as f:
+        file_object = io.BytesIO(f.read())
+    with pytest.raises(exceptions.InvalidFileError):
+        reader._read_file(file_object, engine=engine)
+    filetype = os.path.splitext(file_path)[1][1:]
+    activity = reader._read_file(file_object, engine=engine, filetype=filetype)
+    assert_frame_equal(activity, expected)
+
+    with open(file_path, "rb") as file_object:
+        with pytest.raises(ValueError):
+            reader._read_file(file_object, cache=tmp_path / "cache")
+
+
+@pytest.mark.parametrize(
+    "file_path",
+    [
+        os.path.join("tcx", "run_garmin.tcx"),
+        os.path.join("gpx", "garmin_connect.gpx"),
+        os.path.join("fit", "garmin-fenix-5-basic.fit"),
+    ],
+)
+def test_scan_file(dirpath, file_path):
+    file_path = os.path.join(dirpath, file_path)
+    metadata = runpandas.scan_file(file_path)
+    activity = reader._read_file(file_path)
+    assert metadata["path"] == file_path
+    assert metadata["format"] == os.path.splitext(file_path)[1][1:]
+    assert metadata["start"] == activity.start
+    assert {"lat", "lon", "alt", "hr"} <= set(metadata["channels"])
+    assert set(metadata["channels"]) <= set(activity.columns)
+
+
+def test_scan_file_device(dirpath):
+    tcx_file = os.path.join(dirpath, "tcx", "run_garmin.tcx")
+    assert runpandas.scan_file(tcx_file)["device"] == "Garmin Forerunner 620"
+    gpx_file = os.path.join(dirpath, "gpx", "garmin_connect.gpx")
+    assert runpandas.scan_file(gpx_file)["device"] == "Garmin Connect"
+    fit_file = os.path.join(dirpath, "fit", "garmin-fenix-5-basic.fit")
+    assert runpandas.scan_file(fit_file)["device"] == "garmin fenix5"
+    json_file = os.path.join(dirpath, "nikerun", "sample_nikerun.json")
+    metadata = runpandas.scan_file(json_file)
+    assert metadata["format"] == "nikerun"
+    assert metadata["device"] == "com.nike.sport.running.ios"
+    assert metadata["start"] == runpandas.read_nikerun(json_file).start
+
+
+def test_scan_file_invalid(dirpath, tmp_path):
+    with pytest.raises(IOError):
+        runpandas.scan_file(tmp_path / "activity.tcx")
+    with pytest.raises(exceptions.InvalidFileError):
+        runpandas.scan_file(os.path.join(dirpath, "results", "valid_result.csv"))
+    with pytest.raises(exceptions.InvalidFileError):
+        runpandas.scan_file(os.path.join(dirpath, "tcx", "malformed.tcx"))
+
+
+def test_scan_dir(dirpath, tmp_path):
+    activities_directory = os.path.join(dirpath, "samples")
+    index = runpandas.scan_dir(activities_directory)
+    session = reader._read_dir_aggregate(activities_directory)
+    assert list(index.columns) == reader.SCAN_COLUMNS
+    assert (index["format"] == "tcx").all()
+    assert list(index["start"]) == list(session.index.unique(level="start"))
+
+    shutil.copy(os.path.join(dirpath, "tcx", "malformed.tcx"), tmp_path)
+    shutil.copy(os.path.join(dirpath, "gpx", "run.gpx"), tmp_path)
+    with pytest.raises(exceptions.InvalidFileError):
+        runpandas.scan_dir(tmp_path)
+    with pytest.warns(UserWarning, match="malformed.tcx"):
+        index = runpandas.scan_dir(tmp_path, errors="skip")
+    assert list(index["format"]) == ["gpx"]
+
+
+def test_read_dir_aggregate_date_range(dirpath):
+    activities_directory = os.path.join(dirpath, "samples")
+    session = reader._read_dir_aggregate(
+        activities_directory, start="2020-12-06", end="2020-12-16"
+    )
+    expected = reader._read_dir_aggregate(activities_directory)
+    starts = expected.index.unique(level="start")[2:5]
+    assert list(session.index.unique(level="start")) == list(starts)
+    assert_frame_equal(session, expected.loc[starts])
+
+    activities = list(reader._read_dir(activities_directory, start="2020-12-26"))
+    assert len(activities) == 1
+    assert reader._read_dir_aggregate(activities_directory, end="2020-12-01") is None
+
+
 def test_read_event_result_invalid(invalid_result_filename):
     invalid_result_filename.write("content")
     with pytest.raises(exceptions.InvalidFileError):
@@ -205,6 +205,62 @@ def test_read_file_result_valid_race_result_with_nonfinishers(dirpath):
     assert (race.position.values == "DNF").sum() == 15  # number of non-finishers
 
 
+def test_read_file_result_dtypes(dirpath):
+    result_file = os.path.join(dirpath, "results", "result_10k.csv")
+    race = read_result(result_file, to_df=True)
+    assert race["position"].dtype == object
+    assert race["bib"].iloc[0] == "11"
+    assert isinstance(race["sex"].dtype, pd.CategoricalDtype)
+    assert race["age"].dtype == "Int64"
+    for column in ["5k", "10k", "half", "40k", "pace", "nettime"]:
+        assert pd.api.types.is_timedelta64_dtype(race[column])
+    assert race["nettime"].iloc[0] == pd.Timedelta("0 days 02:09:37")
+
+
+def test_read_file_result_missing_values(tmp_path):
+    result_file = tmp_path / "result.csv"
+    result_file.write_text(
+        "city marathon,01/05/2022,42k,BR\n"
+        "Position,Bib,Name,Age,Sex,Official Time\n"
+        "1,10,Runner A,31,F,2:31:02\n"
+        "2,11,Runner B,,M,-\n"
+        "DNF,12,Runner C,44,M,\n"
+    )
+    race = read_result(str(result_file), to_df=True)
+    assert race["age"].isna().tolist() == [False, True, False]
+    assert race["nettime"].isna().tolist() == [False, True, True]
+    assert race["position"].tolist() == ["1", "2", "DNF"]
+
+
+def test_read_file_result_read_csv_kwargs(tmp_path):
+    result_file = tmp_path / "result.csv"
+    result_file.write_text(
+        "city marathon;01/05/2022;42k;BR\n"
+        "Position;Bib;Name;Age;Sex;Official Time\n"
+        "1;10;Runner A;31;F;2:31:02\n"
+        "2;11;Runner B;27.5;M;2:40:10\n"
+    )
+    race = read_result(str(result_file), to_df=True, sep=";")
+    assert list(race.columns) == ["position", "bib", "name", "age", "sex", "nettime"]
+    assert race["bib"].tolist() == ["10", "11"]
+    assert race["nettime"].iloc[1] == pd.Timedelta("02:40:10")
+    # the ages that aren't whole numbers are missing
+    assert race["age"].dtype == "Int64"
+    assert race["age"].isna().tolist() == [False, True]
+
+    race = read_result(str(result_file), sep=";", columns=["nettime"])
+    assert race.event.event_name == "city marathon"
+    assert list(race.columns) == ["nettime"]
+
+
+def test_read_file_result_columns(dirpath):
+    result_file = os.path.join(dirpath, "results", "result_10k.csv")
+    expected = read_result(result_file, to_df=True)
+    race = read_result(result_file, to_df=True, columns=["nettime", "sex", "5_k"])
+    assert list(race.columns) == ["sex", "5k", "nettime"]
+    assert race["nettime"].equals(expected["nettime"])
+
+
 test_data = [
     (
         pytest.lazy_fixture("pandas_race"),
@@ -5,7 +5,9 @@ Test module for runpandas types i.e Sessions
 
 import os
 import pytest
+from numpy import isnan
 from pandas import Timestamp, concat
+from pandas.testing import assert_series_equal
 from runpandas import read_dir, reader
 from runpandas.types import columns
 from runpandas.exceptions import RequiredColumnError
@@ -185,3 +187,35 @@ def test_heart_zone_session(multi_frame):
     after_shape = multi_frame.loc[Timestamp("2020-12-08 09:36:12+00:00")].shape
     assert before_shape[0] == after_shape[0]  # same number of records
     assert before_shape[1] + 1 == after_shape[1]  # number of columns + 1(hr_zone)
+
+
+def test_session_metrics_reset_per_activity(multi_frame):
+    multi_frame.session.distance(correct_distance=True)
+    multi_frame.session.speed(from_distances=True)
+    multi_frame.session.vertical_speed()
+    multi_frame.session.gradient()
+
+    for start in multi_frame.index.unique(level="start"):
+        activity = multi_frame.xs(start, level=0)[["lat", "lon", "alt"]]
+        distpos = activity.compute.distance(correct_distance=True)
+        activity["distpos"] = distpos
+        activity["dist"] = distpos.to_distance()
+        session_activity = multi_frame.xs(start, level=0)
+
+        assert isnan(session_activity["distpos"].iloc[0])
+        assert_series_equal(
+            session_activity["dist"], activity["dist"], check_names=False
+        )
+        assert_series_equal(
+            session_activity["speed"],
+            activity.compute.speed(from_distances=True),
+            check_names=False,
+        )
+        assert_series_equal(
+            session_activity["vam"],
+            activity.compute.vertical_speed(),
+            check_names=False,
+        )
+        assert_series_equal(
+            session_activity["grad"], activity.compute.gradient(), check_names=False
+        )
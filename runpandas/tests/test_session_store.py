@@ -0,0 +1,151 @@
+"""
+Test module for the partitioned session store
+"""
+
+import os
+import pytest
+from pandas import Timestamp, concat
+from pandas.testing import assert_frame_equal
+from runpandas import SessionStore, read_dir_aggregate, reader
+from runpandas.io.arrow import _store
+from runpandas.types import columns, summary
+
+pytestmark = pytest.mark.stable
+
+pytest.importorskip("pyarrow")
+
+
+@pytest.fixture
+def dirpath(datapath):
+    return datapath("io", "data")
+
+
+@pytest.fixture
+def sessions_dir(dirpath):
+    return os.path.join(dirpath, "samples")
+
+
+@pytest.fixture
+def session(sessions_dir):
+    return read_dir_aggregate(sessions_dir)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SessionStore(tmp_path / "store")
+
+
+def test_store_append_session(session, store):
+    store.append_session(session)
+    assert len(store) == session.session.count()
+    assert store.starts == list(session.index.unique(level="start"))
+    assert session.index.unique(level="start")[0] in store
+
+    loaded = store.load()
+    assert loaded.session.count() == session.session.count()
+    assert_frame_equal(loaded, session, check_freq=False)
+    assert isinstance(loaded["hr"], columns.HeartRate)
+
+
+def test_store_append_existing(session, store):
+    store.append_session(session)
+    activity = store.load(end=store.starts[0]).xs(store.starts[0], level=0)
+    activity.start = store.starts[0]
+    with pytest.raises(ValueError):
+        store.append(activity)
+    store.append(activity, overwrite=True)
+    assert len(store) == session.session.count()
+
+    with pytest.raises(ValueError):  # no start
+        store.append(activity.reset_index())
+
+
+def test_store_append_dir(sessions_dir, store):
+    assert store.append_dir(sessions_dir) == 8
+    # only the new activities are appended
+    assert store.append_dir(sessions_dir) == 0
+    assert len(store) == 8
+
+
+def test_store_query(session, store):
+    store.append_session(session)
+    start, end = Timestamp("2020-12-06", tz="UTC"), Timestamp("2020-12-16", tz="UTC")
+
+    loaded = store.load(start=start, end=end, columns=["hr", "unknown"])
+    assert list(loaded.columns) == ["hr"]
+    assert loaded.session.count() == 3
+    assert all(start <= key <= end for key in loaded.index.unique(level="start"))
+
+    activities = list(store.iter_activities(start=start, columns=["alt"]))
+    assert [activity.start for activity in activities] == store.starts[2:]
+
+    assert store.load(start=Timestamp("2021-01-01", tz="UTC")) is None
+
+
+def test_store_summarize(session, store):
+    session = session.session.only_moving()
+    store.append_session(session)
+    assert_frame_equal(store.summarize(), session.session.summarize())
+
+    start = store.starts[-1]
+    assert list(store.summarize(start=start).index) == [start]
+
+
+def test_store_append_dir_scans_first(sessions_dir, store, monkeypatch):
+    store.append_dir(sessions_dir, end=Timestamp("2020-12-10", tz="UTC"))
+    assert len(store) == 4
+
+    read = []
+    read_file = reader._read_file
+    monkeypatch.setattr(
+        reader,
+        "_read_file",
+        lambda filename, **kwargs: read.append(filename)
+        or read_file(filename, **kwargs),
+    )
+    # the activities already in the store are not parsed again
+    assert store.append_dir(sessions_dir) == 4
+    assert len(read) == 4
+    assert store.append_dir(sessions_dir) == 0
+    assert len(read) == 4
+
+
+def test_store_summarize_empty(session, store):
+    expected = session.session.summarize().iloc[:0]
+    assert_frame_equal(
+        store.summarize(), expected, check_dtype=False, check_index_type=False
+    )
+
+    store.append_session(session)
+    summary = store.summarize(start=Timestamp("2021-01-01", tz="UTC"))
+    assert summary.empty
+    assert list(summary.columns) == list(expected.columns)
+    assert summary.index.name == "start"
+
+
+def test_store_summarize_batches(session, store, monkeypatch):
+    session = session.session.only_moving()
+    store.append_session(session)
+    # an activity without the heart rate is summarized in its own batch
+    activity = store.load(end=store.starts[0]).xs(store.starts[0], level=0)
+    activity.start = store.starts[0]
+    store.append(activity.drop(columns=["hr"]), overwrite=True)
+
+    monkeypatch.setattr(_store, "SUMMARY_BATCH_SIZE", 3)
+    expected = concat(
+        [
+            summary._build_session_statistics(activity)
+            for activity in store.iter_activities(columns=summary.SUMMARY_COLUMNS)
+        ]
+    )
+    assert_frame_equal(store.summarize(), expected)
+    assert expected["mean_heart_rate"].isna().sum() == 1
+
+
+def test_store_query_naive_bounds(session, store):
+    store.append_session(session)
+    # the plain strings are compared with the UTC starts, assumed in UTC
+    activities = list(store.iter_activities(start="2020-12-06", end="2020-12-16"))
+    assert [activity.start for activity in activities] == store.starts[2:5]
+    assert list(store.summarize(start="2020-12-20").index) == store.starts[6:]
+    assert store.load(end="2000-01-01") is None
@@ -4,15 +4,21 @@ Test module for Strava API reader base module
 
 import os
 import json
+import re
+import threading
 import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
 import pytest
 from pandas import DataFrame, Timedelta, Timestamp
-from runpandas import read_strava
+from runpandas import read_strava, read_strava_many
 from runpandas import types
 from runpandas import StravaClient
+from runpandas.io.strava import RateLimiter
+from runpandas.io.strava import _parser as strava_parser
 from stravalib.protocol import ApiV3
 from stravalib.client import Client
 from stravalib.model import Stream
+from stravalib.exc import ObjectNotFound
 
 pytestmark = pytest.mark.stable
 
@@ -236,3 +242,161 @@ def test_strava_values(activity, column, index, expected):
 
     if isinstance(activity, types.Activity):
         assert activity.start == Timestamp("2020-12-06 06:36:27")
+
+
+class StravaAPIHandler(BaseHTTPRequestHandler):
+    """
+    Local Strava API serving the sample activity (started one day later for
+    each id) and its streams, or 404 for the ids in `server.missing`.
+    """
+
+    def do_GET(self):
+        self.server.requests.append(self.path)
+        match = re.match(r"/api/v3/activities/(\d+)(/streams/)?", self.path)
+        activity_id = int(match.group(1))
+        if activity_id in self.server.missing:
+            body = {"message": "Record Not Found", "errors": []}
+            self.send_response(404)
+        elif match.group(2):
+            body = [dict(value, type=key) for key, value in self.server.streams.items()]
+            self.send_response(200)
+        else:
+            start = Timestamp("2020-12-06T06:36:27") + Timedelta(days=activity_id)
+            body = dict(
+                self.server.activity,
+                id=activity_id,
+                start_date_local=start.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            )
+            self.send_response(200)
+        self.send_header("Content-type", "application/json")
+        self.end_headers()
+        self.wfile.write(json.dumps(body).encode("utf-8"))
+
+    def log_message(self, *args):
+        return
+
+
+@pytest.fixture
+def strava_server(dirpath):
+    server = HTTPServer(("127.0.0.1", 0), StravaAPIHandler)
+    with open(os.path.join(dirpath, "strava", "activity.json")) as json_file:
+        server.activity = json.load(json_file)
+    with open(os.path.join(dirpath, "strava", "streams.json")) as json_file:
+        server.streams = json.load(json_file)
+    server.requests = []
+    server.missing = set()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def strava_server_client(strava_client, valid_token_file, strava_server):
+    return StravaClient(
+        client_id="STRAVA_ID",
+        client_secret="STRAVA_CLIENT_SECRET",
+        token_file=valid_token_file,
+        api_url="http://127.0.0.1:%d/api/v3" % strava_server.server_port,
+    )
+
+
+def test_read_strava_many(strava_server, strava_server_client, tmp_path):
+    cache_dir = tmp_path / "strava"
+    session = read_strava_many(
+        [1, 2, 3], client=strava_server_client, concurrency=2, cache_dir=cache_dir
+    )
+    assert session.session.count() == 3
+    assert len(strava_server.requests) == 6
+    assert list(session.index.unique(level="start")) == [
+        Timestamp("2020-12-07 06:36:27"),
+        Timestamp("2020-12-08 06:36:27"),
+        Timestamp("2020-12-09 06:36:27"),
+    ]
+    activity = session.xs(Timestamp("2020-12-07 06:36:27"), level=0)
+    assert activity.size == 15723
+    assert activity["hr"].iloc[-1] == 160
+    assert sorted(os.listdir(cache_dir)) == ["1.json", "2.json", "3.json"]
+
+    # the cached activities are not downloaded again
+    cached = read_strava_many(
+        [1, 2, 3, 4], client=strava_server_client, cache_dir=cache_dir
+    )
+    assert len(strava_server.requests) == 8
+    assert cached.session.count() == 4
+    assert cached.xs(Timestamp("2020-12-07 06:36:27"), level=0).equals(activity)
+
+
+def test_read_strava_many_cached(strava_server, strava_server_client, tmp_path, mocker):
+    cache_dir = tmp_path / "strava"
+    session = read_strava_many([1, 2], client=strava_server_client, cache_dir=cache_dir)
+
+    # no client is built nor refreshed when all the activities are cached
+    client = mocker.patch.object(strava_parser, "StravaClient")
+    refresh = mocker.spy(strava_server_client, "refresh")
+    cached = read_strava_many([1, 2], cache_dir=cache_dir)
+    assert client.call_count == 0
+    assert cached.equals(session)
+    read_strava_many([1, 2], client=strava_server_client, cache_dir=cache_dir)
+    assert refresh.call_count == 0
+    assert len(strava_server.requests) == 4
+
+
+def test_read_strava_cache_dir(strava_server, strava_server_client, tmp_path):
+    cache_dir = tmp_path / "strava"
+    activity = read_strava(1, client=strava_server_client, cache_dir=cache_dir)
+    assert len(strava_server.requests) == 2
+    assert os.listdir(cache_dir) == ["1.json"]
+
+    # served from the disk, no client is needed
+    cached = read_strava(1, cache_dir=cache_dir)
+    assert len(strava_server.requests) == 2
+    assert cached.equals(activity)
+    assert cached.start == activity.start
+    assert read_strava(1, cache_dir=cache_dir, to_df=True).equals(
+        read_strava(1, client=strava_server_client, to_df=True)
+    )
+
+    strava_server.requests.clear()
+    read_strava(1, client=strava_server_client, cache_dir=cache_dir, refresh=True)
+    read_strava_many(
+        [1, 2], client=strava_server_client, cache_dir=cache_dir, refresh=True
+    )
+    assert len(strava_server.requests) == 6
+
+
+def test_read_strava_many_errors(strava_server, strava_server_client, tmp_path):
+    strava_server.missing.add(2)
+    with pytest.raises(ObjectNotFound):
+        read_strava_many([1, 2], client=strava_server_client, concurrency=1)
+
+    cache_dir = tmp_path / "strava"
+    with pytest.warns(UserWarning, match="1 activities could not be downloaded"):
+        session = read_strava_many(
+            [1, 2, 3], client=strava_server_client, cache_dir=cache_dir, errors="skip"
+        )
+    assert session.session.count() == 2
+    assert sorted(os.listdir(cache_dir)) == ["1.json", "3.json"]
+
+
+def test_rate_limiter():
+    now = [0.0]
+
+    def sleep(seconds):
+        now[0] += seconds
+
+    limiter = RateLimiter(limits=[(2, 10), (3, 100)], clock=lambda: now[0], sleep=sleep)
+    limiter.acquire()
+    limiter.acquire()
+    assert now[0] == 0.0
+    # the short bucket is empty, one token is refilled after 5 seconds
+    limiter.acquire()
+    assert now[0] == pytest.approx(5.0)
+    # the long bucket has 0.15 tokens left, refilled at 3 / 100 tokens per second
+    limiter.acquire()
+    assert now[0] == pytest.approx(5.0 + (1 - 0.15) * 100 / 3)
+
+    # more tokens than a bucket can hold are never available
+    with pytest.raises(ValueError):
+        limiter.acquire(3)
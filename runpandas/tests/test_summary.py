@@ -6,8 +6,10 @@ import pytest
 import numpy as np
 from pandas import Timedelta, Series, concat, isna
 from runpandas import reader, read_dir
+from runpandas.types import summary
+from runpandas._utils import convert_pace_secmeters2minkms
 from runpandas.io.result._parser import read as read_result
-from pandas.testing import assert_series_equal
+from pandas.testing import assert_frame_equal, assert_series_equal
 
 
 pytestmark = pytest.mark.stable
@@ -160,6 +162,39 @@ def test_activity_full_summary(dirpath):
     assert_series_equal(result, expected)
 
 
+def test_summary_statistics_single_pass(dirpath, mocker):
+    fit_file = os.path.join(dirpath, "fit", "run.fit")
+    activity = reader._read_file(fit_file, to_df=False).only_moving()
+    expected = {
+        "moving_time": activity.moving_time,
+        "mean_speed": activity.mean_speed(),
+        "mean_moving_speed": activity.mean_speed(only_moving=True),
+        "mean_cadence": activity.mean_cadence(),
+        "mean_moving_heart_rate": activity.mean_heart_rate(only_moving=True),
+        "total_distance": activity.distance,
+        "ellapsed_time": activity.ellapsed_time,
+    }
+
+    mean_speed = mocker.spy(type(activity), "mean_speed")
+    stats = summary._build_summary_statistics(activity)
+    assert mean_speed.call_count == 0
+    for key, value in expected.items():
+        assert stats[key] == pytest.approx(value)
+    assert stats["max_speed"] == activity["speed"].max()
+    assert stats["max_pace"] == convert_pace_secmeters2minkms(
+        activity["speed"].to_pace().min().total_seconds()
+    )
+
+    # records with the same time
+    activity = activity.iloc[[0, 1, 1, 2, 3]]
+    stats = summary._build_summary_statistics(activity)
+    seconds = np.diff(activity.index.total_seconds(), prepend=0)
+    assert stats["mean_moving_speed"] == pytest.approx(
+        (activity["speed"] * seconds)[activity["moving"].values].sum()
+        / stats["moving_time"].total_seconds()
+    )
+
+
 def test_summary_session(multi_frame, simple_activity):
     multi_frame = multi_frame.session.only_moving()
     summary_frame = multi_frame.session.summarize()
@@ -200,6 +235,69 @@ def test_summary_session(multi_frame, simple_activity):
     assert isna(summary_session_activity.loc["mean_temperature"])
 
 
+def test_summary_session_cache(multi_frame, mocker):
+    summary.clear_session_statistics_cache()
+    multi_frame = multi_frame.session.only_moving()
+    starts = multi_frame.index.unique(level="start")
+    expected = multi_frame.session.summarize(cache=False)
+
+    build = mocker.spy(summary, "_summary_arrays")
+
+    def summarized():
+        # the number of activities summarized
+        count = sum(len(call.args[2]) for call in build.call_args_list)
+        build.reset_mock()
+        return count
+
+    partial_frame = multi_frame.drop(starts[-1], level=0)
+    partial_frame.session.summarize()
+    assert summarized() == len(starts) - 1
+
+    # only the new activity is summarized
+    assert_frame_equal(multi_frame.session.summarize(), expected)
+    assert summarized() == 1
+
+    # the changed activity is summarized again
+    changed_frame = multi_frame.copy()
+    changed_frame.loc[starts[0], "hr"] = 100
+    summary_frame = changed_frame.session.summarize()
+    assert summarized() == 1
+    assert summary_frame.loc[starts[0], "mean_heart_rate"] == 100
+
+    assert_frame_equal(multi_frame.session.summarize(cache=False), expected)
+    assert summarized() == len(starts)
+    summary.clear_session_statistics_cache()
+
+
+def test_summary_session_grouped(multi_frame):
+    multi_frame = multi_frame.session.only_moving()
+    summary_frame = multi_frame.session.summarize(cache=False)
+    # the statistics of each activity computed with its own metrics
+    for start in multi_frame.index.unique(level="start"):
+        activity = multi_frame.xs(start, level=0)
+        stats = summary_frame.loc[start]
+        assert stats["moving_time"] == activity.moving_time
+        assert stats["ellapsed_time"] == activity.ellapsed_time
+        assert stats["total_distance"] == pytest.approx(activity.distance)
+        assert stats["mean_speed"] == pytest.approx(activity.mean_speed())
+        assert stats["mean_moving_speed"] == pytest.approx(
+            activity.mean_speed(only_moving=True)
+        )
+        assert stats["max_speed"] == activity["speed"].max()
+        assert stats["max_pace"] == convert_pace_secmeters2minkms(
+            activity["speed"].to_pace().min().total_seconds()
+        )
+        assert stats["mean_heart_rate"] == pytest.approx(activity.mean_heart_rate())
+        assert stats["mean_moving_heart_rate"] == pytest.approx(
+            activity.mean_heart_rate(only_moving=True)
+        )
+        assert stats["max_heart_rate"] == activity["hr"].max()
+
+    # the records of the activities are not next to each other
+    shuffled = multi_frame.sort_index(level="time", sort_remaining=False)
+    assert_frame_equal(shuffled.session.summarize(cache=False), summary_frame)
+
+
 def test_race_full_summary(dirpath):
     race_result = os.path.join(dirpath, "results", "valid_result_br.csv")
     race = read_result(race_result, to_df=False)
@@ -5,7 +5,11 @@ Test module for TCX reader base module
 import os
 import pytest
 from pandas import DataFrame, Timedelta, Timestamp
+from pandas.testing import assert_frame_equal
 from runpandas import reader
+from runpandas import _utils as utils
+from runpandas.io.tcx import _parser as tcx_parser
+from runpandas.exceptions import InvalidFileError
 from runpandas import types
 
 pytestmark = pytest.mark.stable
@@ -81,3 +85,54 @@ def test_read_file_tcx_basic_activity(dirpath):
     included_data = set(["lat", "lon", "alt", "dist", "hr"])
     assert included_data <= set(activity.columns.to_list())
     assert activity.size == 1915
+
+
+@pytest.mark.parametrize("to_df", [True, False])
+def test_read_file_tcx_fast_engine(dirpath, to_df):
+    tcx_file = os.path.join(dirpath, "tcx", "run_garmin.tcx")
+    expected = reader._read_file(tcx_file, to_df=to_df)
+    activity = reader._read_file(tcx_file, to_df=to_df, engine="fast")
+    assert_frame_equal(activity, expected)
+    if not to_df:
+        assert activity.start == expected.start
+
+
+def test_read_file_tcx_invalid_engine(dirpath):
+    tcx_file = os.path.join(dirpath, "tcx", "basic.tcx")
+    with pytest.raises(ValueError):
+        reader._read_file(tcx_file, engine="invalid")
+
+
+def test_read_file_tcx_fast_engine_malformed(dirpath):
+    tcx_file = os.path.join(dirpath, "tcx", "malformed.tcx")
+    with pytest.raises(InvalidFileError):
+        reader._read_file(tcx_file, engine="fast")
+
+
+def test_gen_records_tcx_columns(dirpath, mocker):
+    tcx_file = os.path.join(dirpath, "tcx", "run_garmin.tcx")
+    extract = mocker.spy(utils, "recursive_text_extract")
+    selected = utils.column_selector(["hr"], tcx_parser.COLUMNS_SCHEMA, keep=("time",))
+    records = list(tcx_parser.gen_records(tcx_file, selected))
+    # the unselected fields are skipped while extracting the trackpoints
+    assert extract.call_count == 0
+    assert {name for record in records for name in record} == {
+        "Time",
+        "HeartRateBpm",
+    }
+
+
+@pytest.mark.parametrize("engine", ["default", "fast"])
+def test_read_file_tcx_columns(dirpath, engine):
+    tcx_file = os.path.join(dirpath, "tcx", "run_garmin.tcx")
+    expected = reader._read_file(tcx_file)
+    activity = reader._read_file(tcx_file, engine=engine, columns=["hr", "speed"])
+    assert list(activity.columns) == ["hr", "speed"]
+    assert isinstance(activity["hr"], types.columns.HeartRate)
+    assert_frame_equal(activity, expected[["hr", "speed"]])
+
+    frame = reader._read_file(
+        tcx_file, to_df=True, engine=engine, columns=["heart_rate_bpm"]
+    )
+    assert list(frame.columns) == ["heart_rate_bpm"]
+    assert_frame_equal(frame.index.to_frame(), expected.index.to_frame())
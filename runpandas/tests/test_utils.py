@@ -2,6 +2,7 @@
 Tests for utils module
 """
 import os
+import numpy as np
 import pytest
 from pandas import Timedelta
 from runpandas import _utils as utils
@@ -60,3 +61,54 @@ def test_convert_pace_secmeters2minkms():
     assert utils.convert_pace_secmeters2minkms(
         Timedelta("0 days 00:00:00.407078").total_seconds()
     ) == Timedelta("0 days 00:06:47")
+
+
+def test_haversine_distance():
+    # Lyon -> Paris, reference value from the haversine package
+    assert utils.haversine_distance(45.7597, 4.8422, 48.8567, 2.3508) == pytest.approx(
+        392217.2595594006
+    )
+    distances = utils.haversine_distance(
+        np.array([45.7597, 0.0]),
+        np.array([4.8422, 0.0]),
+        np.array([48.8567, 0.0]),
+        np.array([2.3508, 0.0]),
+    )
+    assert distances[0] == pytest.approx(392217.2595594006)
+    assert distances[1] == 0.0
+
+
+def _inverse(value):
+    return 1 / value
+
+
+@pytest.mark.parametrize("workers", [None, 2])
+def test_pool_map(workers):
+    results = list(utils.pool_map(_inverse, [1, 0, 4], workers, executor="thread"))
+    assert [(item, result) for item, result, _ in results] == [
+        (1, 1.0),
+        (0, None),
+        (4, 0.25),
+    ]
+    assert results[0][2] is None
+    assert isinstance(results[1][2], ZeroDivisionError)
+
+
+def test_pool_map_window():
+    consumed = []
+
+    def items():
+        for item in range(1, 100):
+            consumed.append(item)
+            yield item
+
+    results = utils.pool_map(_inverse, items(), workers=2, executor="thread")
+    assert next(results) == (1, 1.0, None)
+    # the first window of 4 calls, and the one submitted when 1 was yielded
+    assert len(consumed) == 5
+    assert [item for item, _, _ in results] == list(range(2, 100))
+
+
+def test_pool_map_invalid_executor():
+    with pytest.raises(ValueError, match="executor must be one of"):
+        next(utils.pool_map(_inverse, [1], workers=2, executor="gpu"))
@@ -4,7 +4,13 @@ Test module for utilities from the datasets package
 
 import os
 import shutil
+import threading
+from functools import partial
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.error import HTTPError
 import pytest
+from thefuzz import fuzz
+from runpandas.datasets import utils
 from runpandas.datasets.utils import (
     _get_config_data,
     _get_cache_path,
@@ -102,6 +108,138 @@ def test_activity_examples(dirpath):
     shutil.rmtree(directory)
 
 
+INDEX = b"""
+- summary: Polar M400 sample
+  path: polarm400.tcx
+  file_type: TCX
+  recording_device: Polar M400
+  included_data: [latitude, longitude, heartrate]
+- summary: Garmin Fenix 6S sample
+  path: Garmin_Fenix_6S_Pro-Running.fit
+  file_type: FIT
+  recording_device: Garmin Fenix 6S Pro
+  included_data: [latitude, longitude]
+"""
+
+
+class IndexHandler(BaseHTTPRequestHandler):
+    """Local index server with ETag revalidation."""
+
+    def do_GET(self):
+        self.server.requests.append(self.headers.get("If-None-Match"))
+        if self.server.status is not None:
+            self.send_response(self.server.status)
+            self.end_headers()
+            return
+        if self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("ETag", '"v1"')
+        self.end_headers()
+        self.wfile.write(INDEX)
+
+    def log_message(self, *args):
+        return
+
+
+@pytest.fixture
+def index_server():
+    server = HTTPServer(("127.0.0.1", 0), IndexHandler)
+    server.requests = []
+    server.status = None
+    server.url = "http://127.0.0.1:%d/index.yml" % server.server_port
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    utils._INDEX_MEMO.clear()
+    yield server
+    utils._INDEX_MEMO.clear()
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def index_config(tmp_path):
+    config_file = tmp_path / "config.yaml"
+    config_file.write_text("path:\n  root: %s\n" % (tmp_path / "data"))
+    return str(config_file)
+
+
+def test_get_activity_index_cached(index_server, index_config, mocker):
+    index = _get_activity_index(index_server.url, config=index_config)
+    assert [item.file_type for item in index] == [FileTypeEnum.TCX, FileTypeEnum.FIT]
+    assert index_server.requests == [None]
+
+    # served by the parsed index of the process
+    assert _get_activity_index(index_server.url, config=index_config) == index
+    # served by the local copy while it is fresh
+    utils._INDEX_MEMO.clear()
+    assert _get_activity_index(index_server.url, config=index_config) == index
+    assert len(index_server.requests) == 1
+
+    # revalidated when expired, without downloading it again
+    utils._INDEX_MEMO.clear()
+    mocker.patch.object(utils, "INDEX_TTL", 0)
+    assert _get_activity_index(index_server.url, config=index_config) == index
+    assert index_server.requests == [None, '"v1"']
+
+
+def test_get_activity_index_offline(index_server, index_config, monkeypatch):
+    with pytest.raises(IOError):
+        _get_activity_index(index_server.url, config=index_config, offline=True)
+
+    index = _get_activity_index(index_server.url, config=index_config)
+    utils._INDEX_MEMO.clear()
+    monkeypatch.setenv(utils.OFFLINE_ENV, "1")
+    assert _get_activity_index(index_server.url, config=index_config) == index
+    assert len(index_server.requests) == 1
+
+    # the local copy is used if the server is not available
+    utils._INDEX_MEMO.clear()
+    monkeypatch.delenv(utils.OFFLINE_ENV)
+    monkeypatch.setattr(utils, "INDEX_TTL", 0)
+    url = index_server.url
+    index_server.shutdown()
+    index_server.server_close()
+    with pytest.warns(UserWarning):
+        assert _get_activity_index(url, config=index_config) == index
+
+
+def test_get_activity_index_server_error(index_server, index_config, monkeypatch):
+    index_server.status = 500
+    with pytest.raises(HTTPError):
+        _get_activity_index(index_server.url, config=index_config)
+
+    index_server.status = None
+    index = _get_activity_index(index_server.url, config=index_config)
+
+    # the local copy is used while the server is failing
+    utils._INDEX_MEMO.clear()
+    monkeypatch.setattr(utils, "INDEX_TTL", 0)
+    index_server.status = 503
+    with pytest.warns(UserWarning, match="using its local copy"):
+        assert _get_activity_index(index_server.url, config=index_config) == index
+
+
+def test_activity_examples_index(index_server, index_config, monkeypatch):
+    monkeypatch.setattr(
+        utils, "_get_activity_index", partial(_get_activity_index, index_server.url)
+    )
+    tcx_examples = list(
+        activity_examples(file_type=FileTypeEnum.TCX, config=index_config)
+    )
+    assert [os.path.basename(item.path) for item in tcx_examples] == ["polarm400.tcx"]
+    assert len(index_server.requests) == 1
+
+    with pytest.raises(IOError):
+        activity_examples(path="polarm400.tcx", config=index_config, offline=True)
+    # the index entries are not changed by the downloads
+    assert utils._INDEX_MEMO[(index_server.url, ActivityData)][1][0].path == (
+        tcx_examples[0].path
+    )
+
+
 def test_get_get_event_index():
     index = _get_event_index()
     assert len(index) > 0
@@ -115,6 +253,37 @@ def test_load_race_data():
     assert type(result_set[0].load()) is RaceResult
 
 
+def test_load_race_data_cache(datapath, tmp_path, mocker):
+    pytest.importorskip("pyarrow")
+    from runpandas.io import result
+
+    result_file = tmp_path / "lochness_marathon_2003.csv"
+    shutil.copy(
+        datapath("io", "data", "results", "lochness_marathon", result_file.name),
+        result_file,
+    )
+    edition = EventData(
+        summary="Lochness Marathon",
+        path=result_file,
+        run_type="marathon",
+        country="UK",
+        included_data=["position", "bib", "nettime"],
+        edition="2003",
+    )
+    read = mocker.spy(result, "read")
+    race = edition.load()
+    cached = edition.load()
+    # the second load is served by the parsed copy
+    assert read.call_count == 1
+    assert type(cached) is RaceResult
+    assert cached.equals(race)
+    assert cached.event.event_name == race.event.event_name
+    assert os.listdir(tmp_path / "parsed")
+
+    edition.load(cache=False)
+    assert read.call_count == 2
+
+
 def test_get_events(dirpath):
     # test match events
     race_events = get_events(identifier="lochness_marathon")
@@ -334,3 +503,97 @@ def test_get_events(dirpath):
 
     directory = _get_cache_path(test_config_file)
     shutil.rmtree(directory)
+
+
+def test_event_search_index():
+    summaries = [
+        "Lochness Marathon",
+        "Lochnes Marathn",
+        "Berlin Marathon",
+        "Berlin Half Marathon",
+        "São Paulo 10km Night Run",
+        "Chicago Marathon International",
+        None,
+    ]
+    events = [
+        RaceData(
+            summary=summary,
+            path="race_%d" % i,
+            run_type="marathon",
+            country="UK",
+            included_data=["position"],
+        )
+        for i, summary in enumerate(summaries)
+    ]
+    search_index = utils._EventSearchIndex(events)
+    for identifier in [
+        "lochness marathon",
+        "Lochness",
+        "lochnes marathn",
+        "berlin",
+        "Marathon",
+        "sao paulo night run",
+        "chicago international marathon",
+        "boston marathon",
+        "abc",
+        "",
+    ]:
+        expected = [
+            event
+            for event in events
+            if event.summary is not None
+            and fuzz.token_set_ratio(identifier.casefold(), event.summary.casefold())
+            > 90
+        ]
+        assert search_index.search(identifier) == expected
+
+    # no common tokens, but close enough
+    assert search_index.search("lochnes marathn") == events[:2]
+    assert utils._event_search_index(events) is utils._event_search_index(events)
+    assert search_index.indexes(events)
+    assert not search_index.indexes(events[:-1])
+
+
+def test_get_events_downloads(tmp_path, index_config, monkeypatch):
+    event = RaceData(
+        summary="Lochness Marathon",
+        path="lochness_marathon",
+        run_type="marathon",
+        country="UK",
+        included_data=["position"],
+        editions=["2019", "2021", "2022"],
+    )
+    monkeypatch.setattr(utils, "_get_event_index", lambda **kwargs: [event])
+    downloads = []
+
+    def urlretrieve(url, file_path):
+        downloads.append(url)
+        with open(file_path, "w") as csv_file:
+            csv_file.write("position,bib\n1,1\n")
+
+    monkeypatch.setattr(utils, "urlretrieve", urlretrieve)
+
+    # only the requested edition is downloaded
+    race_events = get_events("lochness marathon", year=2021, config=index_config)
+    assert [item.edition for item in race_events] == ["2021"]
+    assert [os.path.basename(url) for url in downloads] == [
+        "lochness_marathon_2021.csv"
+    ]
+
+    race_events = get_events("lochness", config=index_config, workers=2)
+    assert [item.edition for item in race_events] == ["2019", "2021", "2022"]
+    assert len(downloads) == 3
+    assert sorted(os.listdir(os.path.dirname(race_events[0].path))) == [
+        os.path.basename(item.path) for item in race_events
+    ]
+
+    # no partial file is kept
+    def failed_urlretrieve(url, file_path):
+        open(file_path, "w").close()
+        raise IOError("connection reset")
+
+    monkeypatch.setattr(utils, "urlretrieve", failed_urlretrieve)
+    shutil.rmtree(os.path.dirname(race_events[0].path))
+    with pytest.raises(IOError):
+        get_events("lochness", config=index_config)
+    assert not os.listdir(os.path.dirname(race_events[0].path))
@@ -5,6 +5,7 @@ Tests for XML tools in utils module
 import pytest
 import io
 from runpandas import _utils as utils
+from runpandas.exceptions import InvalidFileError
 
 pytestmark = pytest.mark.stable
 
@@ -83,3 +84,31 @@ def test_gen_nodes():
     assert t1["Time"] == "2020-06-28T09:39:24Z"
     assert t2["Time"] == "2020-06-28T09:39:33Z"
     assert t1["HeartRateBpm"] == "62" and t2["HeartRateBpm"] == "60"
+
+
+@pytest.mark.parametrize("with_lxml", [True, False])
+def test_get_columns(with_lxml, monkeypatch):
+    if not with_lxml:
+        monkeypatch.setattr(utils, "lxml_iterparse", None)
+    elif utils.lxml_iterparse is None:
+        pytest.skip("lxml is not installed")
+    faketcx = io.BytesIO(data.encode("utf-8"))
+
+    columns = utils.get_columns(faketcx, "Trackpoint", "TrainingCenterDatabase")
+
+    assert len(columns) == 7
+    assert columns["Speed"] == ["0.000000", "0.000000"]
+    assert columns["Time"] == ["2020-06-28T09:39:24Z", "2020-06-28T09:39:33Z"]
+    assert columns["HeartRateBpm"] == ["62", "60"]
+
+
+@pytest.mark.parametrize("with_lxml", [True, False])
+def test_get_columns_invalid_root(with_lxml, monkeypatch):
+    if not with_lxml:
+        monkeypatch.setattr(utils, "lxml_iterparse", None)
+    elif utils.lxml_iterparse is None:
+        pytest.skip("lxml is not installed")
+    faketcx = io.BytesIO(data.encode("utf-8"))
+
+    with pytest.raises(InvalidFileError):
+        utils.get_columns(faketcx, "Trackpoint", "gpx")
@@ -4,10 +4,8 @@ This is a module for extending pandas dataframes with the runpandas toolbox
 
 import pandas as pd
 import numpy as np
-from haversine import haversine as hv
-from haversine import Unit
 from runpandas import exceptions
-from runpandas._utils import special_column
+from runpandas._utils import special_column, haversine_distance
 from runpandas.types import Activity
 from runpandas.types import columns
 
@@ -42,17 +40,12 @@ class MetricsAcessor(object):
         if col_alt not in self._activity.columns:
             raise exceptions.RequiredColumnError(col_alt)
 
-        self._activity["shift_alt"] = self._activity[col_alt].shift(1)
-        self._activity["alt_dif"] = self._activity.apply(
-            lambda x: x["shift_alt"] - x[col_alt], axis=1
-        )
-        self._activity["distance_haversine"] = distance_series
-        distance_corrected = self._activity.apply(
-            lambda x: np.sqrt(x["distance_haversine"] ** 2 + (x["alt_dif"]) ** 2),
-            axis=1,
-        )
-        self._activity.drop(
-            ["shift_alt", "alt_dif", "distance_haversine"], axis=1, inplace=True
+        alt = self._activity[col_alt].to_numpy(dtype="float64")
+        alt_dif = np.full(len(alt), np.nan)
+        alt_dif[1:] = alt[:-1] - alt[1:]
+        distance = np.asarray(distance_series, dtype="float64")
+        distance_corrected = pd.Series(
+            np.sqrt(distance**2 + alt_dif**2), index=self._activity.index
         )
 
         return distance_corrected
@@ -72,7 +65,7 @@ class MetricsAcessor(object):
             distance cummulative column (`runpandas.types.columns.DistancePerPosition`).
             Default is True.
 
-        **kwargs: Keyword args to be passed to the `haversine` method
+        **kwargs: Accepted for compatibility and ignored.
 
         Returns
         -------
@@ -81,18 +74,11 @@ class MetricsAcessor(object):
             with the same index of the accessed activity object.
 
         """
-        self._activity["point"] = self._activity.apply(
-            lambda x: (x["lat"], x["lon"]), axis=1
-        )
-        self._activity["point_next"] = self._activity["point"].shift(1)
-        self._activity.loc[self._activity["point_next"].isna(), "point_next"] = None
-        haversine_dist = self._activity.apply(
-            lambda x: hv(x["point"], x["point_next"], unit=Unit.METERS)
-            if x["point_next"] is not None
-            else float("nan"),
-            axis=1,
-        )
-        self._activity.drop(["point_next", "point"], axis=1, inplace=True)
+        lat = self._activity["lat"].to_numpy(dtype="float64")
+        lon = self._activity["lon"].to_numpy(dtype="float64")
+        distances = np.full(len(lat), np.nan)
+        distances[1:] = haversine_distance(lat[1:], lon[1:], lat[:-1], lon[:-1])
+        haversine_dist = pd.Series(distances, index=self._activity.index)
 
         if correct_distance:
             haversine_dist = self.__correct_distance(haversine_dist)
@@ -2,7 +2,10 @@
 This is a module for extending pandas activities with session aggregation methods
 """
 
+import numpy as np
 import pandas as pd
+from runpandas import exceptions
+from runpandas._utils import haversine_distance
 from runpandas.types import Activity
 from runpandas.types import summary
 
@@ -39,16 +42,44 @@ class _SessionAcessor(object):
                      (DateTimeIndex, TimedeltaIndex) format."
             )
 
-    def summarize(self):
+    def _require_columns(self, *required_columns):
+        for column in required_columns:
+            if column not in self._session.columns:
+                raise exceptions.RequiredColumnError(column)
+
+    def _grouped(self, column):
+        """Returns the column grouped by activity, so diffs, shifts and
+        cumulative sums are reset at the start of each activity."""
+        return (
+            self._session[column].astype("float64").groupby(level="start", sort=False)
+        )
+
+    def _time_diff(self):
+        """Returns the seconds between the records of each activity (the
+        first record of an activity gets its own elapsed time)."""
+        time = pd.Series(
+            self._session.index.get_level_values("time"), index=self._session.index
+        )
+        time_diff = time.groupby(level="start", sort=False).diff().fillna(time)
+        return time_diff / np.timedelta64(1, "s")
+
+    def summarize(self, cache=True):
         """
         Summarize the session of activities by returning a Dataframe
         of the aggregated main statistics.
 
+        Parameters
+        ----------
+        cache: bool, optional
+            Reuse the memoized statistics of the activities already summarized,
+            keyed by the activity start and a fingerprint of its content.
+            Default is True.
+
         Returns
         -------
         pandas.Dataframe: A Dataframe with the summarized statistics for the all the session.
         """
-        return summary.session_summary(self._session)
+        return summary.session_summary(self._session, cache=cache)
 
     def count(self):
         """
@@ -72,11 +103,12 @@ class _SessionAcessor(object):
             It computes the distance corrected by the altitude. default is False.
 
         to_special_column: bool, optional
-            It converts the distance calculated (`pandas.Series`) to special runpandas
-            distance cummulative column (`runpandas.types.columns.DistancePerPosition`).
-            Default is True.
+            Accepted for compatibility with the activity accessor and ignored,
+            the new columns are always the special runpandas distance columns
+            (`runpandas.types.columns.Distance` and
+            `runpandas.types.columns.DistancePerPosition`). Default is True.
 
-        **kwargs: Keyword args to be passed to the `haversine` method
+        **kwargs: Accepted for compatibility and ignored.
 
         Returns
         -------
@@ -88,19 +120,25 @@ class _SessionAcessor(object):
             runpandas.acessors.metrics.distance
 
         """
-        for index in self._session.index.unique(level="start"):
-            distpos = self._session.xs(index, level=0).compute.distance(
-                correct_distance=correct_distance,
-                to_special_column=to_special_column,
-                **kwargs,
-            )
-            self._session.loc[
-                pd.IndexSlice[index, distpos.index.tolist()], "distpos"
-            ] = distpos.values
-            dist = distpos.to_distance()
-            self._session.loc[
-                pd.IndexSlice[index, dist.index.tolist()], "dist"
-            ] = dist.values
+        self._require_columns("lat", "lon")
+        positions = self._session[["lat", "lon"]].astype("float64")
+        previous = positions.groupby(level="start", sort=False).shift()
+        distpos = pd.Series(
+            haversine_distance(
+                positions["lat"].values,
+                positions["lon"].values,
+                previous["lat"].values,
+                previous["lon"].values,
+            ),
+            index=self._session.index,
+        )
+        if correct_distance:
+            self._require_columns("alt")
+            alt_dif = self._grouped("alt").diff()
+            distpos = np.sqrt(distpos**2 + alt_dif**2)
+
+        self._session["distpos"] = distpos
+        self._session["dist"] = distpos.groupby(level="start", sort=False).cumsum()
         return self._session
 
     def speed(self, from_distances=False, to_special_column=True, **kwargs):
@@ -113,11 +151,11 @@ class _SessionAcessor(object):
             Should the speeds be calculated from the distance recordings
             instead of taken from the speed recordings directly? Default is False.
 
-        to_special_column: convert the distance calculated (`pandas.Series`)
-            to special runpandas speed column (`runpandas.types.columns.Speed`).
-            Default is True.
+        to_special_column: Accepted for compatibility with the activity accessor
+            and ignored, the new column is always the special runpandas speed
+            column (`runpandas.types.columns.Speed`). Default is True.
 
-        **kwargs: Keyword args to be passed to the speed building method
+        **kwargs: Accepted for compatibility and ignored.
 
         Returns
         -------
@@ -128,15 +166,11 @@ class _SessionAcessor(object):
             runpandas.acessors.metrics.speed
 
         """
-        for index in self._session.index.unique(level="start"):
-            speed = self._session.xs(index, level=0).compute.speed(
-                from_distances=from_distances,
-                to_special_column=to_special_column,
-                **kwargs,
-            )
-            self._session.loc[
-                pd.IndexSlice[index, speed.index.tolist()], "speed"
-            ] = speed.values
+        if from_distances:
+            self._require_columns("distpos")
+            self._session["speed"] = self._session["distpos"] / self._time_diff()
+        else:
+            self._require_columns("speed")
         return self._session
 
     def vertical_speed(self, to_special_column=True, **kwargs):
@@ -149,11 +183,11 @@ class _SessionAcessor(object):
             Should the speeds be calculated from the distance recordings
             instead of taken from the speed recordings directly? Default is False.
 
-        to_special_column: convert the distance calculated (`pandas.Series`)
-            to special runpandas speed column (`runpandas.types.columns.Speed`).
-            Default is True.
+        to_special_column: Accepted for compatibility with the activity accessor
+            and ignored, the new column is always the special runpandas VAM
+            column (`runpandas.types.columns.VAM`). Default is True.
 
-        **kwargs: Keyword args to be passed to the speed building method
+        **kwargs: Accepted for compatibility and ignored.
 
         Returns
         -------
@@ -165,13 +199,8 @@ class _SessionAcessor(object):
             runpandas.acessors.metrics.vertical_speed
 
         """
-        for index in self._session.index.unique(level="start"):
-            vam = self._session.xs(index, level=0).compute.vertical_speed(
-                to_special_column=to_special_column, **kwargs
-            )
-            self._session.loc[
-                pd.IndexSlice[index, vam.index.tolist()], "vam"
-            ] = vam.values
+        self._require_columns("alt")
+        self._session["vam"] = self._grouped("alt").diff() / self._time_diff()
         return self._session
 
     def gradient(self, to_special_column=True, **kwargs):
@@ -180,11 +209,11 @@ class _SessionAcessor(object):
 
         Parameters
         ----------
-        to_special_column: convert the distance calculated (`pandas.Series`)
-            to special runpandas Gradient column (`runpandas.types.columns.Gradient`).
-            Default is True.
+        to_special_column: Accepted for compatibility with the activity accessor
+            and ignored, the new column is always the special runpandas Gradient
+            column (`runpandas.types.columns.Gradient`). Default is True.
 
-        **kwargs: Keyword args to be passed to the Gradient build method
+        **kwargs: Accepted for compatibility and ignored.
 
         Returns
         -------
@@ -195,13 +224,10 @@ class _SessionAcessor(object):
             runpandas.acessors.metrics.gradient
 
         """
-        for index in self._session.index.unique(level="start"):
-            grad = self._session.xs(index, level=0).compute.gradient(
-                to_special_column=to_special_column, **kwargs
-            )
-            self._session.loc[
-                pd.IndexSlice[index, grad.index.tolist()], "grad"
-            ] = grad.values
+        self._require_columns("alt", "dist")
+        self._session["grad"] = (
+            self._grouped("alt").diff() / self._grouped("dist").diff()
+        )
         return self._session
 
     def pace(self, to_special_column=True, **kwargs):
@@ -211,11 +237,11 @@ class _SessionAcessor(object):
 
         Parameters
         ----------
-        to_special_column: convert the pace calculated (`pandas.Series`)
-            to special runpandas Pace column (`runpandas.types.columns.Pace`).
-            Default is True.
+        to_special_column: Accepted for compatibility with the activity accessor
+            and ignored, the new column is always the special runpandas Pace
+            column (`runpandas.types.columns.Pace`). Default is True.
 
-        **kwargs: Keyword args to be passed to the Pace build method
+        **kwargs: Accepted for compatibility and ignored.
 
         Returns
         -------
@@ -226,13 +252,8 @@ class _SessionAcessor(object):
             runpandas.acessors.metrics.pace
 
         """
-        for index in self._session.index.unique(level="start"):
-            pace = self._session.xs(index, level=0).compute.pace(
-                to_special_column=to_special_column, **kwargs
-            )
-            self._session.loc[
-                pd.IndexSlice[index, pace.index.tolist()], "pace"
-            ] = pace.values
+        self._require_columns("speed")
+        self._session["pace"] = pd.to_timedelta(1 / self._session["speed"], unit="s")
         return self._session
 
     def heart_zone(self, bins, labels, **kwargs):
@@ -249,7 +270,7 @@ class _SessionAcessor(object):
                 Must be the same length as the resulting zones.
                 Example of valid labels is ["Z1", "Z2", "Z3", "Z4", "Z5"].
 
-        **kwargs: Keyword args to be passed to the heart_zone build method
+        **kwargs: Accepted for compatibility and ignored.
 
         Returns
         -------
@@ -261,13 +282,8 @@ class _SessionAcessor(object):
             runpandas.acessors.metrics.heart_zone
 
         """
-        for index in self._session.index.unique(level="start"):
-            hr_zone = self._session.xs(index, level=0).compute.heart_zone(
-                bins=bins, labels=labels, **kwargs
-            )
-            self._session.loc[
-                pd.IndexSlice[index, hr_zone.index.tolist()], "hr_zone"
-            ] = hr_zone.values
+        self._require_columns("hr")
+        self._session["hr_zone"] = pd.cut(self._session["hr"], bins=bins, labels=labels)
         return self._session
 
     def only_moving(self, threshold=0.8):
@@ -291,11 +307,9 @@ class _SessionAcessor(object):
         --------
             runpandas.acessors.moving._InactivityAssessor
         """
-        for index in self._session.index.unique(level="start"):
-            moving_series = self._session.xs(index, level=0).only_moving(
-                threshold=threshold
-            )["moving"]
-            self._session.loc[
-                pd.IndexSlice[index, moving_series.index.tolist()], "moving"
-            ] = moving_series.values
+        if "speed" not in self._session.columns:
+            raise AttributeError(
+                "To compute the periods of inactivity, it must have the properties [speed]."
+            )
+        self._session["moving"] = self._session["speed"] >= threshold
         return self._session
@@ -80,6 +80,78 @@ class Activity(pd.DataFrame):
         """
         return DataFrame(self)
 
+    def to_parquet(
+        self,
+        path=None,
+        engine="auto",
+        compression="snappy",
+        index=None,
+        partition_cols=None,
+        storage_options=None,
+        **kwargs,
+    ):
+        """
+        Write the activity to a Parquet file, keeping its index, the ``start``
+        timestamp and the special columns. The arguments are the same of
+        :meth:`pandas.DataFrame.to_parquet`; the ``start`` timestamp is kept
+        when it is written by ``pyarrow``.
+
+        Use :func:`runpandas.read_parquet` to load it back.
+
+        Parameters
+        ----------
+        path : str, file-like object or None
+            The path of the Parquet file. If None, the file content is
+            returned as bytes.
+        engine : {'auto', 'pyarrow', 'fastparquet'}, default 'auto'
+            The Parquet library to use.
+        compression : str or None, default 'snappy'
+            The compression of the file.
+        index : bool, optional
+            Store the index; see :meth:`pandas.DataFrame.to_parquet`.
+        partition_cols : list, optional
+            Columns to partition the dataset by.
+        storage_options : dict, optional
+            Options for the fsspec storage (e.g. for S3 urls).
+        kwargs : key-word arguments
+            These arguments are passed to ``pyarrow.parquet.write_table``
+
+        Returns
+        -------
+        The file content as bytes if `path` is None, otherwise None.
+        """
+        from runpandas.io.arrow import to_parquet
+
+        return to_parquet(
+            self,
+            path,
+            engine=engine,
+            compression=compression,
+            index=index,
+            partition_cols=partition_cols,
+            storage_options=storage_options,
+            **kwargs,
+        )
+
+    def to_feather(self, path, **kwargs):
+        """
+        Write the activity to a Feather file, keeping its index, the ``start``
+        timestamp and the special columns. Requires ``pyarrow``.
+
+        Use :func:`runpandas.read_feather` to load it back.
+
+        Parameters
+        ----------
+        path : str or file-like object
+            The path of the Feather file.
+        kwargs : key-word arguments
+            ``storage_options`` as in :meth:`pandas.DataFrame.to_feather`, the
+            others are passed to ``pyarrow.feather.write_feather``
+        """
+        from runpandas.io.arrow import to_feather
+
+        to_feather(self, path, **kwargs)
+
     def __finalize__(self, other, method=None, **kwargs):
         """Propagate metadata from other to self."""
         for name in self._metadata:
@@ -3,10 +3,177 @@
 
  """
 
+import hashlib
+import threading
+from collections import OrderedDict
 import numpy as np
 import pandas as pd
 from runpandas._utils import convert_pace_secmeters2minkms
 
+# The activity columns used by the session statistics.
+SUMMARY_COLUMNS = ["moving", "speed", "cad", "hr", "temp", "dist", "distpos"]
+
+# Memoized session statistics rows (dicts), keyed by the activity start and the
+# fingerprint of its content, so only new or changed activities are summarized.
+SESSION_STATISTICS_CACHE_SIZE = 4096
+_session_statistics_cache = OrderedDict()
+_session_statistics_lock = threading.Lock()
+
+
+def _values(obj, column):
+    """Returns the values of the column as a numeric numpy array."""
+    values = obj[column].to_numpy()
+    if values.dtype.kind not in "iuf":
+        values = obj[column].to_numpy(dtype="float64", na_value=np.nan)
+    return values
+
+
+def _grouped_mean(values, mask, bounds):
+    """Mean of the non-missing `values` selected by `mask` in each group."""
+    valid = ~np.isnan(values) & mask
+    sums = np.add.reduceat(np.where(valid, values, 0.0), bounds)
+    counts = np.add.reduceat(valid, bounds)
+    return sums / counts
+
+
+def _grouped_max_pace(speed, bounds, obj):
+    """The pace of the fastest record of each group."""
+    fastest = np.fmax.reduceat(speed, bounds)
+    slowest = np.fmin.reduceat(speed, bounds)
+    # the pace is decreasing with the positive speeds
+    positive = (fastest > 0) & (slowest >= 0)
+    paces = iter(pd.to_timedelta(1 / fastest[positive], unit="s"))
+    max_pace = []
+    for group, (first, last) in enumerate(_group_slices(bounds, len(speed))):
+        if positive[group]:
+            pace = next(paces)
+        else:
+            pace = obj["speed"].iloc[first:last].to_pace().min()
+        max_pace.append(convert_pace_secmeters2minkms(pace.total_seconds()))
+    return max_pace
+
+
+def _group_slices(bounds, size):
+    return zip(bounds, np.append(bounds[1:], size))
+
+
+def _pace(speed):
+    return convert_pace_secmeters2minkms(
+        pd.Timedelta(seconds=1 / speed).total_seconds()
+    )
+
+
+def _summary_arrays(obj, times, bounds):
+    """
+    Computes the session statistics of one or more activities stored one after
+    the other in `obj`, in a single pass over shared intermediates: the time
+    deltas, the moving mask and one reduction per column and activity.
+
+    Parameters
+    ----------
+    obj:  The DataFrame with the records of the activities.
+    times:  numpy.ndarray. The elapsed time of each record in nanoseconds.
+    bounds:  numpy.ndarray. The position of the first record of each activity.
+
+    Returns:
+    --------
+    A dictionary with the statistics of :func:`_build_summary_statistics` (but
+    the start) as keys and a list-like with a value per activity as values.
+    """
+    columns = obj.columns
+    ends = np.append(bounds[1:], len(times)) - 1
+    nan = np.full(len(bounds), np.nan)
+
+    # the first record of an activity gets its own elapsed time
+    deltas = np.diff(times, prepend=0)
+    deltas[bounds] = times[bounds]
+    seconds = deltas / 1e9
+    ellapsed_seconds = times[ends] / 1e9
+
+    stats = {}
+    moving = None
+    stats["moving_time"] = nan
+    if "moving" in columns:
+        moving = obj["moving"].to_numpy().astype(bool)
+        moving_deltas = np.add.reduceat(np.where(moving, deltas, 0), bounds)
+        stats["moving_time"] = pd.to_timedelta(moving_deltas, unit="ns")
+
+    stats["mean_speed"] = stats["max_speed"] = stats["mean_pace"] = nan
+    stats["mean_moving_speed"] = stats["mean_moving_pace"] = nan
+    if "speed" in columns:
+        speed = _values(obj, "speed").astype("float64")
+        traveled = speed * seconds
+        traveled[np.isnan(traveled)] = 0.0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            stats["mean_speed"] = np.add.reduceat(traveled, bounds) / ellapsed_seconds
+        stats["max_speed"] = np.fmax.reduceat(_values(obj, "speed"), bounds)
+        stats["mean_pace"] = [_pace(value) for value in stats["mean_speed"]]
+        stats["max_pace"] = _grouped_max_pace(speed, bounds, obj)
+        if moving is not None:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                stats["mean_moving_speed"] = np.add.reduceat(
+                    np.where(moving, traveled, 0.0), bounds
+                ) / (moving_deltas / 1e9)
+            stats["mean_moving_pace"] = [
+                _pace(value) for value in stats["mean_moving_speed"]
+            ]
+
+    everything = np.ones(len(times), dtype=bool)
+    for column, name in (("cad", "cadence"), ("hr", "heart_rate")):
+        stats["mean_" + name] = stats["max_" + name] = nan
+        stats["mean_moving_" + name] = nan
+        if column in columns:
+            values = _values(obj, column)
+            floats = values.astype("float64")
+            with np.errstate(invalid="ignore"):
+                stats["mean_" + name] = _grouped_mean(floats, everything, bounds)
+                stats["max_" + name] = np.fmax.reduceat(values, bounds)
+                if moving is not None:
+                    stats["mean_moving_" + name] = _grouped_mean(floats, moving, bounds)
+
+    stats["mean_temperature"] = stats["min_temperature"] = nan
+    stats["max_temperature"] = nan
+    if "temp" in columns:
+        values = _values(obj, "temp")
+        with np.errstate(invalid="ignore"):
+            stats["mean_temperature"] = _grouped_mean(
+                values.astype("float64"), everything, bounds
+            )
+        stats["min_temperature"] = np.fmin.reduceat(values, bounds)
+        stats["max_temperature"] = np.fmax.reduceat(values, bounds)
+
+    if "dist" in columns:
+        stats["total_distance"] = np.fmax.reduceat(_values(obj, "dist"), bounds)
+    else:
+        distpos = _values(obj, "distpos").astype("float64")
+        stats["total_distance"] = np.add.reduceat(np.nan_to_num(distpos), bounds)
+
+    stats["ellapsed_time"] = pd.to_timedelta(times[ends], unit="ns")
+    return stats
+
+
+# The order of the session statistics.
+STATISTICS = [
+    "moving_time",
+    "mean_speed",
+    "max_speed",
+    "mean_pace",
+    "max_pace",
+    "mean_moving_speed",
+    "mean_moving_pace",
+    "mean_cadence",
+    "max_cadence",
+    "mean_moving_cadence",
+    "mean_heart_rate",
+    "max_heart_rate",
+    "mean_moving_heart_rate",
+    "mean_temperature",
+    "min_temperature",
+    "max_temperature",
+    "total_distance",
+    "ellapsed_time",
+]
+
 
 def _build_summary_statistics(obj):
     """
@@ -38,74 +205,11 @@ def _build_summary_statistics(obj):
     - Total distance
     - Total ellapsed time
     """
-
-    start = obj.start
-
-    try:
-        moving_time = obj.moving_time
-    except AttributeError:
-        moving_time = np.nan
-
-    try:
-        mean_speed = obj.mean_speed()
-        max_speed = obj["speed"].max()
-        mean_pace = convert_pace_secmeters2minkms(obj.mean_pace().total_seconds())
-        max_pace = convert_pace_secmeters2minkms(
-            obj["speed"].to_pace().min().total_seconds()
-        )
-    except AttributeError:
-        mean_speed = np.nan
-        max_speed = np.nan
-        mean_pace = np.nan
-
-    try:
-        mean_moving_speed = obj.mean_speed(only_moving=True)
-        mean_moving_pace = convert_pace_secmeters2minkms(
-            obj.mean_pace(only_moving=True).total_seconds()
-        )
-    except (AttributeError, KeyError):
-        mean_moving_speed = np.nan
-        mean_moving_pace = np.nan
-
-    try:
-        mean_cadence = obj.mean_cadence()
-        max_cadence = obj["cad"].max()
-    except AttributeError:
-        mean_cadence = np.nan
-        max_cadence = np.nan
-
-    try:
-        mean_moving_cadence = obj.mean_cadence(only_moving=True)
-    except (AttributeError, KeyError):
-        mean_moving_cadence = np.nan
-
-    try:
-        mean_heart_rate = obj.mean_heart_rate()
-        max_heart_rate = obj["hr"].max()
-    except AttributeError:
-        mean_heart_rate = np.nan
-        max_heart_rate = np.nan
-
-    try:
-        mean_moving_heart_rate = obj.mean_heart_rate(only_moving=True)
-    except (AttributeError, KeyError):
-        mean_moving_heart_rate = np.nan
-
-    try:
-        mean_temperature = obj["temp"].mean()
-        min_temperature = obj["temp"].min()
-        max_temperature = obj["temp"].max()
-    except KeyError:
-        mean_temperature = np.nan
-        min_temperature = np.nan
-        max_temperature = np.nan
-
-    total_distance = obj.distance
-
-    ellapsed_time = obj.ellapsed_time
-
-    row = {k: v for k, v in locals().items() if not k.startswith("__") and k != "obj"}
-
+    if not isinstance(obj.index, pd.TimedeltaIndex):
+        raise AttributeError("index is not TimedeltaIndex")
+    stats = _summary_arrays(obj, obj.index.asi8, np.array([0]))
+    row = {"start": obj.start}
+    row.update((key, stats[key][0]) for key in STATISTICS if key in stats)
     return row
 
 
@@ -143,6 +247,29 @@ def _build_session_statistics(obj):
     return pd.DataFrame(stats).set_index("start")
 
 
+def _fingerprints(session, times, bounds):
+    """Returns a digest of the columns, the times and the values of each
+    activity of a contiguous session."""
+    columns = repr(list(session.columns)).encode("utf-8")
+    hashes = pd.util.hash_pandas_object(session, index=False).to_numpy()
+    fingerprints = []
+    for first, last in _group_slices(bounds, len(times)):
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(columns)
+        digest.update(times[first:last].tobytes())
+        digest.update(hashes[first:last].tobytes())
+        fingerprints.append(digest.hexdigest())
+    return fingerprints
+
+
+def clear_session_statistics_cache():
+    """
+    Removes all the memoized session statistics rows.
+    """
+    with _session_statistics_lock:
+        _session_statistics_cache.clear()
+
+
 def _build_activity_statistics(obj):
     """
     Generate basic statistics from a given pandas Series.
@@ -231,7 +358,70 @@ def activity_summary(activity):
     return summary_statistics.T
 
 
-def session_summary(session):
+def _contiguous_session(session):
+    """Returns the session with the records of each activity next to each
+    other, and the position of the first record of each activity."""
+    level = session.index.names.index("start")
+    codes = session.index.codes[level]
+    bounds = np.flatnonzero(np.diff(codes)) + 1
+    if len(bounds) + 1 != len(np.unique(codes)):
+        session = session.iloc[np.argsort(codes, kind="stable")]
+        codes = session.index.codes[level]
+        bounds = np.flatnonzero(np.diff(codes)) + 1
+    return session, np.append(0, bounds)
+
+
+def _statistics_frame(session, times, bounds):
+    """Returns the statistics of the activities of a contiguous session
+    starting at the `bounds` positions, a row per activity."""
+    stats = _summary_arrays(session, times, bounds)
+    columns = {key: stats[key] for key in STATISTICS if key in stats}
+    starts = session.index.get_level_values("start")[bounds]
+    return pd.DataFrame(columns, index=pd.Index(starts, name="start"))
+
+
+def _cached_statistics(session, times, bounds):
+    """
+    Same as :func:`_statistics_frame`, but the rows are memoized by
+    the activity start and its content fingerprint, so only the new or
+    changed activities are summarized.
+    """
+    starts = session.index.get_level_values("start")[bounds]
+    keys = list(zip(starts, _fingerprints(session, times, bounds)))
+    rows = [None] * len(keys)
+    with _session_statistics_lock:
+        for position, key in enumerate(keys):
+            rows[position] = _session_statistics_cache.get(key)
+            if rows[position] is not None:
+                _session_statistics_cache.move_to_end(key)
+
+    missing = [position for position, row in enumerate(rows) if row is None]
+    if len(missing) == len(rows):
+        computed = _statistics_frame(session, times, bounds)
+    elif missing:
+        ends = np.append(bounds[1:], len(times))
+        lengths = ends[missing] - bounds[missing]
+        records = np.concatenate(
+            [np.arange(bounds[position], ends[position]) for position in missing]
+        )
+        computed = _statistics_frame(
+            session.iloc[records],
+            times[records],
+            np.append(0, np.cumsum(lengths)[:-1]),
+        )
+    if missing:
+        with _session_statistics_lock:
+            for position, row in zip(missing, computed.to_dict("records")):
+                rows[position] = row
+                _session_statistics_cache[keys[position]] = row
+            while len(_session_statistics_cache) > SESSION_STATISTICS_CACHE_SIZE:
+                _session_statistics_cache.popitem(last=False)
+
+    columns = {column: [row[column] for row in rows] for column in rows[0]}
+    return pd.DataFrame(columns, index=pd.Index(starts, name="start"))
+
+
+def session_summary(session, cache=True):
     """
     Returns the a pandas Dataframe with the common basic statistics for the
     given activity.
@@ -241,6 +431,11 @@ def session_summary(session):
     session:  runpandas.types.Activity. Runpandas Activity with pandas.MultiIndex
     to be computed the statistics
 
+    cache: bool, optional. If True, the statistics of each activity are memoized
+    by the activity start and a fingerprint of its content, so summarizing the
+    session again after adding new activities only computes the new rows.
+    Default is True.
+
     Returns
     -------
     pandas.Dataframe:  A pandas DataFrame containing the summary statistics
@@ -248,13 +443,10 @@ def session_summary(session):
     the total duration, the time spent moving, and many others.
 
     """
-    frames = []
-    for index in session.index.unique(level="start"):
-        df = session.xs(index, level=0)
-        df.start = index
-        frames.append(_build_session_statistics(df))
-
-    session_summary = pd.concat(frames, axis=0, verify_integrity=True)
+    session, bounds = _contiguous_session(session)
+    times = session.index.get_level_values("time").asi8
+    build_statistics = _cached_statistics if cache else _statistics_frame
+    session_summary = build_statistics(session, times, bounds)
     session_summary.sort_index(inplace=True)
     return session_summary
 